@@ -0,0 +1,70 @@
+"""
+Cost of applying many nested edits with apply_operations versus calling
+add_key_to_json once per edit after walking to the parent by hand.
+
+The plain loop is not atomic: a failing edit leaves the earlier ones
+applied. The deepcopy variant is what callers do today to be able to roll
+back, and is the fair comparison for the atomic batch.
+
+Usage:
+    python benchmarks/bench_apply_operations.py [edits]
+"""
+
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsontool.core.modifier import add_key_to_json, apply_operations
+
+
+def make_document(groups):
+    return {"groups": {f"g{g}": {"members": [{"id": m, "score": 0} for m in range(10)]} for g in range(groups)}}
+
+
+def edits(count, groups):
+    for i in range(count):
+        yield ("groups", f"g{i % groups}", "members", i % 10, "score"), i
+
+
+def per_call(document, changes):
+    for path, value in changes:
+        parent = document
+        for key in path[:-1]:
+            parent = parent[key]
+        add_key_to_json(parent, path[-1], value)
+
+
+def per_call_atomic(document, changes):
+    backup = copy.deepcopy(document)
+    try:
+        per_call(document, changes)
+    except (KeyError, ValueError):
+        document.clear()
+        document.update(backup)
+        raise
+
+
+def batched(document, changes):
+    apply_operations(document, [{"op": "set", "path": path, "value": value} for path, value in changes])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Many edits on a small document, then few edits on a large one, where
+    # copying the document for rollback dominates.
+    for edit_count, groups in ((count, 1000), (count // 100, 100_000)):
+        print(f"{edit_count} edits on a document with {groups * 10} records")
+        changes = list(edits(edit_count, groups))
+        runs = (("per-call loop", per_call), ("per-call + deepcopy", per_call_atomic), ("apply_operations", batched))
+        for label, func in runs:
+            document = make_document(groups)
+            start = time.perf_counter()
+            func(document, changes)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<20} {elapsed:.3f} s ({edit_count / elapsed:,.0f} edits/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Event-loop stalls while a large JSON file is read or written.
+
+A ticker coroutine sleeps for 1 ms in a loop and records how late it wakes
+up; the longest and the 99th percentile delay show how long the event loop
+was blocked. Compared are the blocking functions called from a coroutine,
+the naive offload of the blocking function to a thread, and the
+asynchronous functions of jsontool.core.async_io with the default backend,
+the stdlib backend and a process pool.
+
+Usage:
+    python benchmarks/bench_async_io.py [records]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def measure(operation):
+    delays = []
+    done = False
+
+    async def tick():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            delays.append(time.perf_counter() - start - 0.001)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0.01)
+    delays.clear()
+    start = time.perf_counter()
+    await operation()
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker
+    delays.sort()
+    return elapsed, delays[-1], delays[int(len(delays) * 0.99)]
+
+
+async def run(path, out):
+    from concurrent.futures import ProcessPoolExecutor
+    from jsontool.core.async_io import aread_json_from_file, awrite_json_to_file, configure_async_io
+    from jsontool.core.reader_writer import read_json_from_file, write_json_to_file
+
+    loop = asyncio.get_running_loop()
+    data = read_json_from_file(path)
+
+    async def blocking_read():
+        read_json_from_file(path)
+
+    async def thread_read():
+        await loop.run_in_executor(None, read_json_from_file, path)
+
+    async def blocking_write():
+        write_json_to_file(data, out, indent=2)
+
+    async def thread_write():
+        await loop.run_in_executor(None, write_json_to_file, data, out, 2)
+
+    async def async_write():
+        await awrite_json_to_file(data, out, indent=2)
+
+    cases = [
+        ("read", "blocking", blocking_read),
+        ("read", "to_thread", thread_read),
+        ("read", "async", lambda: aread_json_from_file(path)),
+        ("read", "async+stdlib", lambda: aread_json_from_file(path, backend="stdlib")),
+    ]
+    executor = ProcessPoolExecutor(max_workers=1)
+    executor.submit(int).result()
+    cases.append(("read", "async+procs", lambda: aread_json_from_file(path)))
+    cases += [
+        ("write", "blocking", blocking_write),
+        ("write", "to_thread", thread_write),
+        ("write", "async", async_write),
+    ]
+    print(f"{'op':<6} {'mode':<12} {'total ms':>9} {'max stall ms':>13} {'p99 stall ms':>13}")
+    for op, mode, operation in cases:
+        configure_async_io(executor=executor if mode == "async+procs" else None)
+        elapsed, worst, p99 = await measure(operation)
+        print(f"{op:<6} {mode:<12} {elapsed * 1e3:>9.0f} {worst * 1e3:>13.1f} {p99 * 1e3:>13.1f}")
+    configure_async_io(executor=None)
+    executor.shutdown()
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path, out = os.path.join(tmp, "data.json"), os.path.join(tmp, "out.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([{"id": i, "user": {"name": f"user-{i}"}, "tags": ["a", "b"], "score": i * 0.5}
+                       for i in range(records)], f)
+        print(f"file: {os.path.getsize(path) / 1e6:.1f} MB")
+        asyncio.run(run(path, out))
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    main()
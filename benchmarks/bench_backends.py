@@ -0,0 +1,58 @@
+"""
+Parse and serialize throughput of each installed JSON backend.
+
+Usage:
+    python benchmarks/bench_backends.py [records]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsontool.core.backends import available_backends
+from jsontool.core.reader_writer import read_json_from_string, write_json_to_string
+
+
+def make_document(count):
+    return {
+        "items": [
+            {
+                "id": i,
+                "name": f"Пользователь {i}",
+                "active": i % 2 == 0,
+                "score": i * 0.37,
+                "tags": ["alpha", "beta", "gamma"][: i % 4],
+                "address": {"city": "Berlin", "zip": f"{10000 + i}"},
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    data = make_document(count)
+    text = write_json_to_string(data, backend="stdlib")
+    size_mb = len(text.encode("utf-8")) / 2**20
+    print(f"document: {size_mb:.1f} MB")
+    print(f"{'backend':<10} {'parse MB/s':>11} {'dump MB/s':>10} {'dump indent=2 MB/s':>19}")
+    for name in available_backends():
+        parse = best_of(lambda: read_json_from_string(text, backend=name))
+        dump = best_of(lambda: write_json_to_string(data, backend=name))
+        dump_indent = best_of(lambda: write_json_to_string(data, indent=2, backend=name))
+        print(f"{name:<10} {size_mb / parse:>11.1f} {size_mb / dump:>10.1f} {size_mb / dump_indent:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Time per read_json_from_file call with and without a JsonCache.
+
+The file is written, then left alone long enough that cached entries are
+trusted on their timestamps alone, as for configuration files that rarely
+change. Reads repeat the same file; the first read of each cache is the
+miss and is reported separately.
+
+Usage:
+    python benchmarks/bench_cache.py [records]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    from jsontool.core.backends import available_backends
+    from jsontool.core.cache import JsonCache
+    from jsontool.core.reader_writer import read_json_from_file
+
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"services": [{"name": f"service-{i}", "port": 8000 + i, "replicas": i % 5,
+                                     "labels": {"team": "core", "tier": "backend"}} for i in range(records)]}, f)
+        print(f"file: {os.path.getsize(path) / 1024:.0f} KiB; waiting for the file to age")
+        time.sleep(2.1)
+        print(f"{'backend':<10} {'mode':<10} {'miss ms':>9} {'hit us':>10}")
+        for backend in available_backends():
+            uncached = timed(lambda: read_json_from_file(path, backend=backend), 20)
+            print(f"{backend:<10} {'no cache':<10} {uncached * 1e3:>9.2f} {'':>10}")
+            for copy in (False, True):
+                cache = JsonCache(copy=copy)
+                miss = timed(lambda: read_json_from_file(path, backend=backend, cache=cache), 1)
+                hit = timed(lambda: read_json_from_file(path, backend=backend, cache=cache), 200)
+                mode = "copy" if copy else "shared"
+                print(f"{backend:<10} {mode:<10} {miss * 1e3:>9.2f} {hit * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    main()
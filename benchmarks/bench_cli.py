@@ -0,0 +1,55 @@
+"""
+Cold start and multi-file throughput of the jsontool command.
+
+Cold start is the wall time of ``--help``, which must not import the core,
+validator or exporter modules. Throughput is measured by formatting a
+directory of files with an increasing number of worker processes.
+
+Usage:
+    python benchmarks/bench_cli.py [files]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMAND = [sys.executable, "-m", "jsontool.cli.json_tool"]
+
+
+def run(args):
+    start = time.perf_counter()
+    subprocess.run(COMMAND + args, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    baseline = min(run_python() for _ in range(5))
+    cold = min(run(["--help"]) for _ in range(5))
+    print(f"cold start: {cold * 1000:.0f} ms (bare interpreter {baseline * 1000:.0f} ms)")
+    loaded = subprocess.check_output(
+        [sys.executable, "-c", "import sys; import jsontool.cli.json_tool; "
+                               "print(sorted(m for m in sys.modules if m.startswith('jsontool')))"],
+        cwd=ROOT, text=True)
+    print(f"modules loaded at startup: {loaded.strip()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(files):
+            with open(os.path.join(tmp, f"{i}.json"), "w", encoding="utf-8") as f:
+                json.dump({"id": i, "items": [{"n": n, "tags": ["a", "b"]} for n in range(200)]}, f)
+        for jobs in sorted({1, 2, os.cpu_count() or 1}):
+            elapsed = run(["format", tmp, "--jobs", str(jobs), "--quiet"])
+            print(f"format {files} files with --jobs {jobs}: {elapsed:.2f} s ({files / elapsed:,.0f} files/s)")
+
+
+def run_python():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Shipping a JSON Patch from diff_json instead of the whole document.
+
+A document of user records is changed a little in several ways. For each
+change, the time to compute the patch and its serialized size are compared
+with re-serializing the whole document, along with the time to apply the
+patch with apply_operations.
+
+Usage:
+    python benchmarks/bench_diff.py [records]
+"""
+
+import copy
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def make_document(records):
+    return {"version": 1, "users": [{"id": i, "name": f"user-{i}", "email": f"user-{i}@example.com",
+                                     "roles": ["reader", "writer"] if i % 3 else ["reader"],
+                                     "profile": {"age": 20 + i % 50, "city": f"city-{i % 100}"}}
+                                    for i in range(records)]}
+
+
+def changes(document):
+    records = len(document["users"])
+
+    def one_field(new):
+        new["users"][records // 2]["profile"]["city"] = "elsewhere"
+
+    def ten_records(new):
+        for i in range(0, records, records // 10):
+            new["users"][i]["roles"].append("admin")
+
+    def inserts_and_deletes(new):
+        for i in range(5):
+            del new["users"][i * records // 5]
+            new["users"].insert(i * records // 5 + 1, {"id": -i, "name": "new", "roles": []})
+
+    def prepend(new):
+        new["users"].insert(0, {"id": -1, "name": "first", "roles": []})
+        new["version"] = 2
+
+    return [("one field", one_field), ("10 records", ten_records),
+            ("5 inserts + 5 deletes", inserts_and_deletes), ("prepend 1 record", prepend)]
+
+
+def main():
+    from jsontool.core.diff import diff_json
+    from jsontool.core.modifier import apply_operations
+    from jsontool.core.reader_writer import write_json_to_string
+
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    old = make_document(records)
+    full_ms, full = timed(lambda: write_json_to_string(old))
+    print(f"document: {records} records, {len(full) / 1e6:.1f} MB, serialized in {full_ms * 1e3:.1f} ms")
+    print(f"{'change':<24} {'array_key':<10} {'diff ms':>8} {'ops':>5} {'patch bytes':>12} "
+          f"{'vs full':>8} {'apply ms':>9}")
+    for name, change in changes(old):
+        # Parsed separately in practice, so the documents share no objects.
+        new = copy.deepcopy(old)
+        change(new)
+        for array_key in (None, "id"):
+            diff_ms, patch = timed(lambda: diff_json(old, new, array_key=array_key))
+            size = len(write_json_to_string(patch))
+            target = copy.deepcopy(old)
+            start = time.perf_counter()
+            apply_operations(target, patch)
+            apply_ms = time.perf_counter() - start
+            assert target == new
+            print(f"{name:<24} {str(array_key):<10} {diff_ms * 1e3:>8.1f} {len(patch):>5} {size:>12} "
+                  f"{size / len(full):>8.2%} {apply_ms * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    main()
@@ -0,0 +1,71 @@
+"""
+Startup cost of ``import jsontool`` followed by one read_json_from_string
+call, checked against a fixed budget.
+
+The cost is taken from ``python -X importtime``: the self time of every
+module imported by the snippet that a bare interpreter does not import
+anyway, i.e. jsontool, its dependencies and the stdlib modules it pulls in.
+The median of several runs is compared with the budget and the script
+exits with status 1 when it is exceeded, so it can run in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py [budget_ms] [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNIPPET = "import jsontool; jsontool.read_json_from_string('{\"a\": [1, 2]}')"
+# Modules that must not be loaded by the snippet.
+FORBIDDEN = ("jsontool.core.validator", "jsontool.core.navigator", "jsontool.core.modifier",
+             "jsontool.exporters.", "multiprocessing", "concurrent.futures")
+DEFAULT_BUDGET_MS = 60.0
+
+
+def import_times(code):
+    """Return {module: self time in microseconds} for one interpreter run."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(self_us)
+    return times
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    baseline = set(import_times("pass"))
+    totals, samples = [], []
+    for _ in range(runs):
+        times = {module: us for module, us in import_times(SNIPPET).items() if module not in baseline}
+        totals.append(sum(times.values()) / 1000)
+        samples.append(times)
+    median = statistics.median(totals)
+    loaded = samples[0]
+    print(f"import jsontool + read_json_from_string: median {median:.1f} ms over {runs} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}), {len(loaded)} modules")
+    slowest = sorted(loaded, key=lambda module: statistics.median(s.get(module, 0) for s in samples), reverse=True)
+    for module in slowest[:10]:
+        print(f"  {statistics.median(s.get(module, 0) for s in samples) / 1000:6.1f} ms  {module}")
+    unexpected = sorted(module for module in loaded if module.startswith(FORBIDDEN))
+    failed = False
+    if unexpected:
+        print(f"FAIL: modules that should load lazily were imported: {unexpected}")
+        failed = True
+    if median > budget:
+        print(f"FAIL: {median:.1f} ms exceeds the budget of {budget:.1f} ms")
+        failed = True
+    else:
+        print(f"OK: within the budget of {budget:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
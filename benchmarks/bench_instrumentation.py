@@ -0,0 +1,54 @@
+"""
+Cost of the instrumentation hooks per call.
+
+Each function is timed undecorated (through ``__wrapped__``), as shipped
+with no hook registered, with a MetricsAggregator registered, and with
+memory tracing on as well.
+
+Usage:
+    python benchmarks/bench_instrumentation.py
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(function, repeat):
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    from jsontool.core.instrumentation import instrument
+    from jsontool.core.modifier import apply_operations
+    from jsontool.core.reader_writer import read_json_from_string, write_json_to_string
+
+    small = '{"id": 1, "name": "a"}'
+    large = write_json_to_string([{"id": i, "name": f"user-{i}", "tags": ["a", "b"]} for i in range(10_000)])
+    operations = [{"op": "set", "path": f"/k{i}", "value": i} for i in range(10)]
+    cases = [
+        ("read_json_from_string small", lambda read: read(small), read_json_from_string, 20_000),
+        ("read_json_from_string 400 KB", lambda read: read(large), read_json_from_string, 50),
+        ("apply_operations 10 ops", lambda apply: apply({}, operations), apply_operations, 20_000),
+    ]
+    print(f"{'function':<30} {'plain us':>10} {'disabled us':>12} {'enabled us':>11} {'memory us':>10}")
+    for name, call, function, repeat in cases:
+        results = [timed(lambda: call(function.__wrapped__), repeat), timed(lambda: call(function), repeat)]
+        with instrument():
+            results.append(timed(lambda: call(function), repeat))
+        with instrument(trace_memory=True):
+            results.append(timed(lambda: call(function), max(repeat // 10, 1)))
+        print(f"{name:<30}" + "".join(f" {value * 1e6:>{width}.2f}" for value, width in zip(results, (10, 12, 11, 10))))
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    main()
@@ -0,0 +1,67 @@
+"""
+Peak memory of iter_json_file compared to read_json_from_file.
+
+Each measurement runs in a fresh interpreter so that ru_maxrss reflects only
+that reader. Peak RSS of the streaming reader should stay flat as the file
+grows, while the full reader grows with the file size.
+
+Usage:
+    python benchmarks/bench_iter_json_file.py [max_records]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import resource, sys
+sys.path.insert(0, {root!r})
+from jsontool.core.reader_writer import iter_json_file, read_json_from_file
+count = 0
+if {mode!r} == "stream":
+    for _ in iter_json_file({path!r}, prefix="items.item"):
+        count += 1
+else:
+    count = len(read_json_from_file({path!r})["items"])
+print(count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_file(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"meta": {"source": "bench"}, "items": [')
+        for i in range(records):
+            if i:
+                f.write(",")
+            json.dump({"id": i, "name": f"record-{i}", "tags": ["a", "b", "c"], "score": i * 0.5}, f)
+        f.write("]}")
+
+
+def measure(mode, path):
+    code = MEASURE.format(root=ROOT, mode=mode, path=path)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    count, rss_kb = out.split()
+    return int(count), int(rss_kb) / 1024
+
+
+def main():
+    max_records = int(sys.argv[1]) if len(sys.argv) > 1 else 800_000
+    sizes = [max_records // 8, max_records // 4, max_records // 2, max_records]
+    print(f"{'records':>10} {'file MB':>9} {'stream MB':>10} {'full MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for records in sizes:
+            path = os.path.join(tmp, f"data_{records}.json")
+            write_file(path, records)
+            file_mb = os.path.getsize(path) / 2**20
+            _, stream_mb = measure("stream", path)
+            _, full_mb = measure("full", path)
+            print(f"{records:>10} {file_mb:>9.1f} {stream_mb:>10.1f} {full_mb:>9.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Build cost, memory overhead and lookup speed of JsonIndex.
+
+Compares key lookups through the index with a recursive-descent JSONPath
+walk ($..key) over the same document, and reports how long incremental
+updates through the modifier functions take.
+
+Usage:
+    python benchmarks/bench_json_index.py [records]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsontool.core.modifier import add_key_to_json
+from jsontool.core.navigator import JsonIndex, compile_jsonpath
+
+
+def make_document(count):
+    return {
+        "catalog": {
+            f"product-{i}": {"sku": f"SKU{i}", "price": i * 1.1, "stock": {"warehouse": i % 7, "qty": i % 100}}
+            for i in range(count)
+        },
+        "settings": {"currency": "EUR", "region": "eu-west"},
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    data = make_document(count)
+    index = JsonIndex(data)
+    print(f"document: {count} records, {len(index)} indexed paths")
+    print(f"build time: {index.build_time * 1000:.1f} ms")
+    print(f"index memory: {index.memory_usage() / 2**20:.1f} MB")
+
+    walk = compile_jsonpath("$..currency")
+    number = 20
+    walk_time = min(timeit.repeat(lambda: walk.find_all(data), number=number, repeat=3)) / number
+    index_time = min(timeit.repeat(lambda: index.find_key("currency"), number=10_000, repeat=3)) / 10_000
+    path_time = min(timeit.repeat(lambda: index.get(("catalog", "product-10", "stock", "qty")),
+                                  number=10_000, repeat=3)) / 10_000
+    print(f"$..currency walk: {walk_time * 1e6:>12.1f} us")
+    print(f"find_key:         {index_time * 1e6:>12.2f} us  ({walk_time / index_time:.0f}x faster)")
+    print(f"get(path):        {path_time * 1e6:>12.2f} us")
+
+    target = data["catalog"]["product-10"]
+    update_time = min(timeit.repeat(lambda: add_key_to_json(target, "stock", {"warehouse": 1, "qty": 5}),
+                                    number=10_000, repeat=3)) / 10_000
+    print(f"incremental update: {update_time * 1e6:.2f} us vs rebuild {index.build_time * 1e6:.0f} us")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Output size, write speed and downstream read speed of the Parquet and
+Feather exporters compared to the CSV exporter.
+
+Reads are timed with pyarrow for every format (pyarrow.csv for CSV), plus
+the stdlib csv module, which is what a plain Python consumer of the CSV
+output would use. Requires pyarrow.
+
+Usage:
+    python benchmarks/bench_json_to_arrow.py [records]
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyarrow.csv
+import pyarrow.ipc
+import pyarrow.parquet
+
+from jsontool.exporters.json_to_arrow import export_json_to_arrow
+from jsontool.exporters.json_to_csv import export_json_to_csv
+
+
+def write_file(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(records):
+            if i:
+                f.write(",")
+            json.dump({"id": i, "user": {"name": f"user-{i % 1000}", "country": ["FR", "DE", "US"][i % 3]},
+                       "score": i * 0.25, "active": i % 2 == 0, "visits": i % 97}, f)
+        f.write("]")
+
+
+def read_stdlib_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "input.json")
+        write_file(source, records)
+        print(f"{records} records, {os.path.getsize(source) / 1e6:.1f} MB of JSON")
+        print(f"{'format':<10} {'MB':>8} {'write rows/s':>14} {'read s (pyarrow)':>18} {'read s (csv module)':>20}")
+        outputs = (
+            ("csv", "output.csv", export_json_to_csv, lambda p: pyarrow.csv.read_csv(p)),
+            ("parquet", "output.parquet", export_json_to_arrow, lambda p: pyarrow.parquet.read_table(p)),
+            ("feather", "output.feather", export_json_to_arrow, lambda p: pyarrow.ipc.open_file(p).read_all()),
+        )
+        for label, name, export, read in outputs:
+            path = os.path.join(tmp, name)
+            rows, write_time = timed(export, source, path)
+            _, read_time = timed(read, path)
+            stdlib = f"{timed(read_stdlib_csv, path)[1]:.3f}" if label == "csv" else "-"
+            print(f"{label:<10} {os.path.getsize(path) / 1e6:>8.1f} {rows / write_time:>14,.0f} "
+                  f"{read_time:>18.3f} {stdlib:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Throughput and peak memory of export_json_to_csv.
+
+Each export runs in a fresh interpreter so that ru_maxrss reflects only that
+export. Rows per second should stay roughly constant and peak RSS flat as
+the input grows.
+
+Usage:
+    python benchmarks/bench_json_to_csv.py [max_records]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from jsontool.exporters.json_to_csv import export_json_to_csv
+start = time.perf_counter()
+rows = export_json_to_csv({path!r}, {out!r}, prefix="items.item", arrays={arrays!r})
+elapsed = time.perf_counter() - start
+print(rows, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_file(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"items": [')
+        for i in range(records):
+            if i:
+                f.write(",")
+            json.dump({"id": i, "user": {"name": f"user-{i}", "address": {"city": "Paris", "zip": "75001"}},
+                       "tags": ["a", "b"], "score": i * 0.5, "active": i % 2 == 0}, f)
+        f.write("]}")
+
+
+def main():
+    max_records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [max_records // 100, max_records // 10, max_records]
+    with tempfile.TemporaryDirectory() as tmp:
+        path, out = os.path.join(tmp, "input.json"), os.path.join(tmp, "output.csv")
+        print(f"{'records':>10} {'MB':>8} {'arrays':>8} {'rows/s':>12} {'peak RSS MB':>12}")
+        for records in sizes:
+            write_file(path, records)
+            size = os.path.getsize(path) / 1e6
+            for arrays in ("join", "explode"):
+                code = MEASURE.format(root=ROOT, path=path, out=out, arrays=arrays)
+                rows, elapsed, rss = subprocess.check_output([sys.executable, "-c", code], text=True).split()
+                print(f"{records:>10} {size:>8.1f} {arrays:>8} {int(rows) / float(elapsed):>12,.0f} "
+                      f"{int(rss) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Throughput and peak memory of export_json_to_xml compared to building an
+ElementTree and serializing it.
+
+Each export runs in a fresh interpreter so that ru_maxrss reflects only that
+export. Peak RSS of the streaming exporter should stay flat as the input
+grows, while the ElementTree approach grows with it.
+
+Usage:
+    python benchmarks/bench_json_to_xml.py [max_records]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from jsontool.core.reader_writer import read_json_from_file
+from jsontool.exporters.json_to_xml import export_json_to_xml
+start = time.perf_counter()
+if {mode!r} == "stream":
+    count = export_json_to_xml({path!r}, {out!r}, prefix="items.item")
+else:
+    import xml.etree.ElementTree as ET
+    def build(parent, tag, value):
+        element = ET.SubElement(parent, tag)
+        if isinstance(value, dict):
+            for key, child in value.items():
+                build(element, key, child)
+        elif isinstance(value, list):
+            for child in value:
+                build(element, "item", child)
+        else:
+            element.text = str(value)
+    root = ET.Element("root")
+    items = read_json_from_file({path!r})["items"]
+    for record in items:
+        build(root, "item", record)
+    ET.ElementTree(root).write({out!r}, encoding="utf-8")
+    count = len(items)
+elapsed = time.perf_counter() - start
+print(count, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_file(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"items": [')
+        for i in range(records):
+            if i:
+                f.write(",")
+            json.dump({"id": i, "user": {"name": f"user-{i}", "email": f"u{i}@example.com"},
+                       "tags": ["a", "b"], "score": i * 0.5, "note": "x < y & z"}, f)
+        f.write("]}")
+
+
+def main():
+    max_records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [max_records // 100, max_records // 10, max_records]
+    with tempfile.TemporaryDirectory() as tmp:
+        path, out = os.path.join(tmp, "input.json"), os.path.join(tmp, "output.xml")
+        print(f"{'records':>10} {'MB':>8} {'mode':>12} {'records/s':>12} {'peak RSS MB':>12}")
+        for records in sizes:
+            write_file(path, records)
+            size = os.path.getsize(path) / 1e6
+            for mode in ("stream", "elementtree"):
+                code = MEASURE.format(root=ROOT, path=path, out=out, mode=mode)
+                count, elapsed, rss = subprocess.check_output([sys.executable, "-c", code], text=True).split()
+                print(f"{records:>10} {size:>8.1f} {mode:>12} {int(count) / float(elapsed):>12,.0f} "
+                      f"{int(rss) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Throughput of the YAML exporter with the libyaml C emitter and the
+pure-Python emitter, in multi-document and single-sequence mode, compared to
+yaml.safe_dump of the whole array (the pure-Python default most code uses).
+
+Each export runs in a fresh interpreter so that ru_maxrss reflects only that
+export.
+
+Usage:
+    python benchmarks/bench_json_to_yaml.py [records]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from jsontool.exporters.json_to_yaml import export_json_to_yaml
+start = time.perf_counter()
+if {emitter!r} == "safe_dump":
+    import json, yaml
+    with open({path!r}, encoding="utf-8") as f:
+        items = json.load(f)
+    with open({out!r}, "w", encoding="utf-8") as f:
+        yaml.safe_dump(items, f, allow_unicode=True, sort_keys=False)
+    count = len(items)
+else:
+    count = export_json_to_yaml({path!r}, {out!r}, emitter={emitter!r}, multi_document={multi!r})
+elapsed = time.perf_counter() - start
+print(count, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_file(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(records):
+            if i:
+                f.write(",")
+            json.dump({"id": i, "user": {"name": f"user-{i}", "city": "Zürich"}, "tags": ["a", "b"],
+                       "score": i * 0.5, "active": i % 2 == 0, "note": None}, f)
+        f.write("]")
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    runs = (("c", True), ("c", False), ("python", True), ("python", False), ("safe_dump", False))
+    with tempfile.TemporaryDirectory() as tmp:
+        path, out = os.path.join(tmp, "input.json"), os.path.join(tmp, "output.yaml")
+        write_file(path, records)
+        print(f"{records} records, {os.path.getsize(path) / 1e6:.1f} MB of JSON")
+        print(f"{'emitter':>10} {'mode':>10} {'records/s':>12} {'peak RSS MB':>12}")
+        for emitter, multi in runs:
+            code = MEASURE.format(root=ROOT, path=path, out=out, emitter=emitter, multi=multi)
+            count, elapsed, rss = subprocess.check_output([sys.executable, "-c", code], text=True).split()
+            mode = "documents" if multi else "sequence"
+            print(f"{emitter:>10} {mode:>10} {int(count) / float(elapsed):>12,.0f} {int(rss) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
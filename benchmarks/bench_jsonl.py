@@ -0,0 +1,69 @@
+"""
+Throughput of read_jsonl in sequential and parallel mode.
+
+The baseline is a plain single-threaded ``json.loads`` loop over the lines
+of the file. Parallel mode is measured for an increasing number of workers.
+
+Usage:
+    python benchmarks/bench_jsonl.py [records]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsontool.core.reader_writer import read_jsonl, write_jsonl
+
+
+def records(count):
+    for i in range(count):
+        yield {
+            "id": i,
+            "user": {"name": f"user-{i}", "email": f"user{i}@example.com", "active": i % 3 == 0},
+            "items": [{"sku": f"SKU-{j}", "qty": j, "price": j * 1.25} for j in range(5)],
+        }
+
+
+def timed(label, func, size_mb):
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {count:>9} records {elapsed:>7.2f} s {size_mb / elapsed:>8.1f} MB/s")
+    return elapsed
+
+
+def baseline(path):
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            json.loads(line)
+            count += 1
+    return count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.jsonl")
+        write_jsonl(records(count), path)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"file: {size_mb:.1f} MB, {os.cpu_count()} CPUs")
+        base = timed("json.loads loop", lambda: baseline(path), size_mb)
+        timed("read_jsonl", lambda: sum(1 for _ in read_jsonl(path)), size_mb)
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            elapsed = timed(
+                f"read_jsonl parallel x{workers}",
+                lambda: sum(1 for _ in read_jsonl(path, parallel=True, workers=workers)),
+                size_mb,
+            )
+            print(f"{'':<28} speedup over baseline: {base / elapsed:.2f}x")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Lookup throughput of compiled JSONPath queries.
+
+"naive" parses the expression on every call, which is what a non-caching
+interpreter does; "cached" goes through compile_jsonpath; "compiled" reuses
+a JsonPath object held by the caller.
+
+Usage:
+    python benchmarks/bench_jsonpath.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsontool.core.navigator import JsonPath, compile_jsonpath
+
+DOCUMENT = {
+    "config": {
+        "services": [
+            {"name": f"service-{i}", "port": 8000 + i, "enabled": i % 3 != 0, "tags": ["a", "b"]}
+            for i in range(50)
+        ],
+        "limits": {"rps": 1000, "burst": 50},
+    }
+}
+
+PATHS = [
+    "$.config.limits.rps",
+    "$.config.services[10].port",
+    "$.config.services[?(@.port > 8040 && @.enabled)].name",
+    "$..burst",
+]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'path':<58} {'naive/s':>10} {'cached/s':>10} {'compiled/s':>11}")
+    for path in PATHS:
+        compiled = JsonPath(path)
+        naive = min(timeit.repeat(lambda: JsonPath(path).first(DOCUMENT), number=number, repeat=3))
+        cached = min(timeit.repeat(lambda: compile_jsonpath(path).first(DOCUMENT), number=number, repeat=3))
+        direct = min(timeit.repeat(lambda: compiled.first(DOCUMENT), number=number, repeat=3))
+        print(f"{path:<58} {number / naive:>10.0f} {number / cached:>10.0f} {number / direct:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Peak memory and wall time of read_json_from_file with and without use_mmap.
+
+Each measurement runs in a fresh interpreter so that ru_maxrss reflects only
+that read. The first read of each mode follows a fresh write of the file,
+so it approximates a cold read only as far as the page cache allows without
+root privileges.
+
+Usage:
+    python benchmarks/bench_mmap.py [records]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from jsontool.core.reader_writer import read_json_from_file
+start = time.perf_counter()
+data = read_json_from_file({path!r}, backend={backend!r}, use_mmap={use_mmap!r})
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+BASELINE = """
+import resource, sys
+sys.path.insert(0, {root!r})
+import jsontool.core.reader_writer
+print(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def run(code):
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    elapsed, rss_kb = out.split()
+    return float(elapsed), int(rss_kb) / 1024
+
+
+def main():
+    from jsontool.core.backends import available_backends
+
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([{"id": i, "text": "Ünïcode " * 8, "values": list(range(10))} for i in range(records)], f,
+                      ensure_ascii=False)
+        size_mb = os.path.getsize(path) / 2**20
+        _, base_mb = run(BASELINE.format(root=ROOT))
+        print(f"file: {size_mb:.1f} MB, interpreter baseline RSS: {base_mb:.1f} MB")
+        print(f"{'backend':<10} {'mode':<6} {'time s':>8} {'peak RSS MB':>12}")
+        for backend in available_backends():
+            for use_mmap in (False, True):
+                elapsed, rss_mb = run(MEASURE.format(root=ROOT, path=path, backend=backend, use_mmap=use_mmap))
+                mode = "mmap" if use_mmap else "text"
+                print(f"{backend:<10} {mode:<6} {elapsed:>8.2f} {rss_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    main()
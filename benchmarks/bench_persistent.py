@@ -0,0 +1,62 @@
+"""
+Cost of producing a new version of a document with JsonDocument versus
+deep-copying it and mutating the copy, in time and in memory retained per
+version.
+
+Usage:
+    python benchmarks/bench_persistent.py [records]
+"""
+
+import copy
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsontool.core.modifier import add_key_to_json
+from jsontool.core.persistent import JsonDocument
+
+VERSIONS = 20
+
+
+def make_document(records):
+    return {"users": [{"id": i, "name": f"user{i}", "tags": ["a", "b"], "score": 0} for i in range(records)]}
+
+
+def deepcopy_edit(document, i):
+    new = copy.deepcopy(document)
+    add_key_to_json(new["users"][i], "score", i)
+    return new
+
+
+def persistent_edit(document, i):
+    return document.set(("users", i, "score"), i)
+
+
+def measure(label, document, edit, records):
+    # Time a run of edits, then measure the memory retained by keeping every version.
+    start = time.perf_counter()
+    current = document
+    for i in range(VERSIONS):
+        current = edit(current, (i * 7919) % records)
+    elapsed = (time.perf_counter() - start) / VERSIONS
+    tracemalloc.start()
+    versions = [document]
+    for i in range(VERSIONS):
+        versions.append(edit(versions[-1], (i * 7919) % records))
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} {elapsed * 1000:9.3f} ms/edit  {retained / VERSIONS / 1024:10.1f} KiB/version")
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{VERSIONS} versions of a document with {records} records")
+    measure("deepcopy + mutate", make_document(records), deepcopy_edit, records)
+    measure("JsonDocument.set", JsonDocument(make_document(records)), persistent_edit, records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Time and peak memory of reformat_json compared to parsing the file and
+dumping it again with write_json_to_file.
+
+Each run happens in a fresh interpreter so that ru_maxrss reflects only that
+run. Peak RSS of the transformer should stay flat as the input grows, while
+the parse-and-dump route grows with it.
+
+Usage:
+    python benchmarks/bench_transformer.py [max_records]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from jsontool.core.reader_writer import read_json_from_file, write_json_to_file
+from jsontool.core.transformer import reformat_json
+start = time.perf_counter()
+if {mode!r} == "transformer":
+    reformat_json({path!r}, {out!r}, indent={indent!r})
+else:
+    write_json_to_file(read_json_from_file({path!r}, backend={mode!r}), {out!r}, indent={indent!r}, backend={mode!r})
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_file(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(records):
+            if i:
+                f.write(",\n")
+            json.dump({"id": i, "user": {"name": f"user-{i}", "email": f"u{i}@example.com"},
+                       "tags": ["a", "b"], "score": i * 0.5, "active": i % 2 == 0, "note": None}, f, indent=2)
+        f.write("\n]")
+
+
+def modes():
+    yield "transformer"
+    yield "stdlib"
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        return
+    yield "orjson"
+
+
+def main():
+    max_records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [max_records // 100, max_records // 10, max_records]
+    with tempfile.TemporaryDirectory() as tmp:
+        path, out = os.path.join(tmp, "input.json"), os.path.join(tmp, "output.json")
+        print(f"{'records':>10} {'MB':>8} {'indent':>6} {'mode':>12} {'MB/s':>8} {'peak RSS MB':>12}")
+        for records in sizes:
+            write_file(path, records)
+            size = os.path.getsize(path) / 1e6
+            for indent in (None, 2):
+                for mode in modes():
+                    code = MEASURE.format(root=ROOT, path=path, out=out, mode=mode, indent=indent)
+                    elapsed, rss = subprocess.check_output([sys.executable, "-c", code], text=True).split()
+                    print(f"{records:>10} {size:>8.1f} {str(indent):>6} {mode:>12} {size / float(elapsed):>8.1f} "
+                          f"{int(rss) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Throughput of validate_many as the number of worker processes grows.
+
+Usage:
+    python benchmarks/bench_validate_many.py [records]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_validator import PAYLOAD, SCHEMA
+
+from jsontool.core.validator import validate_many
+
+
+def records(count):
+    for i in range(count):
+        # One record in a hundred is invalid.
+        yield PAYLOAD if i % 100 else dict(PAYLOAD, timestamp=-1)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = 1
+    while True:
+        results = validate_many(records(count), SCHEMA, workers=workers, chunk_size=2000).run()
+        print(f"workers={workers:<3} {results.summary()}")
+        if workers >= (os.cpu_count() or 1):
+            break
+        workers = min(workers * 2, os.cpu_count() or 1)
+
+
+if __name__ == "__main__":
+    main()
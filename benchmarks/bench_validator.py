@@ -0,0 +1,83 @@
+"""
+Validations per second for compiled JSON Schemas.
+
+"uncached" compiles the schema on every call, which approximates an
+interpreter that walks the schema dictionary per validation; "cached" goes
+through validate_json; "compiled" calls a CompiledSchema held by the caller.
+
+Usage:
+    python benchmarks/bench_validator.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsontool.core.validator import CompiledSchema, collect_validation_errors, compile_schema, validate_json
+
+SCHEMA = {
+    "type": "object",
+    "required": ["event_id", "timestamp", "user", "items"],
+    "additionalProperties": False,
+    "properties": {
+        "event_id": {"type": "string", "pattern": "^[0-9a-f]{8}-[0-9a-f]{4}$"},
+        "timestamp": {"type": "integer", "minimum": 0},
+        "type": {"enum": ["view", "cart", "purchase"]},
+        "user": {
+            "type": "object",
+            "required": ["id", "email"],
+            "properties": {
+                "id": {"type": "integer"},
+                "email": {"type": "string", "maxLength": 254},
+                "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 20},
+            },
+        },
+        "items": {"type": "array", "minItems": 1, "items": {"$ref": "#/$defs/item"}},
+    },
+    "$defs": {
+        "item": {
+            "type": "object",
+            "required": ["sku", "qty", "price"],
+            "properties": {
+                "sku": {"type": "string", "minLength": 3},
+                "qty": {"type": "integer", "exclusiveMinimum": 0},
+                "price": {"type": "number", "minimum": 0},
+            },
+        }
+    },
+}
+
+PAYLOAD = {
+    "event_id": "deadbeef-0001",
+    "timestamp": 1700000000,
+    "type": "purchase",
+    "user": {"id": 42, "email": "user@example.com", "tags": ["vip", "beta"]},
+    "items": [{"sku": f"SKU-{i}", "qty": i + 1, "price": 9.99 * i} for i in range(10)],
+}
+
+INVALID = dict(PAYLOAD, timestamp=-1, items=[{"sku": "x", "qty": 0, "price": -1}] * 10)
+
+
+def rate(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    compiled = compile_schema(SCHEMA)
+    rows = [
+        ("uncached (compile per call)", lambda: CompiledSchema(SCHEMA).validate(PAYLOAD), number // 10),
+        ("cached validate_json", lambda: validate_json(PAYLOAD, SCHEMA), number),
+        ("compiled.validate", lambda: compiled.validate(PAYLOAD), number),
+        ("compiled.is_valid (invalid)", lambda: compiled.is_valid(INVALID), number),
+        ("collect_validation_errors (invalid)", lambda: collect_validation_errors(INVALID, SCHEMA), number // 10),
+    ]
+    print(f"{'mode':<38} {'validations/s':>14}")
+    for label, func, count in rows:
+        print(f"{label:<38} {rate(func, count):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+jsontool: Tools for reading, writing, modifying, and analyzing JSON data.
+
+The public API of :mod:`jsontool.core` and :mod:`jsontool.exporters` is
+available from this package. Names and subpackages are imported lazily on
+first access, so ``import jsontool`` itself loads nothing else.
+"""
+
+import importlib
+
+# Avoids importing typing at startup; type checkers treat it like typing.TYPE_CHECKING.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from . import cli, core, exporters
+    from .core import *  # noqa: F401,F403
+    from .exporters import *  # noqa: F401,F403
+
+_SUBPACKAGES = ("cli", "core", "exporters")
+
+
+def _exports():
+    # The tables are owned by the subpackages; importing their __init__
+    # modules is cheap because they are lazy as well.
+    from .core import _EXPORTS as core
+    from .exporters import _EXPORTS as exporters
+    return {**{name: "core" for name in core}, **{name: "exporters" for name in exporters}}
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if not name.startswith('_'):
+        package = _exports().get(name)
+        if package is not None:
+            value = getattr(importlib.import_module(f"{__name__}.{package}"), name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBPACKAGES) | set(_exports()))
@@ -0,0 +1,9 @@
+"""
+jsontool.cli: The jsontool command line interface.
+"""
+
+from .json_tool import main
+
+__all__ = [
+    "main",
+]
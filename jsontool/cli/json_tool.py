@@ -0,0 +1,209 @@
+"""
+jsontool command line interface.
+
+Formats, minifies, validates and converts many JSON files in one run::
+
+    python -m jsontool.cli.json_tool format data/ --indent 2
+    python -m jsontool.cli.json_tool minify 'logs/**/*.json' --jobs 8
+    python -m jsontool.cli.json_tool validate configs/ --schema schema.json
+    python -m jsontool.cli.json_tool convert exports/*.json --to csv -o out/
+
+Formatting and minifying stream each file through
+:mod:`jsontool.core.transformer`, so memory use does not grow with the file
+size. Outputs are written atomically, progress and throughput go to stderr,
+and the exit status is 1 if any file failed. Only the modules a subcommand
+needs are imported, and only when it runs.
+"""
+
+import argparse
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from .utils import Progress, atomic_output, expand_inputs, run_tasks
+
+CONVERT_FORMATS = {
+    'csv': '.csv',
+    'xml': '.xml',
+    'yaml': '.yaml',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+
+
+def _reformat(source, target, options):
+    from jsontool.core.transformer import reformat_json
+
+    with atomic_output(target) as temporary:
+        with open(temporary, 'w', encoding='utf-8') as file:
+            reformat_json(source, file, options['indent'])
+            file.write('\n')
+
+
+@lru_cache(maxsize=8)
+def _load_schema(path):
+    from jsontool.core.reader_writer import read_json_from_file
+    from jsontool.core.validator import compile_schema
+
+    return compile_schema(read_json_from_file(path))
+
+
+def _validate(source, target, options):
+    from jsontool.core.reader_writer import read_json_from_file
+
+    data = read_json_from_file(source, backend=options['backend'])
+    if options['schema'] is not None:
+        _load_schema(options['schema']).validate(data)
+
+
+def _convert(source, target, options):
+    file_format = options['to']
+    lines = options['lines'] or Path(source).suffix.lower() in _LINES_EXTENSIONS
+    with atomic_output(target) as temporary:
+        if file_format == 'csv':
+            from jsontool.exporters.json_to_csv import export_json_to_csv
+            export_json_to_csv(source, temporary, prefix=options['prefix'], lines=lines)
+        elif file_format == 'xml':
+            from jsontool.exporters.json_to_xml import export_json_to_xml
+            export_json_to_xml(source, temporary, prefix=options['prefix'], lines=lines)
+        elif file_format == 'yaml':
+            from jsontool.exporters.json_to_yaml import export_json_to_yaml
+            export_json_to_yaml(source, temporary, prefix=options['prefix'], lines=lines)
+        else:
+            from jsontool.exporters.json_to_arrow import export_json_to_arrow
+            export_json_to_arrow(source, temporary, file_format=file_format, prefix=options['prefix'], lines=lines)
+
+
+_COMMANDS = {
+    'format': _reformat,
+    'minify': _reformat,
+    'validate': _validate,
+    'convert': _convert,
+}
+
+
+def process_file(command: str, source: str, target, options: dict):
+    """
+    Run a subcommand on one file.
+
+    Errors are returned rather than raised so that one bad file does not stop
+    the other files.
+
+    Args:
+        command (str): The subcommand name.
+        source (str): The input file.
+        target (str): The output file, or None for commands without output.
+        options (dict): The subcommand options.
+
+    Returns:
+        tuple: ``(source, error, bytes_in, bytes_out)`` where ``error`` is None on success.
+    """
+    try:
+        bytes_in = os.path.getsize(source)
+        _COMMANDS[command](source, target, options)
+    except (OSError, ValueError, TypeError, KeyError, ImportError) as e:
+        return source, str(e) or type(e).__name__, 0, 0
+    bytes_out = os.path.getsize(target) if target is not None else 0
+    return source, None, bytes_in, bytes_out
+
+
+def _target(command: str, source: Path, relative: Path, args):
+    if command == 'validate':
+        return None
+    if command == 'convert':
+        relative = relative.with_suffix(CONVERT_FORMATS[args.to])
+        source = source.with_suffix(CONVERT_FORMATS[args.to])
+    if args.output_dir is not None:
+        return str(Path(args.output_dir) / relative)
+    return str(source)
+
+
+def _options(command: str, args) -> dict:
+    if command == 'format':
+        return {'indent': args.indent}
+    if command == 'minify':
+        return {'indent': None}
+    if command == 'validate':
+        return {'schema': args.schema, 'backend': args.backend}
+    return {'to': args.to, 'prefix': args.prefix, 'lines': args.lines}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the jsontool command."""
+    parser = argparse.ArgumentParser(prog='jsontool', description="Process JSON files in bulk.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('inputs', nargs='+', metavar='PATH',
+                        help="files, directories (searched recursively) or glob patterns")
+    common.add_argument('-j', '--jobs', type=int, default=1,
+                        help="number of worker processes, 0 for one per CPU (default: 1)")
+    common.add_argument('-q', '--quiet', action='store_true', help="only report failures")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('-o', '--output-dir', help="write outputs to this directory instead of next to the inputs")
+    backend = argparse.ArgumentParser(add_help=False)
+    backend.add_argument('--backend', help="JSON backend used for parsing (default: fastest available)")
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    format_parser = commands.add_parser('format', parents=[common, output],
+                                        help="pretty-print files in place or into --output-dir")
+    format_parser.add_argument('--indent', type=int, default=2, help="indentation width (default: 2)")
+    commands.add_parser('minify', parents=[common, output],
+                        help="remove insignificant whitespace in place or into --output-dir")
+    validate_parser = commands.add_parser('validate', parents=[common, backend],
+                                          help="check syntax and optionally a JSON Schema")
+    validate_parser.add_argument('--schema', help="JSON Schema file to validate against")
+    convert_parser = commands.add_parser('convert', parents=[common, output],
+                                         help="convert arrays of records to another format")
+    convert_parser.add_argument('--to', required=True, choices=sorted(CONVERT_FORMATS), help="output format")
+    convert_parser.add_argument('--prefix', default='item',
+                                help="path of the records inside each file (default: item, a top-level array)")
+    convert_parser.add_argument('--lines', action='store_true',
+                                help="read inputs as JSON Lines (implied for .jsonl and .ndjson)")
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Run the jsontool command.
+
+    Args:
+        argv (list, optional): The arguments, without the program name. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status: 0 on success, 1 if a file failed, 2 on usage errors.
+    """
+    args = build_parser().parse_args(argv)
+    if args.jobs < 0:
+        print("error: --jobs must be 0 or more", file=sys.stderr)
+        return 2
+    if getattr(args, 'schema', None) is not None and not os.path.isfile(args.schema):
+        print(f"error: schema file '{args.schema}' does not exist", file=sys.stderr)
+        return 2
+    extensions = ('.json',) + (_LINES_EXTENSIONS if args.command == 'convert' else ())
+    inputs = expand_inputs(args.inputs, extensions)
+    if not inputs:
+        print("error: no input files found", file=sys.stderr)
+        return 2
+    options = _options(args.command, args)
+    tasks = [(args.command, str(source), _target(args.command, source, relative, args), options)
+             for source, relative in inputs]
+    written = {}
+    for _, source, target, _ in tasks:
+        if target is not None and written.setdefault(target, source) != source:
+            print(f"error: '{written[target]}' and '{source}' would both be written to '{target}'",
+                  file=sys.stderr)
+            return 2
+    progress = Progress(len(inputs), quiet=args.quiet)
+    try:
+        for result in run_tasks(process_file, tasks, args.jobs):
+            progress.update(*result)
+    except KeyboardInterrupt:
+        progress.finish()
+        return 130
+    progress.finish()
+    return 1 if progress.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Helpers for the jsontool command line: input expansion, atomic output
+files, progress reporting and the worker pool.
+"""
+
+import glob
+import itertools
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+_GLOB_CHARS = frozenset('*?[')
+
+
+def expand_inputs(arguments: Sequence[str], extensions: Sequence[str] = ('.json',)) -> List[Tuple[Path, Path]]:
+    """
+    Expand files, directories and glob patterns into a list of input files.
+
+    Directories are searched recursively for files with one of the
+    extensions. Plain file arguments are kept even if they do not exist, so
+    that the error is reported for that file.
+
+    Args:
+        arguments (sequence): The command line arguments.
+        extensions (sequence, optional): File extensions searched in directories.
+            Defaults to ('.json',).
+
+    Returns:
+        list: ``(path, relative)`` pairs without duplicates, where ``relative`` is the path
+        below the directory argument or the directory part of the glob pattern before
+        its first wildcard, or the file name.
+    """
+    found = {}
+    for argument in arguments:
+        path = Path(argument)
+        if path.is_dir():
+            for child in sorted(path.rglob('*')):
+                if child.suffix.lower() in extensions and child.is_file():
+                    found.setdefault(child, child.relative_to(path))
+        elif _GLOB_CHARS.intersection(argument):
+            base = Path(*itertools.takewhile(lambda part: not _GLOB_CHARS.intersection(part), path.parent.parts))
+            for match in sorted(glob.glob(argument, recursive=True)):
+                match = Path(match)
+                if match.is_file():
+                    found.setdefault(match, match.relative_to(base))
+        else:
+            found.setdefault(path, Path(path.name))
+    return list(found.items())
+
+
+def _default_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_output(path) -> Iterator[str]:
+    """
+    Provide a temporary path that replaces ``path`` once the block succeeds.
+
+    The temporary file is created in the destination directory, so the final
+    rename is atomic: readers see either the old file or the complete new
+    one, never a partial write. If the block raises, the temporary file is
+    removed and ``path`` is left untouched. The permissions of an existing
+    file are kept.
+
+    Args:
+        path (str): The destination path.
+
+    Yields:
+        str: The temporary path to write to.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    os.close(descriptor)
+    try:
+        yield temporary
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = _default_mode()
+        os.chmod(temporary, mode)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class Progress:
+    """
+    Report progress and throughput on stderr.
+
+    A status line is refreshed in place when stderr is a terminal, and a
+    summary is written when the run finishes.
+
+    Args:
+        total (int): The number of files to process.
+        quiet (bool, optional): Only report failures. Defaults to False.
+        stream (file, optional): The output stream. Defaults to sys.stderr.
+    """
+
+    def __init__(self, total: int, quiet: bool = False, stream=None):
+        self.total = total
+        self.quiet = quiet
+        self.stream = stream if stream is not None else sys.stderr
+        self.done = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.start = time.perf_counter()
+        self._live = not quiet and self.stream.isatty()
+        self._last = 0.0
+
+    def _rates(self) -> str:
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        return f"{self.done / elapsed:,.1f} files/s, {self.bytes_in / elapsed / 1e6:,.1f} MB/s"
+
+    def update(self, source, error, bytes_in: int, bytes_out: int) -> None:
+        """Record the result of one file."""
+        self.done += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        if error is not None:
+            self.failed += 1
+            if self._live:
+                self.stream.write('\r\033[K')
+            self.stream.write(f"error: {source}: {error}\n")
+        if self._live:
+            now = time.perf_counter()
+            if now - self._last >= 0.1 or self.done == self.total:
+                self._last = now
+                self.stream.write(f"\r[{self.done}/{self.total}] {self._rates()}")
+        self.stream.flush()
+
+    def finish(self) -> None:
+        """Write the summary line."""
+        if self._live:
+            self.stream.write('\r\033[K')
+        if not self.quiet:
+            elapsed = time.perf_counter() - self.start
+            self.stream.write(f"{self.done} files, {self.failed} failed, {self.bytes_in / 1e6:,.1f} MB in, "
+                              f"{self.bytes_out / 1e6:,.1f} MB out in {elapsed:.2f} s ({self._rates()})\n")
+        self.stream.flush()
+
+
+def run_tasks(function: Callable, tasks: Iterable[tuple], jobs: int = 1) -> Iterator:
+    """
+    Run ``function(*task)`` for every task, in worker processes when ``jobs`` > 1.
+
+    Results are yielded as they complete. At most ``jobs * 4`` tasks are
+    queued at a time, so memory does not grow with the number of tasks.
+
+    Args:
+        function (callable): A picklable, module-level function.
+        tasks (iterable): The argument tuples.
+        jobs (int, optional): Number of worker processes; 0 means one per CPU. Defaults to 1.
+
+    Yields:
+        Any: The return value of each call, in completion order.
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs == 1:
+        for task in tasks:
+            yield function(*task)
+        return
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(function, *task))
+            if len(pending) >= jobs * 4:
+                completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    yield future.result()
+        while pending:
+            completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                yield future.result()
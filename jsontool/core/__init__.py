@@ -1,18 +1,88 @@
 """
 jsontool.core: Core functionality for JSON manipulation.
 
-This module provides functions to read, write, modify, and navigate
-JSON data.
+This module provides functions to read, write, modify, navigate,
+reformat and diff JSON data.
+
+The public names are imported lazily on first access, so that importing
+the package only loads the submodules that are actually used.
 """
 
-from .reader_writer import read_json_from_string, read_json_from_file, write_json_to_string, write_json_to_file
-from .modifier import add_key_to_json, add_element_to_json_array
-
-__all__ = [
-    "read_json_from_string",
-    "read_json_from_file",
-    "write_json_to_string",
-    "write_json_to_file",
-    "add_key_to_json",
-    "add_element_to_json_array",
-]
+import importlib
+
+# Avoids importing typing at startup; type checkers treat it like typing.TYPE_CHECKING.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from .reader_writer import read_json_from_string, read_json_from_file, write_json_to_string, write_json_to_file, iter_json_file, read_jsonl, write_jsonl
+    from .backends import available_backends, set_default_backend
+    from .modifier import add_key_to_json, add_element_to_json_array, apply_operations
+    from .validator import ValidationError, compile_schema, validate_json, collect_validation_errors, validate_many
+    from .navigator import JsonIndex, JsonPath, compile_jsonpath, find_by_jsonpath, find_first_by_jsonpath
+    from .persistent import JsonDocument, freeze, thaw
+    from .transformer import reformat_json, minify_json, pretty_print_json, reformat_json_string
+    from .cache import JsonCache
+    from .async_io import aread_json_from_file, awrite_json_to_file, aread_jsonl, awrite_jsonl, configure_async_io
+    from .instrumentation import MetricsAggregator, OperationEvent, add_hook, instrument, remove_hook
+    from .diff import diff_json
+
+# Public name -> submodule defining it.
+_EXPORTS = {
+    "read_json_from_string": "reader_writer",
+    "read_json_from_file": "reader_writer",
+    "write_json_to_string": "reader_writer",
+    "write_json_to_file": "reader_writer",
+    "iter_json_file": "reader_writer",
+    "read_jsonl": "reader_writer",
+    "write_jsonl": "reader_writer",
+    "available_backends": "backends",
+    "set_default_backend": "backends",
+    "add_key_to_json": "modifier",
+    "add_element_to_json_array": "modifier",
+    "apply_operations": "modifier",
+    "JsonIndex": "navigator",
+    "JsonPath": "navigator",
+    "compile_jsonpath": "navigator",
+    "find_by_jsonpath": "navigator",
+    "find_first_by_jsonpath": "navigator",
+    "ValidationError": "validator",
+    "compile_schema": "validator",
+    "validate_json": "validator",
+    "collect_validation_errors": "validator",
+    "validate_many": "validator",
+    "JsonDocument": "persistent",
+    "freeze": "persistent",
+    "thaw": "persistent",
+    "reformat_json": "transformer",
+    "minify_json": "transformer",
+    "pretty_print_json": "transformer",
+    "reformat_json_string": "transformer",
+    "JsonCache": "cache",
+    "aread_json_from_file": "async_io",
+    "awrite_json_to_file": "async_io",
+    "aread_jsonl": "async_io",
+    "awrite_jsonl": "async_io",
+    "configure_async_io": "async_io",
+    "instrument": "instrumentation",
+    "add_hook": "instrumentation",
+    "remove_hook": "instrumentation",
+    "MetricsAggregator": "instrumentation",
+    "OperationEvent": "instrumentation",
+    "diff_json": "diff",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    # Cache the value so that later lookups bypass __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,398 @@
+"""
+Asynchronous reading and writing of JSON and JSON Lines files.
+
+asyncio has no asynchronous file I/O, so these coroutines read and write
+files in chunks in the event loop's default executor and never block the
+loop on disk I/O. Parsing a file above the offload threshold runs in an
+executor as well, which can be replaced with :func:`configure_async_io`. A
+``ProcessPoolExecutor`` parses on other CPUs, but the result is unpickled
+in this process in one piece, which blocks the event loop about as long as
+parsing would.
+
+In a thread, the C parsers of json and orjson hold the GIL for the whole
+document, which stalls the event loop as long as parsing inline would. With
+the stdlib backend, large documents are therefore parsed in threads with an
+``object_hook``: calling back into Python for every object lets the
+interpreter switch to the event loop's thread every few milliseconds. Runs
+of the cyclic garbage collector triggered by the growing tree still hold
+the GIL meanwhile. For the same reason, documents are serialized one
+top-level element at a time.
+
+The number of files being read or written at once is capped per event loop,
+so that hundreds of simultaneous requests do not all hold a file in memory.
+"""
+
+import asyncio
+import json
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from .backends import get_backend
+from .reader_writer import _JSONL_ERROR_POLICIES, _parse_jsonl_lines
+
+_UNCHANGED = object()
+_options = {
+    'max_concurrency': 16,
+    'executor': None,
+    'offload_threshold': 1 << 18,
+}
+# One semaphore per event loop; asyncio primitives cannot be shared between loops.
+_limiters = weakref.WeakKeyDictionary()
+# Bytes read, or characters written, per executor call.
+_CHUNK_SIZE = 1 << 20
+
+
+def configure_async_io(max_concurrency: Optional[int] = None, executor=_UNCHANGED,
+                       offload_threshold: Optional[int] = None) -> None:
+    """
+    Set the options of the asynchronous functions; options that are not given are left unchanged.
+
+    Args:
+        max_concurrency (int, optional): The number of files read or written at once per
+            event loop; further calls wait for a slot. Initially 16.
+        executor (Executor, optional): Where files of at least ``offload_threshold`` bytes
+            are read and parsed, or None for the event loop's default executor. Initially None.
+        offload_threshold (int, optional): The file size in bytes from which parsing is
+            offloaded; smaller files are parsed on the event loop. Initially 256 KiB.
+
+    Raises:
+        ValueError: If ``max_concurrency`` is less than 1 or ``offload_threshold`` is negative.
+        TypeError: If ``executor`` is neither None nor an Executor.
+    """
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+    if offload_threshold is not None and offload_threshold < 0:
+        raise ValueError("offload_threshold must not be negative.")
+    if executor is not _UNCHANGED:
+        if executor is not None and not isinstance(executor, Executor):
+            raise TypeError("executor must be a concurrent.futures.Executor or None.")
+        _options['executor'] = executor
+    if offload_threshold is not None:
+        _options['offload_threshold'] = offload_threshold
+    if max_concurrency is not None:
+        _options['max_concurrency'] = max_concurrency
+        # Calls already holding a slot release it to the old semaphore.
+        _limiters.clear()
+
+
+def _limiter() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = asyncio.Semaphore(_options['max_concurrency'])
+    return limiter
+
+
+def _same(value):
+    return value
+
+
+def _file_size(file_path: Path) -> int:
+    if not file_path.is_file():
+        raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+    return file_path.stat().st_size
+
+
+def _read_file(file_path: Path) -> list:
+    chunks = []
+    with file_path.open('rb') as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b''):
+            chunks.append(chunk)
+    return chunks
+
+
+async def _aread_file(loop, file_path: Path) -> list:
+    file = await loop.run_in_executor(None, file_path.open, 'rb')
+    try:
+        chunks = []
+        while True:
+            chunk = await loop.run_in_executor(None, file.read, _CHUNK_SIZE)
+            if not chunk:
+                return chunks
+            chunks.append(chunk)
+    finally:
+        await loop.run_in_executor(None, file.close)
+
+
+def _parse(chunks: list, backend, in_thread: bool) -> Any:
+    text = b''.join(chunks).decode('utf-8')
+    backend = get_backend(backend)
+    if in_thread and backend.name == 'stdlib':
+        return json.loads(text, object_hook=_same)
+    return backend.loads(text)
+
+
+def _read_json_file(file_path: str, backend_name: str) -> Any:
+    return _parse(_read_file(Path(file_path)), backend_name, False)
+
+
+def _iter_json_parts(data, indent, dumps):
+    """Serialize a dict or list like ``dumps`` does, one top-level member at a time."""
+    if not data or (isinstance(data, dict) and not all(isinstance(key, str) for key in data)):
+        yield dumps(data, indent=indent)
+        return
+    if indent is None:
+        separator, newline = ', ', ''
+    else:
+        newline = '\n' + (' ' * indent if isinstance(indent, int) else indent)
+        separator = ',' + newline
+    opening, closing = ('{', '}') if isinstance(data, dict) else ('[', ']')
+    yield opening + newline
+    first = True
+    for item in (data.items() if isinstance(data, dict) else data):
+        if first:
+            first = False
+        else:
+            yield separator
+        if isinstance(data, dict):
+            key, item = item
+            yield dumps(key) + ': '
+        part = dumps(item, indent=indent)
+        # Serialized strings never contain a raw newline, so this only indents lines.
+        yield part.replace('\n', newline) if newline else part
+    yield newline[:1] + closing
+
+
+def _next_chunk(parts) -> str:
+    """Join the next parts of a document into a chunk of at least _CHUNK_SIZE characters, or '' at its end."""
+    chunk = []
+    length = 0
+    for part in parts:
+        chunk.append(part)
+        length += len(part)
+        if length >= _CHUNK_SIZE:
+            break
+    return ''.join(chunk)
+
+
+async def aread_json_from_file(file_path: str, backend=None) -> Any:
+    """
+    Read and parse JSON data from a file without blocking the event loop.
+
+    The file is read in chunks. Files smaller than the offload threshold
+    are parsed on the event loop; larger files are parsed in the executor
+    set with :func:`configure_async_io`. Only the stdlib backend lets the
+    event loop run while a thread parses; the other backends hold the GIL
+    until the whole document is parsed.
+
+    Args:
+        file_path (str): The path to the JSON file.
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
+
+    Returns:
+        dict or list: The parsed JSON object.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        PermissionError: If there are permission issues with the file.
+        ValueError: If the file contains invalid JSON data or the backend is unknown.
+    """
+    backend = get_backend(backend)
+    file_path = Path(file_path)
+    loop = asyncio.get_running_loop()
+    async with _limiter():
+        try:
+            size = await loop.run_in_executor(None, _file_size, file_path)
+            executor = _options['executor']
+            if size >= _options['offload_threshold'] and not (
+                    executor is None or isinstance(executor, ThreadPoolExecutor)):
+                # The worker reads the file itself rather than being sent its contents.
+                return await loop.run_in_executor(executor, _read_json_file, str(file_path), backend.name)
+            chunks = await _aread_file(loop, file_path)
+            if size < _options['offload_threshold']:
+                return _parse(chunks, backend, False)
+            return await loop.run_in_executor(executor, _parse, chunks, backend, True)
+        except PermissionError:
+            raise PermissionError(f"Permission denied: '{file_path}'.")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid JSON in the file '{file_path}': {e}")
+
+
+async def awrite_json_to_file(data, file_path: str, indent=None, backend=None) -> None:
+    """
+    Write a Python object to a file in JSON format without blocking the event loop.
+
+    The data is serialized one top-level member at a time and written in
+    chunks in the event loop's default executor, with the same output as
+    :func:`jsontool.core.reader_writer.write_json_to_file`. The file is
+    opened once the first chunk is serialized; if serializing fails after
+    that, the file is left incomplete, as with :func:`awrite_jsonl`.
+
+    Args:
+        data (dict or list): The Python object to be written.
+        file_path (str): The path to the file where JSON will be written.
+        indent (int, optional): Number of spaces for indentation in the output.
+            Defaults to None (compact format).
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
+
+    Raises:
+        TypeError: If the input data is not a dict or a list.
+        ValueError: If the data is not serializable to JSON.
+        OSError: If there is an issue writing to the file.
+    """
+    if not isinstance(data, (dict, list)):
+        raise TypeError("Input must be a dictionary or a list.")
+    backend = get_backend(backend)
+    loop = asyncio.get_running_loop()
+    file_path = Path(file_path)
+    parts = _iter_json_parts(data, indent, backend.dumps)
+    async with _limiter():
+        file = None
+        try:
+            try:
+                while True:
+                    chunk = await loop.run_in_executor(None, _next_chunk, parts)
+                    if not chunk:
+                        break
+                    if file is None:
+                        file = await loop.run_in_executor(None, lambda: file_path.open('w', encoding='utf-8'))
+                    await loop.run_in_executor(None, file.write, chunk)
+            finally:
+                if file is not None:
+                    await loop.run_in_executor(None, file.close)
+        except TypeError as e:
+            raise ValueError(f"Unable to serialize data to JSON: {e}")
+        except OSError as e:
+            raise OSError(f"Unable to write to file '{file_path}': {e}")
+
+
+def _open_jsonl(file_path: Path):
+    if not file_path.is_file():
+        raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+    return file_path.open('rb')
+
+
+def _read_jsonl_batch(file, batch_bytes: int, on_error: str, loads):
+    lines = [line.rstrip(b'\r\n') for line in file.readlines(batch_bytes)]
+    return _parse_jsonl_lines(lines, on_error, loads)
+
+
+async def aread_jsonl(file_path: str, on_error: str = 'raise', errors=None, backend=None,
+                      batch_bytes: int = 1 << 16) -> AsyncIterator[Any]:
+    """
+    Lazily read records from a JSON Lines file without blocking the event loop.
+
+    Batches of lines are read and parsed in the event loop's default
+    executor. The file counts against the concurrency cap until the
+    iteration ends or the generator is closed.
+
+    Args:
+        file_path (str): The path to the JSON Lines file.
+        on_error (str, optional): What to do with malformed lines: 'raise',
+            'skip' or 'collect'. Defaults to 'raise'.
+        errors (list, optional): List that receives (line_number, message)
+            tuples for malformed lines. Required when on_error is 'collect'.
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
+        batch_bytes (int, optional): Approximate size of each batch of lines. Defaults to 64 KiB.
+
+    Yields:
+        Any: Each parsed record.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        PermissionError: If there are permission issues with the file.
+        ValueError: If a line contains invalid JSON and on_error is 'raise',
+            or if the error policy is unknown.
+        TypeError: If on_error is 'collect' and no errors list is given.
+    """
+    if on_error not in _JSONL_ERROR_POLICIES:
+        raise ValueError(f"Unknown error policy '{on_error}'. Expected one of {_JSONL_ERROR_POLICIES}.")
+    if on_error == 'collect' and not isinstance(errors, list):
+        raise TypeError("An 'errors' list is required when on_error is 'collect'.")
+    loads = get_backend(backend).loads
+    file_path = Path(file_path)
+    loop = asyncio.get_running_loop()
+    async with _limiter():
+        try:
+            file = await loop.run_in_executor(None, _open_jsonl, file_path)
+        except PermissionError:
+            raise PermissionError(f"Permission denied: '{file_path}'.")
+        try:
+            first_line = 1
+            while True:
+                records, batch_errors, line_count = await loop.run_in_executor(
+                    None, _read_jsonl_batch, file, batch_bytes, on_error, loads)
+                if not line_count:
+                    return
+                for line_offset, message in batch_errors:
+                    line_number = first_line + line_offset - 1
+                    if on_error == 'raise':
+                        for record in records:
+                            yield record
+                        raise ValueError(f"Invalid JSON on line {line_number} of the file '{file_path}': {message}")
+                    errors.append((line_number, message))
+                for record in records:
+                    yield record
+                first_line += line_count
+        finally:
+            file.close()
+
+
+def _write_jsonl_batch(file, records, dumps, count: int) -> int:
+    for count, record in enumerate(records, count + 1):
+        try:
+            line = dumps(record)
+        except TypeError as e:
+            raise ValueError(f"Unable to serialize record {count} to JSON: {e}")
+        file.write(line)
+        file.write('\n')
+    return count
+
+
+async def awrite_jsonl(records, file_path: str, backend=None, batch_size: int = 1000) -> int:
+    """
+    Write records to a file in JSON Lines format without blocking the event loop.
+
+    Records are serialized and written in batches in the event loop's
+    default executor, so neither the records nor the output are held in
+    memory as a whole.
+
+    Args:
+        records (iterable or async iterable): The Python objects to be written, one per line.
+        file_path (str): The path to the file where the records will be written.
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
+        batch_size (int, optional): Number of records written per executor call. Defaults to 1000.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        ValueError: If a record is not serializable to JSON.
+        OSError: If there is an issue writing to the file.
+    """
+    dumps = get_backend(backend).dumps
+    file_path = Path(file_path)
+    loop = asyncio.get_running_loop()
+    async with _limiter():
+        try:
+            file = await loop.run_in_executor(None, lambda: file_path.open('w', encoding='utf-8'))
+            try:
+                count = 0
+                batch = []
+                async for record in _records(records):
+                    batch.append(record)
+                    if len(batch) >= batch_size:
+                        count = await loop.run_in_executor(None, _write_jsonl_batch, file, batch, dumps, count)
+                        batch = []
+                if batch:
+                    count = await loop.run_in_executor(None, _write_jsonl_batch, file, batch, dumps, count)
+            finally:
+                await loop.run_in_executor(None, file.close)
+        except OSError as e:
+            raise OSError(f"Unable to write to file '{file_path}': {e}")
+    return count
+
+
+async def _records(records):
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
@@ -0,0 +1,264 @@
+"""
+Pluggable JSON parsing and serialization backends.
+
+The stdlib ``json`` module is always available. Faster third-party libraries
+(orjson, pysimdjson, ujson) are registered when they can be imported. Every
+backend is wrapped so that it behaves like the stdlib: whenever the fast path
+rejects an input (syntax errors, integers beyond 64 bits, NaN literals,
+unsupported types...), the call is retried with ``json`` so that results and
+exception types and messages are identical regardless of the backend.
+"""
+
+import json
+import re
+
+
+class JsonBackend:
+    """
+    A named pair of parse/serialize functions.
+
+    Args:
+        name (str): The name used to select the backend.
+        loads (callable): Parses a ``str`` or bytes-like document. May raise any
+            exception on input it cannot handle; the stdlib is then used instead.
+        dumps (callable, optional): Serializes ``(data, indent)`` to a ``str``
+            with non-ASCII characters preserved, or returns None when it cannot
+            reproduce the stdlib output for that indent. Defaults to None
+            (always serialize with the stdlib).
+    """
+
+    def __init__(self, name, loads, dumps=None):
+        self.name = name
+        self._loads = loads
+        self._dumps = dumps
+
+    def __repr__(self):
+        return f"JsonBackend({self.name!r})"
+
+    def loads(self, document):
+        """
+        Parse a JSON document.
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON.
+        """
+        if self._loads is not json.loads:
+            try:
+                return self._loads(document)
+            except Exception:
+                pass
+        if not isinstance(document, (str, bytes, bytearray)):
+            # json.loads does not accept memoryview or mmap objects; decode
+            # them the way it decodes bytes, without an intermediate copy.
+            view = memoryview(document).cast('B')
+            document = str(view, json.detect_encoding(bytes(view[:4])), 'surrogatepass')
+        return json.loads(document)
+
+    def dumps(self, data, indent=None):
+        """
+        Serialize a Python object to a JSON string.
+
+        Raises:
+            TypeError: If the data is not serializable to JSON.
+        """
+        if self._dumps is not None:
+            try:
+                result = self._dumps(data, indent)
+            except Exception:
+                result = None
+            if result is not None:
+                return result
+        return json.dumps(data, indent=indent, ensure_ascii=False)
+
+
+_BACKENDS = {}
+# Preference order used when the backend is 'auto'.
+_PREFERENCE = ['orjson', 'simdjson', 'ujson', 'stdlib']
+_default = 'auto'
+
+
+def register_backend(backend: JsonBackend):
+    """
+    Register a backend, replacing any backend with the same name.
+
+    Args:
+        backend (JsonBackend): The backend to register.
+    """
+    if not isinstance(backend, JsonBackend):
+        raise TypeError("Backend must be a JsonBackend instance.")
+    _BACKENDS[backend.name] = backend
+
+
+def available_backends():
+    """
+    Return the names of the registered backends, fastest first.
+
+    Returns:
+        list: The backend names.
+    """
+    preferred = [name for name in _PREFERENCE if name in _BACKENDS]
+    return preferred + sorted(name for name in _BACKENDS if name not in _PREFERENCE)
+
+
+def get_backend(name=None) -> JsonBackend:
+    """
+    Look up a backend by name.
+
+    Args:
+        name (str, optional): The backend name, 'auto' for the fastest available
+            one, or None for the process-wide default.
+
+    Returns:
+        JsonBackend: The backend.
+
+    Raises:
+        ValueError: If no backend with that name is registered.
+    """
+    if isinstance(name, JsonBackend):
+        return name
+    if name is None:
+        name = _default
+    if name == 'auto':
+        return _BACKENDS[available_backends()[0]]
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON backend '{name}'. Available backends: {available_backends()}.")
+
+
+def set_default_backend(name: str):
+    """
+    Set the backend used when a function is called without ``backend``.
+
+    Args:
+        name (str): A registered backend name or 'auto'.
+
+    Raises:
+        ValueError: If no backend with that name is registered.
+    """
+    global _default
+    if name != 'auto':
+        get_backend(name)
+    _default = name
+
+
+_DIGITS_TO_ZERO = bytes(ord('0') if ord('0') <= i <= ord('9') else ord(' ') for i in range(256))
+_LONG_INTEGER = b'0' * 19
+_SCAN_CHUNK = 1 << 20
+
+
+def _has_long_integer(document):
+    """
+    Check whether a document contains a run of 19 or more digits.
+
+    Some fast parsers silently turn integers beyond 64 bits into floats,
+    whereas the stdlib keeps them exact. Mapping every digit to '0' lets a
+    plain substring search find long digit runs far faster than a regex; a
+    false positive inside a string value only costs a stdlib parse. The
+    document is scanned in chunks so that a memory-mapped input is never
+    copied as a whole.
+    """
+    view = document if isinstance(document, str) else memoryview(document).cast('B')
+    overlap = len(_LONG_INTEGER) - 1
+    for start in range(0, len(view), _SCAN_CHUNK):
+        chunk = view[max(start - overlap, 0):start + _SCAN_CHUNK]
+        chunk = chunk.encode('utf-8', 'surrogatepass') if isinstance(chunk, str) else bytes(chunk)
+        if chunk.translate(_DIGITS_TO_ZERO).find(_LONG_INTEGER) != -1:
+            return True
+    return False
+
+
+register_backend(JsonBackend('stdlib', json.loads))
+
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+    # Types that orjson would serialize natively but the stdlib rejects are
+    # passed through so that they raise and fall back to the stdlib error.
+    _ORJSON_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+    # A literal first character lets the regex engine skip ahead quickly;
+    # the digit before the 'e' is checked separately.
+    _EXPONENT = re.compile(rb'e-?\d')
+    # Subclasses are passed through and make orjson fail, so only these
+    # exact types can hold a value written as null.
+    _CONTAINER_TYPES = frozenset((dict, list, tuple))
+    # orjson nests at most 254 levels, so indents are below 512 spaces.
+    _INDENT_WIDTHS = [b'\n' + b' ' * (1 << k) for k in range(8, 0, -1)]
+
+    def _has_exponent(result):
+        # orjson writes exponents as '1e16' where the stdlib writes '1e+16'.
+        # A match inside a string value only costs a redundant stdlib call.
+        return any(result[match.start() - 1:match.start()].isdigit() for match in _EXPONENT.finditer(result))
+
+    def _has_non_finite(data):
+        # orjson writes NaN and infinities as null where the stdlib writes
+        # NaN/Infinity. Only documents whose output holds a null are walked.
+        stack = [(data,)]
+        while stack:
+            container = stack.pop()
+            for value in container.values() if type(container) is dict else container:
+                kind = type(value)
+                if kind is float:
+                    # inf - inf and nan - nan are both NaN.
+                    if value - value != 0:
+                        return True
+                elif kind in _CONTAINER_TYPES:
+                    stack.append(value)
+        return False
+
+    def _orjson_compact(data, indented):
+        # orjson writes ',' and ':' where the stdlib writes ', ' and ': '.
+        # Strings are written alike in both layouts and newlines inside them
+        # are escaped, so the separators are the commas before a newline in
+        # the two-space layout and the colons followed by a space there but
+        # not in the compact one. When the compact output has no other commas
+        # and colons, none of them is inside a string.
+        compact = orjson.dumps(data, option=_ORJSON_OPTIONS)
+        colons = indented.count(b': ') - compact.count(b': ')
+        if compact.count(b',') == indented.count(b',\n') and compact.count(b':') == colons:
+            return compact.replace(b',', b', ').replace(b':', b': ')
+        # Otherwise strip the newlines and the indentation following them
+        # from the two-space layout, in power-of-two widths deepest first.
+        result = indented.replace(b',\n', b', \n')
+        for width in _INDENT_WIDTHS:
+            result = result.replace(width, b'\n')
+        return result.replace(b'\n', b'')
+
+    def _orjson_dumps(data, indent):
+        # orjson only has a two-space layout, from which the compact one is
+        # derived.
+        if indent not in (None, 2):
+            return None
+        result = orjson.dumps(data, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+        if _has_exponent(result) or (b'null' in result and _has_non_finite(data)):
+            return None
+        if indent is None:
+            result = _orjson_compact(data, result)
+        return result.decode('utf-8')
+
+    def _orjson_loads(document):
+        if _has_long_integer(document):
+            raise ValueError("Integer may exceed 64-bit range.")
+        return orjson.loads(document)
+
+    register_backend(JsonBackend('orjson', _orjson_loads, _orjson_dumps))
+
+try:
+    import simdjson
+except ImportError:
+    pass
+else:
+    register_backend(JsonBackend('simdjson', simdjson.loads))
+
+try:
+    import ujson
+except ImportError:
+    pass
+else:
+    register_backend(JsonBackend('ujson', ujson.loads))
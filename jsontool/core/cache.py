@@ -0,0 +1,251 @@
+"""
+Caching of parsed JSON files.
+
+A :class:`JsonCache` keeps the parsed content of files that are read over
+and over, such as configuration and reference data, and parses a file again
+only when it changed on disk. It is opt-in: pass one to
+:func:`jsontool.core.reader_writer.read_json_from_file` as ``cache``, or call
+:meth:`JsonCache.get` directly.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from stat import S_ISREG
+from sys import getsizeof
+from typing import Any, Optional
+
+from .backends import get_backend
+from .persistent import freeze
+
+# Timestamps are only as fine as the file system and kernel clock: a file
+# written again within this long of the cached version may keep the same
+# mtime. Such entries also keep a digest of the content and are verified
+# against it until they are old enough.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _signature(stat: os.stat_result) -> tuple:
+    # ctime also changes when a tool restores the old mtime after writing.
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns
+
+
+def _is_racy(stat: os.stat_result, now: int) -> bool:
+    return now - max(stat.st_mtime_ns, stat.st_ctime_ns) < _RACY_WINDOW_NS
+
+
+def estimate_size(json_data: Any) -> int:
+    """
+    Estimate the memory held by JSON data, in bytes.
+
+    The sizes of all containers, keys and values are added up. Objects that
+    are shared, such as small integers, are counted at every occurrence, so
+    the estimate errs on the high side.
+
+    Args:
+        json_data (Any): The JSON data.
+
+    Returns:
+        int: The estimated size.
+    """
+    size = getsizeof(json_data)
+    if isinstance(json_data, (dict, list)):
+        size += _content_size(json_data)
+    return size
+
+
+def _content_size(container) -> int:
+    if isinstance(container, dict):
+        children = container.values()
+        size = sum(map(getsizeof, container)) + sum(map(getsizeof, children))
+    else:
+        children = container
+        size = sum(map(getsizeof, children))
+    return size + sum([_content_size(child) for child in children if isinstance(child, (dict, list))])
+
+
+class _Entry:
+    __slots__ = ('signature', 'value', 'size', 'digest')
+
+    def __init__(self, signature, value, size, digest):
+        self.signature = signature
+        self.value = value
+        self.size = size
+        self.digest = digest
+
+
+class JsonCache:
+    """
+    A thread-safe LRU cache of parsed JSON files.
+
+    Entries are keyed by the absolute path of the file and validated on
+    every read against its device, inode, size, mtime and ctime, so a file
+    that changed on disk, or was replaced by another file, is parsed again.
+    For a file modified within the last two seconds, a digest of the content
+    is checked as well, because a second write in the same clock tick may
+    leave the timestamps unchanged.
+
+    The least recently used entries are evicted once the estimated memory of
+    the cached values exceeds ``max_bytes``; a value larger than that on its
+    own is returned without being cached.
+
+    Args:
+        max_bytes (int, optional): Bound on the estimated memory of the cached values,
+            see :func:`estimate_size`. Defaults to 64 MiB.
+        copy (bool, optional): Whether each read returns a new mutable copy of the data.
+            By default all readers share one deeply frozen value (see
+            :func:`jsontool.core.persistent.freeze`), which costs nothing per read but
+            raises TypeError on modification. Copies are kept pickled, which also makes
+            the entries smaller. Defaults to False.
+
+    Raises:
+        ValueError: If ``max_bytes`` is negative.
+
+    Attributes:
+        hits (int): Reads answered from the cache.
+        misses (int): Reads that parsed the file.
+        evictions (int): Entries dropped to stay within ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20, copy: bool = False):
+        if max_bytes < 0:
+            raise ValueError("The cache size must not be negative.")
+        self.max_bytes = max_bytes
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (f"JsonCache(entries={len(self._entries)}, size={self._size}, max_bytes={self.max_bytes}, "
+                f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})")
+
+    @property
+    def size(self) -> int:
+        """The estimated memory of the cached values, in bytes."""
+        return self._size
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``evictions``, ``entries`` and ``size``.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'size': self._size}
+
+    def get(self, file_path, backend=None) -> Any:
+        """
+        Return the parsed content of a file, parsing it only if needed.
+
+        Args:
+            file_path (str): The path to the JSON file.
+            backend (str, optional): The JSON backend used when the file is parsed. Defaults
+                to the process-wide default backend.
+
+        Returns:
+            Any: The parsed JSON data; frozen, or a mutable copy with ``copy=True``.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+            PermissionError: If there are permission issues with the file.
+            ValueError: If the file contains invalid JSON data.
+        """
+        key = os.path.abspath(file_path)
+        try:
+            stat = os.stat(key)
+        except (FileNotFoundError, NotADirectoryError):
+            stat = None
+        if stat is None or not S_ISREG(stat.st_mode):
+            self.invalidate(key)
+            raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.digest is None and entry.signature == _signature(stat):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._result(entry.value)
+        return self._load(key, file_path, entry, backend)
+
+    def _result(self, cached: Any) -> Any:
+        # Copies are kept pickled: unpickling is faster than copying a tree in Python.
+        return pickle.loads(cached) if self.copy else cached
+
+    def _load(self, key: str, file_path, entry: Optional[_Entry], backend) -> Any:
+        now = time.time_ns()
+        try:
+            with open(key, 'rb') as file:
+                data = file.read()
+                stat = os.fstat(file.fileno())
+        except PermissionError:
+            raise PermissionError(f"Permission denied: '{file_path}'.")
+        signature = _signature(stat)
+        racy = _is_racy(stat, now)
+        digest = None
+        if racy or (entry is not None and entry.digest is not None):
+            digest = hashlib.blake2b(data).digest()
+            if entry is not None and entry.digest == digest and entry.signature == signature:
+                # A recently written file whose content has not changed since.
+                with self._lock:
+                    if not racy:
+                        entry.digest = None
+                    if self._entries.get(key) is entry:
+                        self._entries.move_to_end(key)
+                    self.hits += 1
+                return self._result(entry.value)
+        with self._lock:
+            self.misses += 1
+        try:
+            value = get_backend(backend).loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid JSON in the file '{file_path}': {e}")
+        if self.copy:
+            cached = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            size = getsizeof(cached)
+        else:
+            value = cached = freeze(value)
+            size = estimate_size(value)
+        self._store(key, _Entry(signature, cached, size, digest if racy else None))
+        return value
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def invalidate(self, file_path=None) -> None:
+        """
+        Drop the entry of one file, or every entry.
+
+        Args:
+            file_path (str, optional): The file to forget. Defaults to None (all files).
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            entry = self._entries.pop(os.path.abspath(file_path), None)
+            if entry is not None:
+                self._size -= entry.size
@@ -0,0 +1,244 @@
+"""
+Structural diff of JSON documents.
+
+:func:`diff_json` computes a JSON Patch (RFC 6902) that turns one document
+into another, so that a change can be shipped instead of the whole document
+and applied with :func:`jsontool.core.modifier.apply_operations`.
+
+Subtrees are compared with ``==`` first, which runs in C and lets identical
+parts of the documents be skipped quickly. Since ``True == 1 == 1.0`` in
+Python, equal subtrees are then checked for values of different types one
+level at a time, with the work per element done in C. Objects
+are compared key by key. Arrays are aligned with Myers' O(ND) algorithm for
+the longest common subsequence, which is fast when the arrays differ in few
+places; elements are matched either by content or, with ``array_key``, by
+the value of an identifying key so that an edited record is patched rather
+than removed and added again.
+"""
+
+from itertools import chain, compress
+from typing import Any, Dict, List, Optional
+
+# Arrays needing more insertions and deletions than this to align are
+# patched position by position instead; aligning them costs O(D**2).
+_MAX_EDIT_DISTANCE = 1024
+# Marks the array tokens made from the value of array_key.
+_KEYED = object()
+_is_dict = frozenset((dict,)).__contains__
+_is_list = frozenset((list,)).__contains__
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _equal(old: Any, new: Any) -> bool:
+    # Equal as by the 'test' operation; see _same for containers.
+    return old is new or (type(old) is type(new) and old == new)
+
+
+def _same(old: Any, new: Any) -> bool:
+    # True == 1 == 1.0 in Python, but they are different JSON values, also
+    # inside containers that compare equal.
+    if old is new:
+        return True
+    if type(old) is not type(new) or old != new:
+        return False
+    return not isinstance(old, (dict, list)) or _same_types(old, new)
+
+
+def _same_types(old: Any, new: Any) -> bool:
+    """
+    Check that two containers equal under ``==`` hold values of the same
+    types. The containers are walked one level at a time, so that the work
+    per element is done in C.
+    """
+    old_dicts, old_lists = ([old], []) if type(old) is dict else ([], [old])
+    new_dicts, new_lists = ([new], []) if type(new) is dict else ([], [new])
+    while old_dicts or old_lists:
+        if list(chain.from_iterable(old_dicts)) == list(chain.from_iterable(new_dicts)):
+            new_values = chain.from_iterable(map(dict.values, new_dicts))
+        else:
+            # Equal objects may list their keys in another order.
+            new_values = (new_dict[key] for old_dict, new_dict in zip(old_dicts, new_dicts) for key in old_dict)
+        old_values = list(chain(chain.from_iterable(map(dict.values, old_dicts)), chain.from_iterable(old_lists)))
+        new_values = list(chain(new_values, chain.from_iterable(new_lists)))
+        types = list(map(type, old_values))
+        if types != list(map(type, new_values)):
+            return False
+        old_dicts = new_dicts = old_lists = new_lists = ()
+        if dict in types:
+            dicts = list(map(_is_dict, types))
+            old_dicts, new_dicts = list(compress(old_values, dicts)), list(compress(new_values, dicts))
+        if list in types:
+            lists = list(map(_is_list, types))
+            old_lists, new_lists = list(compress(old_values, lists)), list(compress(new_values, lists))
+    return True
+
+
+class _Differ:
+    """Appends the operations turning one value into another to a patch."""
+
+    def __init__(self, array_key: Optional[str]):
+        self.array_key = array_key
+        self.patch: List[Dict[str, Any]] = []
+
+    def diff(self, old: Any, new: Any, path: str) -> None:
+        if _same(old, new):
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            self.diff_objects(old, new, path)
+        elif isinstance(old, list) and isinstance(new, list):
+            self.diff_arrays(old, new, path)
+        else:
+            self.patch.append({'op': 'replace', 'path': path, 'value': new})
+
+    def diff_objects(self, old: dict, new: dict, path: str) -> None:
+        patch = self.patch
+        for key, value in old.items():
+            if key not in new:
+                patch.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+            else:
+                self.diff(value, new[key], f"{path}/{_escape(key)}")
+        for key, value in new.items():
+            if key not in old:
+                patch.append({'op': 'add', 'path': f"{path}/{_escape(key)}", 'value': value})
+
+    def tokens(self, array: list) -> list:
+        key = self.array_key
+        if key is None:
+            return array
+        # Elements identified by the key compare by its value (and type);
+        # other elements compare by content.
+        return [(_KEYED, type(element[key]), element[key])
+                if type(element) is dict and key in element else element for element in array]
+
+    def diff_arrays(self, old: list, new: list, path: str) -> None:
+        old_tokens = self.tokens(old)
+        new_tokens = self.tokens(new)
+        start = 0
+        end = min(len(old), len(new))
+        while start < end and _equal(old_tokens[start], new_tokens[start]):
+            start += 1
+        suffix = 0
+        while suffix < end - start and _equal(old_tokens[-1 - suffix], new_tokens[-1 - suffix]):
+            suffix += 1
+        pairs = _align(old_tokens[start:len(old) - suffix], new_tokens[start:len(new) - suffix])
+        pairs = ([(i, i) for i in range(start)]
+                 + [(i + start, j + start) for i, j in pairs]
+                 + [(len(old) - k, len(new) - k) for k in range(suffix, 0, -1)])
+        unchanged = self.unchanged(old, new, pairs, matched_by_content=self.array_key is None)
+        # Walking forwards, the array being patched starts with new[:j] when
+        # old[i] is reached, so old[i] is then at index j.
+        i = j = 0
+        for (next_i, next_j), same in zip(pairs + [(len(old), len(new))], unchanged + [True]):
+            self.diff_gap(old, new, path, i, next_i, j, next_j)
+            # Elements matched by key, or by content that differs only in
+            # the types of equal numbers, are patched in place.
+            if not same:
+                self.diff(old[next_i], new[next_j], f"{path}/{next_j}")
+            i, j = next_i + 1, next_j + 1
+
+    @staticmethod
+    def unchanged(old: list, new: list, pairs: list, matched_by_content: bool) -> List[bool]:
+        """Tell, for each matched pair of elements, whether it is unchanged."""
+        olds = [old[i] for i, _ in pairs]
+        news = [new[j] for _, j in pairs]
+        # The equal pairs are checked for values of different types all at
+        # once, and only one by one if some pair holds any.
+        unchanged = [True] * len(pairs) if matched_by_content else list(map(_equal, olds, news))
+        if _same_types(list(compress(olds, unchanged)), list(compress(news, unchanged))):
+            return unchanged
+        return list(map(_same, olds, news))
+
+    def diff_gap(self, old: list, new: list, path: str, i: int, i_end: int, j: int, j_end: int) -> None:
+        # Unmatched elements are paired up and patched in place; the rest of
+        # the gap is removed or inserted.
+        paired = min(i_end - i, j_end - j)
+        for k in range(paired):
+            self.diff(old[i + k], new[j + k], f"{path}/{j + k}")
+        for _ in range(i_end - i - paired):
+            self.patch.append({'op': 'remove', 'path': f"{path}/{j + paired}"})
+        for k in range(j + paired, j_end):
+            self.patch.append({'op': 'add', 'path': f"{path}/{k}", 'value': new[k]})
+
+
+def _align(old: list, new: list) -> list:
+    """
+    Return the index pairs of a longest common subsequence of two sequences,
+    or no pairs when more than ``_MAX_EDIT_DISTANCE`` edits separate them.
+    """
+    n, m = len(old), len(new)
+    if not n or not m:
+        return []
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, _MAX_EDIT_DISTANCE) + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and _equal(old[x], new[y]):
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return []
+
+
+def _backtrack(trace: list, x: int, y: int) -> list:
+    pairs = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if d == 0:
+            previous_x = previous_y = 0
+        else:
+            previous_k = k + 1 if k == -d or (k != d and v[k - 1] < v[k + 1]) else k - 1
+            previous_x = v[previous_k]
+            previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            pairs.append((x, y))
+        x, y = previous_x, previous_y
+    pairs.reverse()
+    return pairs
+
+
+def diff_json(old: Any, new: Any, array_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Compute a JSON Patch (RFC 6902) that turns ``old`` into ``new``.
+
+    The patch uses ``add``, ``remove`` and ``replace`` operations and can be
+    applied with :func:`jsontool.core.modifier.apply_operations`. Array
+    elements are aligned on a longest common subsequence, so inserting or
+    removing an element does not rewrite the rest of the array; elements
+    that changed in place are patched recursively. With ``array_key``,
+    array elements that are objects holding that key (such as ``"id"``)
+    are matched by its value, and elements moved to another position are
+    removed and added again.
+
+    Values are compared as by the ``test`` operation, with ``==``, except
+    that values of different types (``true``, ``1`` and ``1.0``) differ,
+    also inside arrays and objects. Values in the patch are the objects of
+    ``new`` itself, not copies. When the documents have different types at
+    the root, or are not containers, the patch is a single ``replace`` of
+    the root, which :func:`apply_operations` cannot apply in place.
+
+    Args:
+        old (Any): The original document.
+        new (Any): The changed document.
+        array_key (str, optional): The key identifying array elements. Defaults to None
+            (elements are matched by content).
+
+    Returns:
+        list: The patch operations, empty if the documents are equal.
+    """
+    differ = _Differ(array_key)
+    differ.diff(old, new, '')
+    return differ.patch
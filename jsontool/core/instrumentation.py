@@ -0,0 +1,438 @@
+"""
+Opt-in instrumentation of jsontool operations.
+
+The public functions of the reader/writer, the modifier, the validator and
+the exporters report every call to the registered hooks as an
+:class:`OperationEvent`: the kind of operation (``parse``, ``serialize``,
+``modify``, ``validate`` or ``export``), the wall time, the bytes read and
+written, the number of elements and, when memory tracing is on, the
+tracemalloc peak.
+
+Nothing is measured while no hook is registered; an instrumented call then
+costs one extra function call and a truthiness check. Use
+:func:`instrument` to collect metrics for a block of code::
+
+    with instrument() as metrics:
+        data = read_json_from_file('data.json')
+    print(metrics.summary())
+
+Operations that call other instrumented functions, such as an export from a
+JSON Lines file, report the inner operations as events of their own.
+"""
+
+import functools
+import os
+import threading
+import time
+
+# Registered hooks. The tuple is replaced rather than mutated so that calls in
+# other threads can iterate over it without a lock.
+_hooks = ()
+_hooks_lock = threading.Lock()
+# Number of active instrument(trace_memory=True) blocks.
+_memory_tracing = 0
+_started_tracemalloc = False
+_local = threading.local()
+
+
+class OperationEvent:
+    """
+    One call of an instrumented function.
+
+    Attributes:
+        operation (str): 'parse', 'serialize', 'modify', 'validate' or 'export'.
+        function (str): The name of the function called.
+        seconds (float): The wall time spent in the call; for iterators, the time
+            spent producing the items, excluding the time the consumer held them.
+        bytes_in (int or None): The size of the input text or file, if there is one.
+        bytes_out (int or None): The size of the output text or file, if there is one.
+        items (int or None): The number of records, or of top-level elements of a
+            document, that were read, written or checked.
+        memory_peak (int or None): The peak of memory allocated during the call above
+            the level at its start, in bytes, when memory tracing is on.
+        error (str or None): The name of the exception raised by the call, if any.
+    """
+
+    __slots__ = ('operation', 'function', 'seconds', 'bytes_in', 'bytes_out', 'items', 'memory_peak', 'error')
+
+    def __init__(self, operation, function, seconds, bytes_in=None, bytes_out=None, items=None,
+                 memory_peak=None, error=None):
+        self.operation = operation
+        self.function = function
+        self.seconds = seconds
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.items = items
+        self.memory_peak = memory_peak
+        self.error = error
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"OperationEvent({fields})"
+
+
+def add_hook(hook) -> None:
+    """
+    Register a callable invoked as ``hook(event)`` after every instrumented call.
+
+    Hooks run in the thread that made the call, so they must be thread-safe
+    when jsontool is used from several threads.
+
+    Args:
+        hook (Callable): The function receiving :class:`OperationEvent` objects.
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook) -> None:
+    """
+    Unregister a hook added with :func:`add_hook`; unknown hooks are ignored.
+
+    Args:
+        hook (Callable): The hook to remove.
+    """
+    global _hooks
+    with _hooks_lock:
+        if hook in _hooks:
+            hooks = list(_hooks)
+            hooks.remove(hook)
+            _hooks = tuple(hooks)
+
+
+def _emit(event):
+    for hook in _hooks:
+        hook(event)
+
+
+def _enable_memory_tracing():
+    global _memory_tracing, _started_tracemalloc
+    import tracemalloc
+
+    with _hooks_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+        _memory_tracing += 1
+
+
+def _disable_memory_tracing():
+    global _memory_tracing, _started_tracemalloc
+    import tracemalloc
+
+    with _hooks_lock:
+        _memory_tracing -= 1
+        if not _memory_tracing and _started_tracemalloc:
+            tracemalloc.stop()
+            _started_tracemalloc = False
+
+
+def _memory_start():
+    """
+    Start a region whose absolute tracemalloc peak is returned by :func:`_memory_end`.
+
+    tracemalloc keeps a single peak, which every region resets; the peak of
+    the enclosing region seen so far is saved on a per-thread stack first.
+    Returns the memory allocated at the start.
+    """
+    import tracemalloc
+
+    stack = _local.__dict__.setdefault('memory', [])
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        stack[-1] = max(stack[-1], peak)
+    tracemalloc.reset_peak()
+    stack.append(current)
+    return current
+
+
+def _memory_end():
+    import tracemalloc
+
+    stack = _local.memory
+    peak = max(tracemalloc.get_traced_memory()[1], stack.pop())
+    if stack:
+        stack[-1] = max(stack[-1], peak)
+    return peak
+
+
+def file_size(path):
+    """Return the size of the file at ``path``, or None if it is not a path or cannot be read."""
+    if not isinstance(path, (str, os.PathLike)):
+        return None
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def text_size(text):
+    """Return the UTF-8 size of a string or the size of a bytes-like object, or None."""
+    if isinstance(text, str):
+        return len(text) if text.isascii() else len(text.encode('utf-8', 'surrogatepass'))
+    try:
+        return memoryview(text).nbytes
+    except TypeError:
+        return None
+
+
+def length(value):
+    """Return the number of elements of a dict or list, or None."""
+    return len(value) if isinstance(value, (dict, list)) else None
+
+
+def instrumented(operation, sizes=None, iterator=False):
+    """
+    Decorate a function so that its calls are reported to the hooks.
+
+    Args:
+        operation (str): The kind of operation, e.g. 'parse'.
+        sizes (Callable, optional): Called as ``sizes(result, *args, **kwargs)`` after a
+            successful call; returns ``(bytes_in, bytes_out, items)``, each possibly
+            None. For iterators ``result`` is None and ``items`` is replaced by the
+            number of items produced. Defaults to None.
+        iterator (bool, optional): Whether the function returns an iterator, whose
+            consumption is measured rather than its creation. Defaults to False.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorate(function):
+        name = function.__name__
+        if iterator:
+            def wrapper(*args, **kwargs):
+                if not _hooks:
+                    return function(*args, **kwargs)
+                return _measure_iterator(operation, name, function(*args, **kwargs), sizes, args, kwargs)
+        else:
+            def wrapper(*args, **kwargs):
+                if not _hooks:
+                    return function(*args, **kwargs)
+                return _measure_call(operation, name, function, sizes, args, kwargs)
+        return functools.update_wrapper(wrapper, function)
+    return decorate
+
+
+def _measure_call(operation, name, function, sizes, args, kwargs):
+    base = _memory_start() if _memory_tracing else None
+    start = time.perf_counter()
+    try:
+        result = function(*args, **kwargs)
+    except BaseException as e:
+        seconds = time.perf_counter() - start
+        memory_peak = _memory_end() - base if base is not None else None
+        _emit(OperationEvent(operation, name, seconds, memory_peak=memory_peak, error=type(e).__name__))
+        raise
+    seconds = time.perf_counter() - start
+    memory_peak = _memory_end() - base if base is not None else None
+    bytes_in, bytes_out, items = sizes(result, *args, **kwargs) if sizes else (None, None, None)
+    _emit(OperationEvent(operation, name, seconds, bytes_in, bytes_out, items, memory_peak))
+    return result
+
+
+def _measure_iterator(operation, name, iterator, sizes, args, kwargs):
+    # Only the time spent in next() is counted, and memory is measured per
+    # item, so that each region is properly nested with the caller's own
+    # instrumented calls between two items.
+    tracing = bool(_memory_tracing)
+    if tracing:
+        import tracemalloc
+        base = peak = tracemalloc.get_traced_memory()[0]
+    seconds = 0.0
+    count = 0
+    error = None
+    try:
+        while True:
+            if tracing:
+                _memory_start()
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                seconds += time.perf_counter() - start
+                if tracing:
+                    peak = max(peak, _memory_end())
+            count += 1
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        bytes_in = bytes_out = None
+        if sizes and error is None:
+            bytes_in, bytes_out, _ = sizes(None, *args, **kwargs)
+        _emit(OperationEvent(operation, name, seconds, bytes_in, bytes_out, count,
+                             peak - base if tracing else None, error))
+
+
+class _Totals:
+    __slots__ = ('count', 'errors', 'seconds', 'max_seconds', 'bytes_in', 'bytes_out', 'items', 'memory_peak')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.items = 0
+        self.memory_peak = None
+
+
+class MetricsAggregator:
+    """
+    Hook that adds up the events of each function.
+
+    Pass it to :func:`add_hook` or :func:`instrument`; it is safe to share
+    between threads.
+    """
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: OperationEvent) -> None:
+        key = (event.operation, event.function)
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = _Totals()
+            totals.count += 1
+            totals.seconds += event.seconds
+            totals.max_seconds = max(totals.max_seconds, event.seconds)
+            if event.error is not None:
+                totals.errors += 1
+            if event.bytes_in is not None:
+                totals.bytes_in += event.bytes_in
+            if event.bytes_out is not None:
+                totals.bytes_out += event.bytes_out
+            if event.items is not None:
+                totals.items += event.items
+            if event.memory_peak is not None:
+                totals.memory_peak = max(totals.memory_peak or 0, event.memory_peak)
+
+    def snapshot(self) -> dict:
+        """
+        Return the totals collected so far.
+
+        Returns:
+            dict: ``{(operation, function): totals}`` where totals is a dict with the keys
+            count, errors, seconds, max_seconds, bytes_in, bytes_out, items and
+            memory_peak (None unless memory was traced).
+        """
+        with self._lock:
+            return {key: {name: getattr(totals, name) for name in _Totals.__slots__}
+                    for key, totals in sorted(self._totals.items())}
+
+    def reset(self) -> None:
+        """Discard the totals collected so far."""
+        with self._lock:
+            self._totals.clear()
+
+    def summary(self) -> str:
+        """
+        Format the totals as a table with one row per function.
+
+        Returns:
+            str: The table.
+        """
+        lines = [f"{'operation':<10} {'function':<28} {'calls':>7} {'errors':>6} {'total ms':>10} "
+                 f"{'max ms':>9} {'bytes in':>12} {'bytes out':>12} {'items':>10} {'peak KiB':>9}"]
+        for (operation, function), totals in self.snapshot().items():
+            peak = '-' if totals['memory_peak'] is None else f"{totals['memory_peak'] / 1024:.0f}"
+            lines.append(f"{operation:<10} {function:<28} {totals['count']:>7} {totals['errors']:>6} "
+                         f"{totals['seconds'] * 1e3:>10.2f} {totals['max_seconds'] * 1e3:>9.2f} "
+                         f"{totals['bytes_in']:>12} {totals['bytes_out']:>12} {totals['items']:>10} {peak:>9}")
+        return '\n'.join(lines)
+
+    def prometheus(self, prefix: str = 'jsontool') -> str:
+        """
+        Format the totals in the Prometheus text exposition format.
+
+        Every sample is labelled with ``operation`` and ``function``. The
+        durations form a summary without quantiles, the memory peak is only
+        exported for functions that ran with memory tracing on.
+
+        Args:
+            prefix (str, optional): The prefix of the metric names. Defaults to 'jsontool'.
+
+        Returns:
+            str: The metrics, ending with a newline.
+        """
+        snapshot = self.snapshot()
+        metrics = [
+            ('operation_seconds', 'summary', 'Wall time spent in jsontool operations.',
+             [('_sum', 'seconds'), ('_count', 'count')]),
+            ('operation_max_seconds', 'gauge', 'Longest single jsontool operation.', [('', 'max_seconds')]),
+            ('operation_errors_total', 'counter', 'jsontool operations that raised an exception.',
+             [('', 'errors')]),
+            ('operation_input_bytes_total', 'counter', 'Bytes read by jsontool operations.', [('', 'bytes_in')]),
+            ('operation_output_bytes_total', 'counter', 'Bytes written by jsontool operations.',
+             [('', 'bytes_out')]),
+            ('operation_items_total', 'counter', 'Records or top-level elements handled by jsontool operations.',
+             [('', 'items')]),
+            ('operation_memory_peak_bytes', 'gauge', 'Largest traced memory peak of a jsontool operation.',
+             [('', 'memory_peak')]),
+        ]
+        lines = []
+        for name, kind, description, samples in metrics:
+            rows = []
+            for (operation, function), totals in snapshot.items():
+                labels = f'operation="{_label(operation)}",function="{_label(function)}"'
+                for suffix, field in samples:
+                    if totals[field] is not None:
+                        rows.append(f"{prefix}_{name}{suffix}{{{labels}}} {totals[field]}")
+            if rows:
+                lines.append(f"# HELP {prefix}_{name} {description}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+                lines.extend(rows)
+        return ''.join(line + '\n' for line in lines)
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Instrumentation:
+    """Context manager returned by :func:`instrument`."""
+
+    def __init__(self, hook, trace_memory):
+        self.hook = hook
+        self.trace_memory = trace_memory
+
+    def __enter__(self):
+        if self.trace_memory:
+            _enable_memory_tracing()
+        add_hook(self.hook)
+        return self.hook
+
+    def __exit__(self, *exc_info):
+        remove_hook(self.hook)
+        if self.trace_memory:
+            _disable_memory_tracing()
+
+
+def instrument(hook=None, trace_memory: bool = False) -> _Instrumentation:
+    """
+    Report the instrumented calls made inside a ``with`` block to a hook.
+
+    Calls made by other threads while the block runs are reported as well.
+
+    Args:
+        hook (Callable, optional): The hook to register for the duration of the block.
+            Defaults to a new :class:`MetricsAggregator`.
+        trace_memory (bool, optional): Whether to record the tracemalloc peak of each
+            call. tracemalloc is started if needed, which slows down every allocation
+            in the process while the block runs; the peaks are approximate when
+            several threads allocate at once. Defaults to False.
+
+    Returns:
+        _Instrumentation: A context manager whose ``with`` target is the hook.
+    """
+    return _Instrumentation(MetricsAggregator() if hook is None else hook, trace_memory)
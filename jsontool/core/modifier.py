@@ -1,4 +1,57 @@
-from typing import Any, Dict
+import copy
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .instrumentation import instrumented, length
+
+# Callbacks notified after a watched container is changed through the
+# functions in this module, keyed by id() of the container. Watchers (such as
+# JsonIndex) must keep the container alive while it is registered.
+_watchers: Dict[int, List[Callable]] = {}
+
+
+def watch_container(container: Any, callback: Callable) -> None:
+    """
+    Register a callback invoked as ``callback(container, key, action, position)``
+    after ``container`` is changed through this module. ``action`` is 'set'
+    when the value under ``key`` was added or replaced, 'delete' when the key
+    was removed, and 'append' or 'remove' when the array under ``key`` gained
+    or lost the element at ``position``. When ``container`` is itself an
+    array, 'insert' and 'delete' mean that the elements from index ``key``
+    onwards shifted up or down by one.
+
+    Notifications for a batch applied with :func:`apply_operations` are sent
+    once the whole batch has succeeded, so callbacks must read the current
+    content of ``container`` rather than assume the state right after that
+    single change.
+
+    Args:
+        container (Any): The dict or list to watch.
+        callback (Callable): The function to call after each change.
+    """
+    _watchers.setdefault(id(container), []).append(callback)
+
+
+def unwatch_container(container: Any, callback: Callable) -> None:
+    """
+    Unregister a callback added with :func:`watch_container`.
+
+    Args:
+        container (Any): The watched dict or list.
+        callback (Callable): The callback to remove.
+    """
+    callbacks = _watchers.get(id(container))
+    if callbacks and callback in callbacks:
+        callbacks.remove(callback)
+        if not callbacks:
+            del _watchers[id(container)]
+
+
+def _notify(container: Any, key: Any, action: str, position: Optional[int] = None) -> None:
+    callbacks = _watchers.get(id(container))
+    if callbacks:
+        for callback in list(callbacks):
+            callback(container, key, action, position)
+
 
 def add_key_to_json(json_data: Dict[str, Any], key: str, value: Any, overwrite: bool = True) -> Dict[str, Any]:
     """
@@ -24,6 +77,8 @@ def add_key_to_json(json_data: Dict[str, Any], key: str, value: Any, overwrite:
         raise KeyError(f"Key '{key}' does not exist in the JSON object.")
 
     json_data[key] = value
+    if _watchers:
+        _notify(json_data, key, 'set')
     return json_data
 
 
@@ -52,6 +107,7 @@ def add_element_to_json_array(json_obj: Dict[str, Any], key: str, element: Any,
     if key not in json_obj:
         if overwrite:
             json_obj[key] = [element]
+            action = 'set'
         else:
             raise KeyError(f"Key '{key}' not found in the JSON object.")
     else:
@@ -59,11 +115,15 @@ def add_element_to_json_array(json_obj: Dict[str, Any], key: str, element: Any,
         if isinstance(current_value, list):
             if overwrite:
                 json_obj[key] = [element]
+                action = 'set'
             else:
                 json_obj[key].append(element)
+                action = 'append'
         else:
             raise ValueError(f"The value associated with key '{key}' is not a list, but found {type(current_value)}.")
 
+    if _watchers:
+        _notify(json_obj, key, action, len(json_obj[key]) - 1)
     return json_obj
 
 
@@ -85,6 +145,8 @@ def remove_key_from_json(json_data: Dict[str, Any], key: str) -> Dict[str, Any]:
         raise KeyError(f"Key '{key}' not found in the JSON object.")
 
     del json_data[key]
+    if _watchers:
+        _notify(json_data, key, 'delete')
     return json_data
 
 
@@ -112,8 +174,289 @@ def remove_element_from_json_array(json_obj: Dict[str, Any], key: str, value: An
         raise ValueError(f"The value associated with key '{key}' is not an array, but found {type(current_value)}.")
 
     try:
-        json_obj[key].remove(value)
+        position = current_value.index(value)
     except ValueError:
         raise ValueError(f"Element '{value}' not found in the array under key '{key}'.")
+    del current_value[position]
 
+    if _watchers:
+        _notify(json_obj, key, 'remove', position)
     return json_obj
+
+
+_MISSING = object()
+_OPERATIONS = ('add', 'replace', 'set', 'append', 'remove', 'move', 'copy', 'test')
+
+
+def _parse_json_pointer(path: Any) -> Tuple[Any, ...]:
+    """
+    Split a path into its tokens.
+
+    A path is either a JSON Pointer string (RFC 6901) such as ``/a/b/0`` or a
+    sequence of keys and indices such as ``['a', 'b', 0]``.
+    """
+    if type(path) is tuple:
+        return path
+    if isinstance(path, str):
+        if path == '':
+            return ()
+        if not path.startswith('/'):
+            raise ValueError(f"Invalid JSON Pointer '{path}': it must start with '/'.")
+        return tuple(token.replace('~1', '/').replace('~0', '~') for token in path[1:].split('/'))
+    if isinstance(path, (list, tuple)):
+        return tuple(path)
+    raise TypeError(f"Path must be a JSON Pointer string or a sequence of keys, not {type(path).__name__}.")
+
+
+def _array_index(array: list, token: Any, allow_end: bool) -> int:
+    """Convert a path token into a position in an array."""
+    if allow_end and token == '-':
+        return len(array)
+    if isinstance(token, str) and token.isdigit() and (token == '0' or not token.startswith('0')):
+        index = int(token)
+    elif isinstance(token, int) and not isinstance(token, bool) and token >= 0:
+        index = token
+    else:
+        raise KeyError(f"Invalid array index '{token}'.")
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise KeyError(f"Array index {index} is out of range.")
+    return index
+
+
+def _get_child(container: Any, token: Any) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise KeyError(f"Key '{token}' not found.")
+        return container[token]
+    if isinstance(container, list):
+        return container[_array_index(container, token, allow_end=False)]
+    raise KeyError(f"Cannot look up '{token}' in a {type(container).__name__}.")
+
+
+class _Batch:
+    """
+    Applies operations to one document, recording how to undo each change.
+
+    Containers are resolved through a cache keyed by their path, so operations
+    sharing a parent walk the document only once. The cache is cleared when
+    an operation could move or detach a cached container.
+    """
+
+    def __init__(self, json_data: Any):
+        self.root = json_data
+        self.containers: Dict[Tuple[Any, ...], Any] = {(): json_data}
+        self.undo: List[Tuple] = []
+        self.notifications: List[Tuple] = []
+        # id() -> (dict, its keys in order) saved before the batch first adds
+        # or removes a key, since undoing either would otherwise leave
+        # restored keys at the end.
+        self.key_orders: Dict[int, Tuple[dict, Tuple]] = {}
+
+    def resolve(self, tokens: Tuple[Any, ...]) -> Any:
+        container = self.containers.get(tokens, _MISSING)
+        if container is _MISSING:
+            container = _get_child(self.resolve(tokens[:-1]), tokens[-1])
+            self.containers[tokens] = container
+        return container
+
+    def get(self, tokens: Tuple[Any, ...]) -> Any:
+        if not tokens:
+            return self.root
+        return _get_child(self.resolve(tokens[:-1]), tokens[-1])
+
+    def save_order(self, parent: dict) -> None:
+        if id(parent) not in self.key_orders:
+            self.key_orders[id(parent)] = (parent, tuple(parent))
+
+    def changed(self, old_value: Any = None, shifted: bool = False) -> None:
+        if shifted or isinstance(old_value, (dict, list)):
+            self.containers = {(): self.root}
+
+    def add(self, tokens, value, replace_only=False, insert=True):
+        if not tokens:
+            raise ValueError("The document root cannot be replaced in place.")
+        parent = self.resolve(tokens[:-1])
+        token = tokens[-1]
+        if isinstance(parent, dict):
+            if replace_only and token not in parent:
+                raise KeyError(f"Key '{token}' not found.")
+            old = parent.get(token, _MISSING)
+            if old is _MISSING:
+                self.save_order(parent)
+            parent[token] = value
+            self.undo.append(('dict', parent, token, old))
+            self.notifications.append((parent, token, 'set'))
+            self.changed(old)
+        elif isinstance(parent, list):
+            index = _array_index(parent, token, allow_end=not replace_only)
+            if index == len(parent) or (insert and not replace_only):
+                parent.insert(index, value)
+                self.undo.append(('insert', parent, index, None))
+                self.notifications.append((parent, index, 'insert'))
+                self.changed(shifted=True)
+            else:
+                old = parent[index]
+                parent[index] = value
+                self.undo.append(('list', parent, index, old))
+                self.notifications.append((parent, index, 'set'))
+                self.changed(old)
+        else:
+            raise KeyError(f"Cannot set '{token}' in a {type(parent).__name__}.")
+
+    def remove(self, tokens) -> Any:
+        if not tokens:
+            raise ValueError("The document root cannot be removed.")
+        parent = self.resolve(tokens[:-1])
+        token = tokens[-1]
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise KeyError(f"Key '{token}' not found.")
+            self.save_order(parent)
+            old = parent.pop(token)
+            self.undo.append(('dict', parent, token, old))
+            self.notifications.append((parent, token, 'delete'))
+            self.changed(old)
+        elif isinstance(parent, list):
+            index = _array_index(parent, token, allow_end=False)
+            old = parent.pop(index)
+            self.undo.append(('delete', parent, index, old))
+            self.notifications.append((parent, index, 'delete'))
+            self.changed(shifted=True)
+        else:
+            raise KeyError(f"Cannot remove '{token}' from a {type(parent).__name__}.")
+        return old
+
+    def apply(self, operation: Dict[str, Any]) -> None:
+        if not isinstance(operation, dict):
+            raise TypeError("Each operation must be a dictionary.")
+        op = operation.get('op')
+        if op not in _OPERATIONS:
+            raise ValueError(f"Unknown operation '{op}'. Expected one of {_OPERATIONS}.")
+        if 'path' not in operation:
+            raise ValueError("Operation is missing 'path'.")
+        tokens = _parse_json_pointer(operation['path'])
+        if op in ('add', 'replace', 'set', 'append', 'test') and 'value' not in operation:
+            raise ValueError(f"Operation '{op}' is missing 'value'.")
+
+        if op == 'add':
+            self.add(tokens, operation['value'])
+        elif op == 'replace':
+            self.add(tokens, operation['value'], replace_only=True)
+        elif op == 'set':
+            self.add(tokens, operation['value'], insert=False)
+        elif op == 'append':
+            target = self.get(tokens)
+            if not isinstance(target, list):
+                raise ValueError(f"The value at the path is not a list, but found {type(target)}.")
+            self.add(tokens + ('-',), operation['value'])
+        elif op == 'remove':
+            self.remove(tokens)
+        elif op == 'test':
+            if self.get(tokens) != operation['value']:
+                raise ValueError("Test failed: the value at the path does not match.")
+        else:
+            if 'from' not in operation:
+                raise ValueError(f"Operation '{op}' is missing 'from'.")
+            source = _parse_json_pointer(operation['from'])
+            if op == 'move':
+                if tokens[:len(source)] == source and tokens != source:
+                    raise ValueError("A value cannot be moved into one of its own children.")
+                self.add(tokens, self.remove(source))
+            else:
+                self.add(tokens, copy.deepcopy(self.get(source)))
+
+    def rollback(self) -> None:
+        # Every step is attempted even if one fails, so that as much of the
+        # document as possible is restored; the first failure is raised last.
+        error = None
+        for kind, container, key, old in reversed(self.undo):
+            try:
+                if kind == 'dict':
+                    if old is _MISSING:
+                        del container[key]
+                    else:
+                        container[key] = old
+                elif kind == 'list':
+                    container[key] = old
+                elif kind == 'insert':
+                    del container[key]
+                else:
+                    container.insert(key, old)
+            except Exception as e:
+                error = error or e
+        for container, keys in self.key_orders.values():
+            if tuple(container) != keys:
+                saved = set(keys)
+                items = [(key, container[key]) for key in keys if key in container]
+                items += [(key, value) for key, value in container.items() if key not in saved]
+                container.clear()
+                container.update(items)
+        if error is not None:
+            raise error
+
+
+@instrumented('modify', lambda result, json_data, operations: (None, None, length(operations)))
+def apply_operations(json_data: Any, operations: Iterable[Dict[str, Any]]) -> Any:
+    """
+    Apply a batch of operations to a JSON document atomically.
+
+    Operations follow JSON Patch (RFC 6902): ``add``, ``remove``, ``replace``,
+    ``move``, ``copy`` and ``test``, plus two shortcuts: ``set`` (add or
+    replace without shifting array elements) and ``append`` (push a value
+    onto the array at ``path``). Paths are JSON Pointers such as ``/a/b/0``
+    (``-`` is the end of an array) or sequences of keys like ``['a', 'b', 0]``.
+
+    Either every operation is applied or, if one fails, the changes already
+    made are undone and the document is left as it was.
+
+    Args:
+        json_data (dict or list): The JSON document to modify in place.
+        operations (iterable): The operations, e.g. ``{"op": "set", "path": "/a/b", "value": 1}``.
+
+    Returns:
+        dict or list: The modified JSON document.
+
+    Raises:
+        TypeError: If the document is not a dictionary or a list, or an operation is malformed.
+        KeyError: If a path does not exist.
+        ValueError: If an operation is invalid or a ``test`` operation fails.
+    """
+    if not isinstance(json_data, (dict, list)):
+        raise TypeError("Input must be a dictionary or a list.")
+    batch = _Batch(json_data)
+    containers = batch.containers
+    undo = batch.undo
+    try:
+        for number, operation in enumerate(operations):
+            try:
+                # Fast path for the most common edit, setting a key of an object
+                # whose parent was already resolved; equivalent to batch.apply().
+                if (type(operation) is dict and operation.get('op') == 'set' and 'value' in operation
+                        and 'path' in operation):
+                    tokens = _parse_json_pointer(operation['path'])
+                    parent = containers.get(tokens[:-1]) if tokens else None
+                    if type(parent) is dict:
+                        key = tokens[-1]
+                        old = parent.get(key, _MISSING)
+                        parent[key] = operation['value']
+                        undo.append(('dict', parent, key, old))
+                        if _watchers:
+                            batch.notifications.append((parent, key, 'set'))
+                        if isinstance(old, (dict, list)):
+                            batch.changed(old)
+                            containers = batch.containers
+                        continue
+                batch.apply(operation)
+                containers = batch.containers
+            except (KeyError, ValueError, TypeError) as e:
+                message = e.args[0] if e.args else str(e)
+                raise type(e)(f"Operation {number} ({operation!r}) failed: {message}") from e
+    except BaseException:
+        # Also undo on errors raised by the operations iterable or by
+        # comparisons in 'test', so that the batch stays atomic.
+        batch.rollback()
+        raise
+    if _watchers:
+        for container, key, action in batch.notifications:
+            _notify(container, key, action)
+    return json_data
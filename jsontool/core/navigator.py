@@ -0,0 +1,726 @@
+"""
+JSONPath queries and indexed lookups over parsed JSON data.
+
+A path expression is compiled once into a :class:`JsonPath` object whose
+selectors are plain closures, so evaluating it does not re-parse the
+expression. Matching is lazy: ``find`` is a generator, so taking the first
+match stops walking the document as soon as it is found.
+
+Supported syntax::
+
+    $                   the root
+    .name  ['name']     child member
+    .*  [*]             all children
+    ..name  ..*  ..[0]  recursive descent
+    [0]  [-1]           array index
+    [start:end:step]    array slice
+    ['a','b']  [0,2]    union
+    [?(@.price < 10)]   filter: comparisons (== != < <= > >= =~), &&, ||, !,
+                        parentheses, existence tests (@.isbn) and literals
+                        (numbers, 'strings', true, false, null, /regex/i)
+"""
+
+from functools import lru_cache
+import operator
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from .modifier import unwatch_container, watch_container
+
+_MISSING = object()
+
+_NAME = re.compile(r'[\w-]+')
+_INTEGER = re.compile(r'-?\d+')
+_SLICE = re.compile(r'(-?\d*)\s*:\s*(-?\d*)(?:\s*:\s*(-?\d*))?')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
+_SPACE = re.compile(r'\s*')
+
+
+# --- selectors ------------------------------------------------------------
+#
+# A selector is a function taking one node and returning an iterable of the
+# nodes it selects. Selectors never raise for a node of the wrong type; they
+# simply select nothing.
+
+def _child(name: str) -> Callable[[Any], Iterable[Any]]:
+    def select(node):
+        if isinstance(node, dict) and name in node:
+            return (node[name],)
+        return ()
+    select.key = name
+    return select
+
+
+def _index(index: int) -> Callable[[Any], Iterable[Any]]:
+    def select(node):
+        if isinstance(node, list) and -len(node) <= index < len(node):
+            return (node[index],)
+        return ()
+    select.key = index
+    return select
+
+
+def _slice(start, stop, step) -> Callable[[Any], Iterable[Any]]:
+    if step == 0:
+        raise ValueError("slice step cannot be zero")
+    window = slice(start, stop, step)
+
+    def select(node):
+        if isinstance(node, list):
+            return node[window]
+        return ()
+    return select
+
+
+def _children(node) -> Iterable[Any]:
+    if isinstance(node, dict):
+        return node.values()
+    if isinstance(node, list):
+        return node
+    return ()
+
+
+def _union(selectors) -> Callable[[Any], Iterable[Any]]:
+    def select(node):
+        for selector in selectors:
+            yield from selector(node)
+    return select
+
+
+def _filter(predicate) -> Callable[[Any], Iterable[Any]]:
+    def select(node):
+        return (child for child in _children(node) if predicate(child))
+    return select
+
+
+def _descendants(node) -> Iterator[Any]:
+    """Yield a node and all nodes below it in document order."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _recursive(selector) -> Callable[[Any], Iterable[Any]]:
+    def select(node):
+        for descendant in _descendants(node):
+            yield from selector(descendant)
+    return select
+
+
+def _apply(selector, nodes) -> Iterator[Any]:
+    for node in nodes:
+        yield from selector(node)
+
+
+def _run(selectors, node) -> Iterator[Any]:
+    nodes = iter((node,))
+    for selector in selectors:
+        nodes = _apply(selector, nodes)
+    return nodes
+
+
+# --- filter expressions ---------------------------------------------------
+
+def _is_bool(value) -> bool:
+    return isinstance(value, bool)
+
+
+def _equal(left, right) -> bool:
+    # JSON true is not equal to 1, unlike Python's True.
+    return _is_bool(left) == _is_bool(right) and left == right
+
+
+def _ordering(compare):
+    def apply(left, right):
+        if _is_bool(left) or _is_bool(right):
+            return False
+        try:
+            return compare(left, right)
+        except TypeError:
+            return False
+    return apply
+
+
+def _regex_match(left, right) -> bool:
+    return isinstance(left, str) and right.search(left) is not None
+
+
+_COMPARISONS = {
+    '==': _equal,
+    '!=': lambda left, right: not _equal(left, right),
+    '<=': _ordering(operator.le),
+    '>=': _ordering(operator.ge),
+    '<': _ordering(operator.lt),
+    '>': _ordering(operator.gt),
+    '=~': _regex_match,
+}
+_COMPARISON = re.compile(r'==|!=|<=|>=|<|>|=~')
+
+
+class _Parser:
+    """Recursive-descent parser turning a path expression into selectors."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pos = 0
+
+    def error(self, message: str):
+        raise ValueError(f"Invalid JSONPath '{self.path}': {message} at position {self.pos}.")
+
+    def skip_space(self):
+        self.pos = _SPACE.match(self.path, self.pos).end()
+
+    def peek(self, text: str) -> bool:
+        return self.path.startswith(text, self.pos)
+
+    def accept(self, text: str) -> bool:
+        if self.peek(text):
+            self.pos += len(text)
+            return True
+        return False
+
+    def expect(self, text: str):
+        if not self.accept(text):
+            self.error(f"expected '{text}'")
+
+    def match(self, pattern):
+        found = pattern.match(self.path, self.pos)
+        if found:
+            self.pos = found.end()
+        return found
+
+    # path := '$'? segment*
+    def parse_path(self) -> List[Callable]:
+        self.skip_space()
+        self.accept('$')
+        selectors = self.parse_segments()
+        self.skip_space()
+        if self.pos != len(self.path):
+            self.error("unexpected character")
+        return selectors
+
+    def parse_segments(self) -> List[Callable]:
+        selectors = []
+        while True:
+            if self.accept('..'):
+                selectors.append(_recursive(self.parse_member(after_dot=True)))
+            elif self.accept('.'):
+                selectors.append(self.parse_member(after_dot=True))
+            elif self.peek('['):
+                selectors.append(self.parse_member(after_dot=False))
+            else:
+                return selectors
+
+    def parse_member(self, after_dot: bool) -> Callable:
+        if self.accept('['):
+            selector = self.parse_bracket()
+            self.skip_space()
+            self.expect(']')
+            return selector
+        if not after_dot:
+            self.error("expected '['")
+        if self.accept('*'):
+            return _children
+        name = self.match(_NAME)
+        if not name:
+            self.error("expected a member name")
+        return _child(name.group())
+
+    # bracket := '*' | '?(' filter ')' | item (',' item)*
+    def parse_bracket(self) -> Callable:
+        self.skip_space()
+        if self.accept('*'):
+            return _children
+        if self.accept('?'):
+            self.skip_space()
+            self.expect('(')
+            predicate = self.parse_or()
+            self.skip_space()
+            self.expect(')')
+            return _filter(predicate)
+        selectors = [self.parse_bracket_item()]
+        self.skip_space()
+        while self.accept(','):
+            selectors.append(self.parse_bracket_item())
+            self.skip_space()
+        return selectors[0] if len(selectors) == 1 else _union(selectors)
+
+    def parse_bracket_item(self) -> Callable:
+        self.skip_space()
+        if self.peek("'") or self.peek('"'):
+            return _child(self.parse_string())
+        if self.accept('*'):
+            return _children
+        found = self.match(_SLICE)
+        if found:
+            start, stop, step = (int(part) if part else None for part in found.groups())
+            try:
+                return _slice(start, stop, step)
+            except ValueError as e:
+                self.error(str(e))
+        found = self.match(_INTEGER)
+        if found:
+            return _index(int(found.group()))
+        self.error("expected a name, index, slice or '*'")
+
+    def parse_string(self) -> str:
+        quote = self.path[self.pos]
+        self.pos += 1
+        chars = []
+        while self.pos < len(self.path):
+            char = self.path[self.pos]
+            self.pos += 1
+            if char == '\\' and self.pos < len(self.path):
+                chars.append(self.path[self.pos])
+                self.pos += 1
+            elif char == quote:
+                return ''.join(chars)
+            else:
+                chars.append(char)
+        self.error("unterminated string")
+
+    # or := and ('||' and)*
+    def parse_or(self) -> Callable[[Any], bool]:
+        operands = [self.parse_and()]
+        self.skip_space()
+        while self.accept('||'):
+            operands.append(self.parse_and())
+            self.skip_space()
+        if len(operands) == 1:
+            return operands[0]
+        return lambda node: any(operand(node) for operand in operands)
+
+    # and := not ('&&' not)*
+    def parse_and(self) -> Callable[[Any], bool]:
+        operands = [self.parse_not()]
+        self.skip_space()
+        while self.accept('&&'):
+            operands.append(self.parse_not())
+            self.skip_space()
+        if len(operands) == 1:
+            return operands[0]
+        return lambda node: all(operand(node) for operand in operands)
+
+    # not := '!' not | comparison
+    def parse_not(self) -> Callable[[Any], bool]:
+        self.skip_space()
+        if self.peek('!') and not self.peek('!='):
+            self.pos += 1
+            operand = self.parse_not()
+            return lambda node: not operand(node)
+        return self.parse_comparison()
+
+    # comparison := '(' or ')' | operand (op operand)?
+    def parse_comparison(self) -> Callable[[Any], bool]:
+        self.skip_space()
+        if self.accept('('):
+            expression = self.parse_or()
+            self.skip_space()
+            self.expect(')')
+            return expression
+        is_path = self.peek('@')
+        left = self.parse_operand()
+        self.skip_space()
+        found = self.match(_COMPARISON)
+        if not found:
+            if is_path:
+                # A bare '@.key' is an existence test: a present null or
+                # false still counts as a match.
+                return lambda node: left(node) is not _MISSING
+            return lambda node: bool(left(node))
+        op = found.group()
+        self.skip_space()
+        if op == '=~':
+            right = self.parse_regex()
+            return lambda node: _regex_match(left(node), right)
+        right = self.parse_operand()
+        compare = _COMPARISONS[op]
+
+        def predicate(node):
+            left_value = left(node)
+            right_value = right(node)
+            if left_value is _MISSING or right_value is _MISSING:
+                return False
+            return compare(left_value, right_value)
+        return predicate
+
+    def parse_regex(self):
+        if not self.accept('/'):
+            self.error("expected a /regex/")
+        end = self.pos
+        while end < len(self.path) and self.path[end] != '/':
+            end += 2 if self.path[end] == '\\' else 1
+        if end >= len(self.path):
+            self.error("unterminated regex")
+        pattern = self.path[self.pos:end]
+        self.pos = end + 1
+        flags = re.IGNORECASE if self.accept('i') else 0
+        try:
+            return re.compile(pattern, flags)
+        except re.error as e:
+            self.error(f"invalid regex ({e})")
+
+    # operand := '@' segment* | literal
+    def parse_operand(self) -> Callable[[Any], Any]:
+        if self.accept('@'):
+            selectors = self.parse_segments()
+            if not selectors:
+                return lambda node: node
+            return lambda node: next(_run(selectors, node), _MISSING)
+        if self.peek("'") or self.peek('"'):
+            value = self.parse_string()
+        elif self.accept('true'):
+            value = True
+        elif self.accept('false'):
+            value = False
+        elif self.accept('null'):
+            value = None
+        else:
+            found = self.match(_NUMBER)
+            if not found:
+                self.error("expected '@' or a literal")
+            text = found.group()
+            value = float(text) if any(c in text for c in '.eE') else int(text)
+        return lambda node: value
+
+
+class JsonPath:
+    """
+    A compiled JSONPath expression.
+
+    Args:
+        path (str): The JSONPath expression, e.g. ``$.store.book[?(@.price < 10)].title``.
+
+    Raises:
+        TypeError: If the path is not a string.
+        ValueError: If the path is not a valid JSONPath expression.
+    """
+
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError("JSONPath must be a string.")
+        self.path = path
+        self._selectors = _Parser(path).parse_path()
+        keys = [getattr(selector, 'key', _MISSING) for selector in self._selectors]
+        # Chains of plain member/index lookups select at most one node and
+        # are resolved with a direct loop instead of nested generators.
+        self._keys = None if _MISSING in keys else keys
+
+    def __repr__(self):
+        return f"JsonPath({self.path!r})"
+
+    def find(self, data: Any) -> Iterator[Any]:
+        """
+        Lazily yield every value matching the path, in document order.
+
+        Args:
+            data (Any): The parsed JSON document.
+
+        Yields:
+            Any: The matching values.
+        """
+        if self._keys is None:
+            return _run(self._selectors, data)
+        return self._find_direct(data)
+
+    def _find_direct(self, data):
+        node = data
+        for key in self._keys:
+            if isinstance(key, str):
+                if not isinstance(node, dict) or key not in node:
+                    return
+            elif not isinstance(node, list) or not -len(node) <= key < len(node):
+                return
+            node = node[key]
+        yield node
+
+    def find_all(self, data: Any) -> List[Any]:
+        """
+        Return every value matching the path.
+
+        Args:
+            data (Any): The parsed JSON document.
+
+        Returns:
+            list: The matching values in document order.
+        """
+        return list(self.find(data))
+
+    def first(self, data: Any, default: Any = None) -> Any:
+        """
+        Return the first value matching the path without searching further.
+
+        Args:
+            data (Any): The parsed JSON document.
+            default (Any, optional): The value returned when nothing matches. Defaults to None.
+
+        Returns:
+            Any: The first matching value, or ``default``.
+        """
+        return next(self.find(data), default)
+
+
+@lru_cache(maxsize=512)
+def compile_jsonpath(path: str) -> JsonPath:
+    """
+    Compile a JSONPath expression, reusing a cached result for paths that
+    were compiled recently.
+
+    Args:
+        path (str): The JSONPath expression.
+
+    Returns:
+        JsonPath: The compiled expression.
+
+    Raises:
+        TypeError: If the path is not a string.
+        ValueError: If the path is not a valid JSONPath expression.
+    """
+    return JsonPath(path)
+
+
+def find_by_jsonpath(json_data: Any, path: str) -> List[Any]:
+    """
+    Return every value in a JSON document matching a JSONPath expression.
+
+    Args:
+        json_data (Any): The parsed JSON document.
+        path (str): The JSONPath expression.
+
+    Returns:
+        list: The matching values in document order.
+
+    Raises:
+        ValueError: If the path is not a valid JSONPath expression.
+    """
+    return compile_jsonpath(path).find_all(json_data)
+
+
+def find_first_by_jsonpath(json_data: Any, path: str, default: Any = None) -> Any:
+    """
+    Return the first value in a JSON document matching a JSONPath expression.
+
+    Args:
+        json_data (Any): The parsed JSON document.
+        path (str): The JSONPath expression.
+        default (Any, optional): The value returned when nothing matches. Defaults to None.
+
+    Returns:
+        Any: The first matching value, or ``default``.
+
+    Raises:
+        ValueError: If the path is not a valid JSONPath expression.
+    """
+    return compile_jsonpath(path).first(json_data, default)
+
+
+class JsonIndex:
+    """
+    An index of every key and full path in a JSON document.
+
+    Looking up a key or a path is a dictionary access instead of a walk over
+    the whole document, which pays off for large documents that are queried
+    many times. Changes made through the functions in
+    :mod:`jsontool.core.modifier` update the index incrementally; changes made
+    by other means are not seen and require :meth:`rebuild`. Tracking keeps
+    the index alive, so call :meth:`close` (or use it as a context manager)
+    once it is no longer needed.
+
+    Paths are tuples of object keys and array indices, e.g.
+    ``('store', 'book', 0, 'title')``. Wherever a path is accepted, a JSONPath
+    made of plain members and indices (``$.store.book[0].title``) can be used
+    instead.
+
+    Args:
+        json_data (Any): The parsed JSON document to index.
+
+    Attributes:
+        build_time (float): Seconds spent building the index.
+    """
+
+    def __init__(self, json_data: Any):
+        self.json_data = json_data
+        self._paths: Dict[Tuple, Any] = {}
+        # Key -> paths ending in that key; dicts are used as ordered sets.
+        self._keys: Dict[str, Dict[Tuple, None]] = {}
+        # id() of every indexed container -> (container, path).
+        self._containers: Dict[int, Tuple[Any, Tuple]] = {}
+        # Path of every indexed container -> the paths of its indexed children.
+        # Removal walks these rather than the container, whose content may
+        # already have changed when a batch of edits is reported.
+        self._children: Dict[Tuple, Dict[Tuple, None]] = {}
+        start = time.perf_counter()
+        self._add(json_data, ())
+        self.build_time = time.perf_counter() - start
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, path):
+        return self._path(path) in self._paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Stop tracking changes made through the modifier functions."""
+        for container, _ in self._containers.values():
+            unwatch_container(container, self._on_change)
+        self._containers.clear()
+
+    def rebuild(self) -> None:
+        """Re-index the whole document, e.g. after it was changed directly."""
+        self.close()
+        self._paths.clear()
+        self._keys.clear()
+        self._children.clear()
+        start = time.perf_counter()
+        self._add(self.json_data, ())
+        self.build_time = time.perf_counter() - start
+
+    def get(self, path, default: Any = None) -> Any:
+        """
+        Return the value at a full path.
+
+        Args:
+            path (tuple or str): The path as a tuple or a simple JSONPath.
+            default (Any, optional): The value returned when the path does not exist. Defaults to None.
+
+        Returns:
+            Any: The value at the path, or ``default``.
+        """
+        return self._paths.get(self._path(path), default)
+
+    def find_key(self, key: str) -> List[Any]:
+        """
+        Return the values of every member named ``key`` at any depth.
+
+        Args:
+            key (str): The object key to search for.
+
+        Returns:
+            list: The matching values.
+        """
+        paths = self._paths
+        return [paths[path] for path in self._keys.get(key, ())]
+
+    def paths_for_key(self, key: str) -> List[Tuple]:
+        """
+        Return the full paths of every member named ``key`` at any depth.
+
+        Args:
+            key (str): The object key to search for.
+
+        Returns:
+            list: The matching paths.
+        """
+        return list(self._keys.get(key, ()))
+
+    def memory_usage(self) -> int:
+        """
+        Estimate the memory used by the index itself, excluding the document.
+
+        Returns:
+            int: The estimated size in bytes.
+        """
+        size = sys.getsizeof(self._paths) + sys.getsizeof(self._keys) + sys.getsizeof(self._containers)
+        size += sum(sys.getsizeof(path) for path in self._paths)
+        size += sum(sys.getsizeof(paths) for paths in self._keys.values())
+        size += sum(sys.getsizeof(entry) for entry in self._containers.values())
+        size += sys.getsizeof(self._children) + sum(sys.getsizeof(paths) for paths in self._children.values())
+        return size
+
+    def _path(self, path) -> Tuple:
+        if isinstance(path, str):
+            keys = compile_jsonpath(path)._keys
+            if keys is None:
+                raise ValueError(f"JSONPath '{path}' is not a plain path of members and indices.")
+            return tuple(keys)
+        return tuple(path)
+
+    def _add(self, value: Any, path: Tuple) -> None:
+        siblings = self._children.get(path[:-1]) if path else None
+        if siblings is not None:
+            siblings[path] = None
+        stack = [(value, path)]
+        while stack:
+            node, path = stack.pop()
+            self._paths[path] = node
+            if path and isinstance(path[-1], str):
+                self._keys.setdefault(path[-1], {})[path] = None
+            if isinstance(node, dict):
+                self._watch(node, path)
+                children = [(child, path + (key,)) for key, child in node.items()]
+            elif isinstance(node, list):
+                self._watch(node, path)
+                children = [(child, path + (index,)) for index, child in enumerate(node)]
+            else:
+                continue
+            self._children[path] = dict.fromkeys(child_path for _, child_path in children)
+            stack.extend(children)
+
+    def _remove(self, path: Tuple) -> None:
+        if path not in self._paths:
+            return
+        siblings = self._children.get(path[:-1]) if path else None
+        if siblings is not None:
+            siblings.pop(path, None)
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            node = self._paths.pop(path)
+            if isinstance(path[-1], str):
+                paths = self._keys[path[-1]]
+                del paths[path]
+                if not paths:
+                    del self._keys[path[-1]]
+            if isinstance(node, (dict, list)):
+                self._unwatch(node)
+                stack.extend(child for child in self._children.pop(path, ()) if child in self._paths)
+
+    def _watch(self, container: Any, path: Tuple) -> None:
+        if id(container) not in self._containers:
+            watch_container(container, self._on_change)
+        self._containers[id(container)] = (container, path)
+
+    def _unwatch(self, container: Any) -> None:
+        if self._containers.pop(id(container), None) is not None:
+            unwatch_container(container, self._on_change)
+
+    def _on_change(self, container: Any, key: Any, action: str, position: int) -> None:
+        entry = self._containers.get(id(container))
+        if entry is None:
+            # Changed after being detached from the document within a batch.
+            return
+        if isinstance(container, list) and action in ('insert', 'delete'):
+            self._reindex_array(entry[1], container, key)
+            return
+        path = entry[1] + (key,)
+        if action == 'append':
+            self._add(container[key][position], path + (position,))
+        elif action == 'remove':
+            self._reindex_array(path, container[key], position)
+        else:
+            self._remove(path)
+            if action == 'set' and (key in container if isinstance(container, dict) else key < len(container)):
+                self._add(container[key], path)
+
+    def _reindex_array(self, path: Tuple, array: list, start: int) -> None:
+        # Elements from ``start`` onwards moved, so their old entries (up to
+        # the previous length of the array) are replaced by the current ones.
+        index = start
+        while path + (index,) in self._paths:
+            self._remove(path + (index,))
+            index += 1
+        for index in range(start, len(array)):
+            self._add(array[index], path + (index,))
@@ -0,0 +1,348 @@
+"""
+Immutable JSON documents with structural sharing.
+
+A :class:`JsonDocument` wraps a deeply frozen JSON tree. Its modifying
+methods never touch the existing tree: they copy only the containers on the
+path from the root to the changed value and share every other subtree with
+the previous version. Readers holding an older version therefore never see
+a half-applied change, without paying for a ``copy.deepcopy`` per edit.
+
+Frozen containers are subclasses of ``dict`` and ``list``, so they can be
+passed to the reader/writer, navigator and validator functions unchanged.
+"""
+
+from typing import Any, Dict, Iterable
+
+from .modifier import (
+    _MISSING,
+    _Batch,
+    _parse_json_pointer,
+    add_element_to_json_array,
+    add_key_to_json,
+    remove_element_from_json_array,
+    remove_key_from_json,
+)
+from .reader_writer import read_json_from_file, read_json_from_string, write_json_to_file, write_json_to_string
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"'{type(self).__name__}' object is immutable.")
+
+
+class FrozenDict(dict):
+    """A ``dict`` whose content cannot be changed after construction."""
+
+    __slots__ = ('_built',)
+
+    def __init__(self, *args, **kwargs):
+        # dict.__init__ would refill an existing instance.
+        if getattr(self, '_built', False):
+            _immutable(self)
+        dict.__init__(self, *args, **kwargs)
+        self._built = True
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class FrozenList(list):
+    """A ``list`` whose content cannot be changed after construction."""
+
+    __slots__ = ('_built',)
+
+    def __init__(self, *args, **kwargs):
+        # list.__init__ would refill an existing instance.
+        if getattr(self, '_built', False):
+            _immutable(self)
+        list.__init__(self, *args, **kwargs)
+        self._built = True
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = reverse = sort = clear = _immutable
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+# freeze builds frozen containers with the C methods of dict and list, which
+# is twice as fast as calling FrozenDict.__init__ and FrozenList.__init__.
+_new_dict, _fill_dict, _built_dict = dict.__new__, dict.update, FrozenDict._built.__set__
+_new_list, _fill_list, _built_list = list.__new__, list.extend, FrozenList._built.__set__
+
+
+def freeze(json_data: Any) -> Any:
+    """
+    Return a deeply immutable copy of JSON data.
+
+    Already frozen containers are returned as they are, so freezing a tree
+    that shares frozen subtrees only copies the mutable parts.
+
+    Args:
+        json_data (Any): The JSON data.
+
+    Returns:
+        Any: The data with every dict and list replaced by its frozen counterpart.
+    """
+    if isinstance(json_data, (FrozenDict, FrozenList)):
+        return json_data
+    if isinstance(json_data, dict):
+        frozen = _new_dict(FrozenDict)
+        _fill_dict(frozen, [(key, freeze(value)) for key, value in json_data.items()])
+        _built_dict(frozen, True)
+        return frozen
+    if isinstance(json_data, list):
+        frozen = _new_list(FrozenList)
+        _fill_list(frozen, [freeze(value) for value in json_data])
+        _built_list(frozen, True)
+        return frozen
+    return json_data
+
+
+def thaw(json_data: Any) -> Any:
+    """
+    Return a deeply mutable copy of JSON data.
+
+    Args:
+        json_data (Any): The JSON data, frozen or not.
+
+    Returns:
+        Any: The data built from plain dicts and lists.
+    """
+    if isinstance(json_data, dict):
+        return {key: thaw(value) for key, value in json_data.items()}
+    if isinstance(json_data, list):
+        return [thaw(value) for value in json_data]
+    return json_data
+
+
+def _unfrozen(container: Any) -> Any:
+    """Return a shallow mutable copy of a frozen container."""
+    return dict(container) if isinstance(container, dict) else list(container)
+
+
+def _copy_path(root: Any, tokens) -> bool:
+    """
+    Replace every frozen container along ``tokens`` below the mutable
+    ``root`` with a shallow mutable copy, stopping where the path ends.
+
+    Returns True if any container was copied.
+    """
+    copied = False
+    node = root
+    for token in tokens:
+        if isinstance(node, dict):
+            child = node.get(token, _MISSING)
+        elif isinstance(node, list):
+            try:
+                index = int(token)
+            except (TypeError, ValueError):
+                return copied
+            if not 0 <= index < len(node):
+                return copied
+            token, child = index, node[index]
+        else:
+            return copied
+        if isinstance(child, (FrozenDict, FrozenList)):
+            child = _unfrozen(child)
+            node[token] = child
+            copied = True
+        elif child is _MISSING:
+            return copied
+        node = child
+    return copied
+
+
+class JsonDocument:
+    """
+    An immutable JSON document whose edits return new versions.
+
+    Args:
+        json_data (dict or list): The JSON data; it is frozen (copied) unless already frozen.
+
+    Raises:
+        TypeError: If the data is not a dictionary or a list.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, json_data: Any):
+        if not isinstance(json_data, (dict, list)):
+            raise TypeError("Input must be a dictionary or a list.")
+        self.data = freeze(json_data)
+
+    @classmethod
+    def _wrap(cls, frozen: Any) -> 'JsonDocument':
+        document = cls.__new__(cls)
+        document.data = frozen
+        return document
+
+    def __repr__(self):
+        return f"JsonDocument({self.data!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, JsonDocument):
+            return self.data == other.data
+        return NotImplemented
+
+    __hash__ = None
+
+    @classmethod
+    def from_string(cls, json_string, backend=None) -> 'JsonDocument':
+        """
+        Parse a JSON string into a document.
+
+        Raises:
+            TypeError: If the input is not a string or bytes-like object.
+            ValueError: If the input is empty or contains invalid JSON.
+        """
+        return cls(read_json_from_string(json_string, backend=backend))
+
+    @classmethod
+    def from_file(cls, file_path: str, **kwargs) -> 'JsonDocument':
+        """
+        Read a document from a JSON file; keyword arguments are passed to
+        :func:`read_json_from_file`.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+            ValueError: If the file contains invalid JSON data.
+        """
+        return cls(read_json_from_file(file_path, **kwargs))
+
+    def to_string(self, indent=None, backend=None) -> str:
+        """Serialize the document with :func:`write_json_to_string`."""
+        return write_json_to_string(self.data, indent=indent, backend=backend)
+
+    def to_file(self, file_path: str, indent=None, backend=None) -> None:
+        """Write the document with :func:`write_json_to_file`."""
+        write_json_to_file(self.data, file_path, indent=indent, backend=backend)
+
+    def thaw(self) -> Any:
+        """Return a mutable deep copy of the document data."""
+        return thaw(self.data)
+
+    def get(self, path, default: Any = None) -> Any:
+        """
+        Return the value at a path, or ``default`` if it does not exist.
+
+        Args:
+            path (str or sequence): A JSON Pointer such as ``/a/0`` or a sequence of keys.
+            default (Any, optional): The value returned when the path does not exist. Defaults to None.
+        """
+        try:
+            return _Batch(self.data).get(_parse_json_pointer(path))
+        except KeyError:
+            return default
+
+    def _edit_root(self, modify, *args) -> 'JsonDocument':
+        if not isinstance(self.data, dict):
+            raise TypeError("Input must be a dictionary.")
+        root = dict(self.data)
+        modify(root, *args)
+        return JsonDocument._wrap(freeze(root))
+
+    def add_key(self, key: str, value: Any, overwrite: bool = True) -> 'JsonDocument':
+        """
+        Return a new version with a top-level key added or replaced; see
+        :func:`jsontool.core.modifier.add_key_to_json`.
+        """
+        return self._edit_root(add_key_to_json, key, value, overwrite)
+
+    def add_element(self, key: str, element: Any, overwrite: bool = False) -> 'JsonDocument':
+        """
+        Return a new version with an element added to a top-level array; see
+        :func:`jsontool.core.modifier.add_element_to_json_array`.
+        """
+        if not isinstance(self.data, dict):
+            raise TypeError("Input must be a dictionary.")
+        root = dict(self.data)
+        _copy_path(root, (key,))
+        add_element_to_json_array(root, key, element, overwrite)
+        return JsonDocument._wrap(freeze(root))
+
+    def remove_key(self, key: str) -> 'JsonDocument':
+        """
+        Return a new version without a top-level key; see
+        :func:`jsontool.core.modifier.remove_key_from_json`.
+        """
+        return self._edit_root(remove_key_from_json, key)
+
+    def remove_element(self, key: str, value: Any) -> 'JsonDocument':
+        """
+        Return a new version with an element removed from a top-level array;
+        see :func:`jsontool.core.modifier.remove_element_from_json_array`.
+        """
+        if not isinstance(self.data, dict):
+            raise TypeError("Input must be a dictionary.")
+        root = dict(self.data)
+        _copy_path(root, (key,))
+        remove_element_from_json_array(root, key, value)
+        return JsonDocument._wrap(freeze(root))
+
+    def apply_operations(self, operations: Iterable[Dict[str, Any]]) -> 'JsonDocument':
+        """
+        Return a new version with a batch of operations applied; see
+        :func:`jsontool.core.modifier.apply_operations` for the operations.
+
+        Only the containers on the paths touched by the operations are
+        copied. If an operation fails, the error is raised and this version
+        is, as always, left unchanged.
+
+        Raises:
+            TypeError: If an operation is malformed.
+            KeyError: If a path does not exist.
+            ValueError: If an operation is invalid or a ``test`` operation fails.
+        """
+        root = _unfrozen(self.data)
+        batch = _Batch(root)
+        for number, operation in enumerate(operations):
+            try:
+                # A 'test' only reads, so it needs no copies.
+                if isinstance(operation, dict) and operation.get('op') != 'test':
+                    tokens = _parse_json_pointer(operation.get('path', ''))
+                    copied = _copy_path(root, tokens if operation.get('op') == 'append' else tokens[:-1])
+                    if operation.get('op') == 'move' and 'from' in operation:
+                        copied |= _copy_path(root, _parse_json_pointer(operation['from'])[:-1])
+                    if copied:
+                        # The copies replace containers the batch may have cached.
+                        batch.changed(shifted=True)
+                batch.apply(operation)
+            except (KeyError, ValueError, TypeError) as e:
+                message = e.args[0] if e.args else str(e)
+                raise type(e)(f"Operation {number} ({operation!r}) failed: {message}") from e
+        return JsonDocument._wrap(freeze(root))
+
+    def set(self, path, value: Any) -> 'JsonDocument':
+        """
+        Return a new version with the value at ``path`` added or replaced.
+
+        Args:
+            path (str or sequence): A JSON Pointer such as ``/a/0`` or a sequence of keys.
+            value (Any): The new value.
+        """
+        return self.apply_operations([{'op': 'set', 'path': path, 'value': value}])
+
+    def remove(self, path) -> 'JsonDocument':
+        """
+        Return a new version without the value at ``path``.
+
+        Args:
+            path (str or sequence): A JSON Pointer such as ``/a/0`` or a sequence of keys.
+        """
+        return self.apply_operations([{'op': 'remove', 'path': path}])
+
@@ -1,35 +1,80 @@
+from collections import OrderedDict, deque
 from pathlib import Path
+import itertools
 import json
+import mmap
+import os
+import re
+import threading
 
-def read_json_from_string(json_string: str):
+from .backends import get_backend
+from .instrumentation import file_size, instrumented, length, text_size
+
+@instrumented('parse', lambda result, json_string, *args, **kwargs: (text_size(json_string), None, length(result)))
+def read_json_from_string(json_string, backend=None):
     """
     Parse a JSON string into a Python object.
 
+    Bytes-like input (``bytes``, ``bytearray``, ``memoryview``, ``mmap``) is
+    parsed as UTF-8 without first decoding it to ``str`` when the backend
+    supports it.
+
     Args:
-        json_string (str): The JSON string to be parsed.
+        json_string (str or bytes-like): The JSON document to be parsed.
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
 
     Returns:
         dict or list: The parsed JSON object.
 
     Raises:
-        TypeError: If the input is not a string.
+        TypeError: If the input is not a string or bytes-like object.
         ValueError: If the input string is empty or contains invalid JSON.
     """
-    if not isinstance(json_string, str):
-        raise TypeError("Input must be a string.")
-    if not json_string.strip():
-        raise ValueError("Input JSON string is empty.")
+    if isinstance(json_string, mmap.mmap):
+        json_string = memoryview(json_string)
+    if isinstance(json_string, str):
+        if not json_string.strip():
+            raise ValueError("Input JSON string is empty.")
+    elif isinstance(json_string, (bytes, bytearray, memoryview)):
+        # Unlike bytes.strip(), matching the leading whitespace does not copy.
+        if _BLANK_BYTES.fullmatch(json_string):
+            raise ValueError("Input JSON string is empty.")
+    else:
+        raise TypeError("Input must be a string or a bytes-like object.")
     try:
-        return json.loads(json_string)
+        return get_backend(backend).loads(json_string)
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON: {e.msg}")
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
 
-def read_json_from_file(file_path: str):
+@instrumented('parse', lambda result, file_path, *args, **kwargs: (file_size(file_path), None, length(result)))
+def read_json_from_file(file_path: str, backend=None, use_mmap: bool = False, cache=None):
     """
     Read and parse JSON data from a file.
 
+    With ``use_mmap=True`` the file is memory-mapped and parsed directly from
+    the mapped bytes. Backends that parse bytes natively (orjson, pysimdjson)
+    then never build a ``str`` copy of the file, and the mapped pages are
+    file-backed, so the OS can reclaim them under memory pressure. Mappings
+    are shared between calls on the same unchanged file, and because they are
+    read-only views of the page cache, several processes mapping the same
+    file share its physical memory as well.
+
+    With a ``cache``, a file that has not changed since it was last read
+    through that cache is not parsed again, see
+    :class:`jsontool.core.cache.JsonCache`. The cache then decides whether
+    the result is shared and frozen or a private copy, and ``use_mmap`` is
+    not used.
+
     Args:
         file_path (str): The path to the JSON file.
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
+        use_mmap (bool, optional): Whether to parse from a memory-mapped view of
+            the file. Defaults to False.
+        cache (JsonCache, optional): The parse cache to read through. Defaults to None.
 
     Returns:
         dict or list: The parsed JSON object.
@@ -39,18 +84,72 @@ def read_json_from_file(file_path: str):
         PermissionError: If there are permission issues with the file.
         ValueError: If the file contains invalid JSON data.
     """
+    if cache is not None:
+        return cache.get(file_path, backend=backend)
     file_path = Path(file_path)
     if not file_path.is_file():
         raise FileNotFoundError(f"The file '{file_path}' does not exist.")
     try:
+        view = _shared_mapping(file_path) if use_mmap else None
+        if view is not None:
+            with view:
+                return get_backend(backend).loads(view)
         with file_path.open('r', encoding='utf-8') as file:
-            return json.load(file)
+            return get_backend(backend).loads(file.read())
     except PermissionError:
         raise PermissionError(f"Permission denied: '{file_path}'.")
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in the file '{file_path}': {e}")
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Invalid JSON in the file '{file_path}': {e}")
+
+
+_BLANK_BYTES = re.compile(rb'[ \t\n\r]*')
+_MAX_SHARED_MAPPINGS = 32
+_shared_mappings = OrderedDict()
+_shared_mappings_lock = threading.Lock()
+
+
+def _shared_mapping(file_path):
+    """
+    Return a memoryview over a read-only mapping of a file, reusing the
+    mapping created by a previous call as long as the file has not changed on
+    disk. The view is created under the lock so that the mapping cannot be
+    closed by another thread before the caller starts using it.
+
+    Returns None for empty files, which cannot be mapped.
+    """
+    key = str(file_path.resolve())
+    stat = file_path.stat()
+    signature = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    with _shared_mappings_lock:
+        entry = _shared_mappings.get(key)
+        if entry is not None and entry[0] == signature:
+            _shared_mappings.move_to_end(key)
+            return memoryview(entry[1])
+        if stat.st_size == 0:
+            return None
+        with file_path.open('rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _shared_mappings[key] = (signature, mapping)
+        _shared_mappings.move_to_end(key)
+        if entry is not None:
+            _close_mapping(entry[1])
+        while len(_shared_mappings) > _MAX_SHARED_MAPPINGS:
+            _close_mapping(_shared_mappings.popitem(last=False)[1][1])
+        return memoryview(mapping)
+
 
-def write_json_to_string(data, indent=None):
+def _close_mapping(mapping):
+    try:
+        mapping.close()
+    except BufferError:
+        # Another thread is still parsing from it; it is released once the
+        # last view is gone.
+        pass
+
+@instrumented('serialize', lambda result, data, *args, **kwargs: (None, text_size(result), length(data)))
+def write_json_to_string(data, indent=None, backend=None):
     """
     Serialize a Python object to a JSON string.
 
@@ -58,6 +157,8 @@ def write_json_to_string(data, indent=None):
         data (dict or list): The Python object to be serialized.
         indent (int, optional): Number of spaces for indentation in the output.
             Defaults to None (compact format).
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
 
     Returns:
         str: The JSON string representation of the data.
@@ -69,11 +170,12 @@ def write_json_to_string(data, indent=None):
     if not isinstance(data, (dict, list)):
         raise TypeError("Input must be a dictionary or a list.")
     try:
-        return json.dumps(data, indent=indent, ensure_ascii=False)
+        return get_backend(backend).dumps(data, indent=indent)
     except TypeError as e:
         raise ValueError(f"Unable to serialize data to JSON: {e}")
 
-def write_json_to_file(data, file_path: str, indent=None):
+@instrumented('serialize', lambda result, data, file_path, *args, **kwargs: (None, file_size(file_path), length(data)))
+def write_json_to_file(data, file_path: str, indent=None, backend=None):
     """
     Write a Python object to a file in JSON format.
 
@@ -82,6 +184,8 @@ def write_json_to_file(data, file_path: str, indent=None):
         file_path (str): The path to the file where JSON will be written.
         indent (int, optional): Number of spaces for indentation in the output.
             Defaults to None (compact format).
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
 
     Raises:
         TypeError: If the input data is not serializable to JSON.
@@ -91,9 +195,370 @@ def write_json_to_file(data, file_path: str, indent=None):
         raise TypeError("Input must be a dictionary or a list.")
     file_path = Path(file_path)
     try:
+        content = get_backend(backend).dumps(data, indent=indent)
         with file_path.open('w', encoding='utf-8') as file:
-            json.dump(data, file, indent=indent, ensure_ascii=False)
+            file.write(content)
     except TypeError as e:
         raise ValueError(f"Unable to serialize data to JSON: {e}")
     except OSError as e:
         raise OSError(f"Unable to write to file '{file_path}': {e}")
+
+class _JsonStream:
+    """
+    Incremental reader over a text file that hands out JSON tokens and values
+    while keeping only a sliding window of the file in memory.
+    """
+
+    _whitespace = re.compile(r'[ \t\n\r]*')
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, file, file_path, chunk_size):
+        self._file = file
+        self._file_path = file_path
+        self._chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        # Position of self._buf[0] in the file, used for error reporting.
+        self._offset = 0
+        self._line = 1
+        self._column = 1
+
+    def _compact(self):
+        if not self._pos:
+            return
+        consumed = self._buf[:self._pos]
+        newlines = consumed.count('\n')
+        if newlines:
+            self._line += newlines
+            self._column = len(consumed) - consumed.rfind('\n')
+        else:
+            self._column += len(consumed)
+        self._offset += self._pos
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+
+    def _fill(self):
+        # Read at least as much as is already buffered so that a value larger
+        # than one chunk is re-scanned a logarithmic number of times.
+        self._compact()
+        data = self._file.read(max(self._chunk_size, len(self._buf)))
+        if data:
+            self._buf += data
+        else:
+            self._eof = True
+
+    def error(self, msg, pos=None):
+        if pos is None:
+            pos = self._pos
+        newlines = self._buf.count('\n', 0, pos)
+        if newlines:
+            lineno = self._line + newlines
+            colno = pos - self._buf.rfind('\n', 0, pos)
+        else:
+            lineno = self._line
+            colno = self._column + pos
+        raise ValueError(
+            f"Invalid JSON in the file '{self._file_path}': "
+            f"{msg}: line {lineno} column {colno} (char {self._offset + pos})"
+        )
+
+    def peek(self):
+        """Skip whitespace and return the next character, or '' at end of file."""
+        while True:
+            self._pos = self._whitespace.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                return ''
+            self._fill()
+
+    def advance(self):
+        self._pos += 1
+
+    def decode_value(self):
+        """Decode the next complete JSON value, reading more data as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                truncated = e.pos >= len(self._buf) - 10 or e.msg.startswith('Unterminated string')
+                if self._eof or not truncated:
+                    self.error(e.msg, e.pos)
+                self._fill()
+                continue
+            if end == len(self._buf) and not self._eof:
+                # A number or literal may continue in the next chunk.
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_json_path(stream, path):
+    if not path:
+        yield stream.decode_value()
+        return
+
+    head, rest = path[0], path[1:]
+    char = stream.peek()
+    if char == '[' and head == 'item':
+        stream.advance()
+        if stream.peek() == ']':
+            stream.advance()
+            return
+        while True:
+            yield from _iter_json_path(stream, rest)
+            char = stream.peek()
+            if char not in (',', ']'):
+                stream.error("Expecting ',' delimiter")
+            stream.advance()
+            if char == ']':
+                return
+    elif char == '{':
+        stream.advance()
+        if stream.peek() == '}':
+            stream.advance()
+            return
+        while True:
+            if stream.peek() != '"':
+                stream.error("Expecting property name enclosed in double quotes")
+            key = stream.decode_value()
+            if stream.peek() != ':':
+                stream.error("Expecting ':' delimiter")
+            stream.advance()
+            if key == head:
+                yield from _iter_json_path(stream, rest)
+            else:
+                stream.decode_value()
+            char = stream.peek()
+            if char not in (',', '}'):
+                stream.error("Expecting ',' delimiter")
+            stream.advance()
+            if char == '}':
+                return
+    else:
+        # The path does not exist in this document: consume the value so
+        # that the rest of the file can still be checked for syntax errors.
+        stream.decode_value()
+
+
+@instrumented('parse', lambda result, file_path, *args, **kwargs: (file_size(file_path), None, None), iterator=True)
+def iter_json_file(file_path: str, prefix: str = 'item', chunk_size: int = 65536):
+    """
+    Lazily iterate over the values found at a path inside a JSON file.
+
+    The file is read in chunks and only the value currently being yielded is
+    kept in memory, so arrays far larger than the available RAM can be
+    processed one element at a time. The path is a dot-separated list of
+    object keys where ``item`` stands for every element of an array, e.g.
+    ``item`` for a top-level array or ``items.item`` for the array stored
+    under the ``items`` key.
+
+    Args:
+        file_path (str): The path to the JSON file.
+        prefix (str, optional): The path of the values to yield. Defaults to 'item'.
+        chunk_size (int, optional): Number of characters read from the file at a time.
+            Defaults to 65536.
+
+    Yields:
+        Any: Each value matching the prefix, in document order.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        PermissionError: If there are permission issues with the file.
+        ValueError: If the file contains invalid JSON data.
+    """
+    file_path = Path(file_path)
+    if not file_path.is_file():
+        raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+    path = prefix.split('.') if prefix else []
+    try:
+        with file_path.open('r', encoding='utf-8') as file:
+            stream = _JsonStream(file, file_path, chunk_size)
+            yield from _iter_json_path(stream, path)
+            if stream.peek():
+                stream.error("Extra data")
+    except PermissionError:
+        raise PermissionError(f"Permission denied: '{file_path}'.")
+
+
+_JSONL_ERROR_POLICIES = ('raise', 'skip', 'collect')
+
+
+def _parse_jsonl_lines(lines, on_error, loads):
+    """
+    Parse an iterable of JSON Lines records.
+
+    Lines given as bytes are decoded as UTF-8 one by one, so that a line
+    that is not valid UTF-8 is malformed like one that is not valid JSON.
+    Returns the parsed records, the malformed lines as (line_offset, message)
+    pairs relative to the first line, and the number of lines consumed.
+    """
+    records = []
+    errors = []
+    line_count = 0
+    for line_count, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            records.append(loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            if on_error == 'raise':
+                return records, [(line_count, str(e))], line_count
+            if on_error == 'collect':
+                errors.append((line_count, str(e)))
+    return records, errors, line_count
+
+
+def _parse_jsonl_range(file_path, start, end, on_error, backend_name):
+    # Runs in a worker process: parse the lines in the byte range [start, end).
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    # Split on '\n' only, like the serial reader: a bare '\r' is whitespace
+    # inside a record. A range ends on a line boundary, so a final empty
+    # piece is no line.
+    lines = data.split(b'\n')
+    if lines[-1] == b'':
+        lines.pop()
+    return _parse_jsonl_lines([line.rstrip(b'\r') for line in lines], on_error, get_backend(backend_name).loads)
+
+
+def _jsonl_ranges(file_path, chunk_bytes):
+    """Split a file into byte ranges that start and end on line boundaries."""
+    size = file_path.stat().st_size
+    start = 0
+    with file_path.open('rb') as file:
+        while start < size:
+            file.seek(min(start + chunk_bytes, size))
+            file.readline()
+            end = min(file.tell(), size)
+            yield start, end
+            start = end
+
+
+@instrumented('parse', lambda result, file_path, *args, **kwargs: (file_size(file_path), None, None), iterator=True)
+def read_jsonl(file_path: str, on_error: str = 'raise', errors=None, parallel: bool = False,
+               workers=None, chunk_bytes: int = 4 * 2**20, backend=None):
+    """
+    Lazily read records from a JSON Lines (NDJSON) file.
+
+    Each non-blank line is parsed as one JSON value. With ``parallel=True``
+    the file is split into byte ranges on line boundaries which are parsed
+    in a process pool; records are still yielded in their original order.
+
+    Args:
+        file_path (str): The path to the JSON Lines file.
+        on_error (str, optional): What to do with malformed lines: 'raise',
+            'skip' or 'collect'. Defaults to 'raise'.
+        errors (list, optional): List that receives (line_number, message)
+            tuples for malformed lines. Required when on_error is 'collect'.
+        parallel (bool, optional): Whether to parse chunks in a process pool. Defaults to False.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        chunk_bytes (int, optional): Approximate size of each chunk in parallel mode.
+            Defaults to 4 MiB.
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
+
+    Yields:
+        Any: Each parsed record.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        PermissionError: If there are permission issues with the file.
+        ValueError: If a line contains invalid JSON and on_error is 'raise',
+            or if the error policy is unknown.
+        TypeError: If on_error is 'collect' and no errors list is given.
+    """
+    if on_error not in _JSONL_ERROR_POLICIES:
+        raise ValueError(f"Unknown error policy '{on_error}'. Expected one of {_JSONL_ERROR_POLICIES}.")
+    if on_error == 'collect' and not isinstance(errors, list):
+        raise TypeError("An 'errors' list is required when on_error is 'collect'.")
+    backend = get_backend(backend)
+    file_path = Path(file_path)
+    if not file_path.is_file():
+        raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+    try:
+        if parallel:
+            chunks = _read_jsonl_parallel(file_path, on_error, workers, chunk_bytes, backend.name)
+        else:
+            chunks = _read_jsonl_sequential(file_path, on_error, backend.loads)
+        first_line = 1
+        for records, chunk_errors, line_count in chunks:
+            for line_offset, message in chunk_errors:
+                line_number = first_line + line_offset - 1
+                if on_error == 'raise':
+                    yield from records
+                    raise ValueError(f"Invalid JSON on line {line_number} of the file '{file_path}': {message}")
+                errors.append((line_number, message))
+            yield from records
+            first_line += line_count
+    except PermissionError:
+        raise PermissionError(f"Permission denied: '{file_path}'.")
+
+
+def _read_jsonl_sequential(file_path, on_error, loads, batch_lines=1000):
+    with file_path.open('rb') as file:
+        while True:
+            lines = [line.rstrip(b'\r\n') for line in itertools.islice(file, batch_lines)]
+            if not lines:
+                return
+            yield _parse_jsonl_lines(lines, on_error, loads)
+
+
+def _read_jsonl_parallel(file_path, on_error, workers, chunk_bytes, backend_name):
+    # Imported here: concurrent.futures.process pulls in multiprocessing,
+    # which would dominate the import time of this module.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window of chunks in flight so that memory does not
+        # grow with the file size when the consumer is slower than the pool.
+        pending = deque()
+        for start, end in _jsonl_ranges(file_path, chunk_bytes):
+            pending.append(executor.submit(_parse_jsonl_range, file_path, start, end, on_error, backend_name))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+@instrumented('serialize', lambda result, records, file_path, *args, **kwargs: (None, file_size(file_path), result))
+def write_jsonl(records, file_path: str, backend=None):
+    """
+    Write an iterable of Python objects to a file in JSON Lines format.
+
+    Records are serialized one at a time, so a generator can be written
+    without materializing it in memory.
+
+    Args:
+        records (iterable): The Python objects to be written, one per line.
+        file_path (str): The path to the file where the records will be written.
+        backend (str, optional): The JSON backend to use, 'auto' for the fastest
+            installed one. Defaults to the process-wide default backend.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        ValueError: If a record is not serializable to JSON.
+        OSError: If there is an issue writing to the file.
+    """
+    dumps = get_backend(backend).dumps
+    file_path = Path(file_path)
+    count = 0
+    try:
+        with file_path.open('w', encoding='utf-8') as file:
+            for count, record in enumerate(records, 1):
+                file.write(dumps(record))
+                file.write('\n')
+    except TypeError as e:
+        raise ValueError(f"Unable to serialize record {count} to JSON: {e}")
+    except OSError as e:
+        raise OSError(f"Unable to write to file '{file_path}': {e}")
+    return count
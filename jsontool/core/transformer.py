@@ -0,0 +1,468 @@
+"""
+Streaming re-formatting of JSON text.
+
+The transformer works on tokens instead of parsed values: the input is read
+in chunks, checked against the JSON grammar and written back with new
+whitespace. Strings and numbers are copied verbatim, so reformatting is
+lossless (escapes, number spellings and duplicate keys are preserved) and
+memory use does not depend on the size of the document.
+
+Each chunk is first handled as a whole with str methods and a few regular
+expressions, which keeps the work per token in C. Only a chunk that fails
+this check goes through a token-by-token state machine, which finds the
+error and reports it with the same message and position as the json module.
+"""
+
+import io
+import os
+import re
+from itertools import accumulate, islice, repeat
+from operator import getitem
+from typing import Optional, Union
+
+_TOKEN = re.compile(r'''[ \t\n\r]*(?:
+    ("[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*")
+  | (-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null)
+  | ([{}\[\]:,])
+)''', re.VERBOSE)
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_STOP = re.compile(r'["\\\x00-\x1f]')
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+# What the text at the end of a chunk may be the start of. A failed match
+# that reaches the end of the buffer may just be cut by the chunk boundary.
+_PARTIAL_STRING = re.compile(r'"[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{0,4})[^"\\\x00-\x1f]*)*\\?')
+_PARTIAL_LITERAL = re.compile(r't(?:r(?:ue?)?)?|f(?:a(?:l(?:se?)?)?)?|n(?:u(?:ll?)?)?'
+                              r'|-?[0-9]*(?:\.[0-9]*)?(?:[eE][-+]?[0-9]*)?')
+
+# Parser states: what the next token must be.
+_VALUE = 0          # a value (after ':' or ',' in an array, or at the start)
+_FIRST_VALUE = 1    # a value or ']' (after '[')
+_FIRST_KEY = 2      # a key or '}' (after '{')
+_KEY = 3            # a key (after ',' in an object)
+_COLON = 4          # ':' (after a key)
+_NEXT = 5           # ',' or the closing bracket (after a value)
+
+_CLOSING = {'}': '{', ']': '['}
+
+# The fast path checks and rewrites whole chunks with str methods, which run
+# in C, and only falls back to the token loop to report an error. Escaped
+# quotes and backslashes are first swapped for placeholders of the same
+# length, so that splitting the chunk at '"' alternates between the text
+# outside strings (even pieces) and string contents (odd pieces).
+_ESCAPED_BACKSLASH, _ESCAPED_QUOTE = '\\\\', '\\"'
+_BACKSLASH_PLACEHOLDER, _QUOTE_PLACEHOLDER = '\x00\x00', '\x01\x01'
+_BAD_ESCAPE = re.compile(r'\\(?![/bfnrt]|u[0-9a-fA-F]{4})')
+_CONTROL_CHARS = dict.fromkeys(set(range(32)) - {9, 10, 13})
+_NO_WHITESPACE = dict.fromkeys(map(ord, ' \t\n\r'))
+# What may end a chunk and continue in the next one: part of a scalar,
+# opening brackets (kept with their content so that '[]' stays together)
+# and whitespace.
+_TRAILING = ' \t\n\r{[-+.0123456789eEtrufalsn'
+# The text outside strings, with '"' for each string, is turned into a
+# skeleton with '0' for each scalar, e.g. '{":0,":[",0]}'. Scalars are
+# checked by rewriting character classes: digit runs become 'd', fractions
+# 'F' and literals 'L'; anything left over is invalid. Letters used as
+# classes are made invalid first, and whitespace is kept until the end so
+# that it still separates scalars.
+_CLASSES = str.maketrans({**dict.fromkeys('123456789', '1'), **dict.fromkeys('\t\n\r', ' '),
+                          **dict.fromkeys('dFLN', '!'), 'E': 'e'})
+_NUMBER_STARTS = str.maketrans(dict.fromkeys('[{,: -', '|'))
+_SIGN_STARTS = str.maketrans(dict.fromkeys('[{,: ', '|'))
+_DIGITS = str.maketrans('01', 'dd')
+_EXPONENTS = ('Fe+d', 'de+d', 'Fed', 'ded')
+_SCALARS = str.maketrans({'d': '0', 'F': '0', 'L': '0', 'N': '0', ' ': None})
+_NOT_SKELETON = dict.fromkeys(map(ord, '0"{}[],:'))
+_ONLY_BRACKETS = dict.fromkeys(set(range(128)) - set(map(ord, '{}[]')))
+_BRACKETS_TO_SEPARATOR = str.maketrans(dict.fromkeys('{}[]', '\x04'))
+_DEPTH_CHANGE = {'{': 1, '[': 1, '}': -1, ']': -1}
+_CONTAINER = re.compile(r'\[(?:[0"](?:,[0"])*)?\]|\{(?:":[0"](?:,":[0"])*)?\}')
+# The open containers of a valid prefix, outermost first, then the innermost
+# one with the members read so far; or a complete top-level value.
+_OPEN_PREFIX = re.compile(r'(?:\[(?:[0"],)*|\{(?:":[0"],)*":)*'
+                          r'(?:\[(?:[0"],)*[0"]?|\{(?:":[0"],)*(?:"(?::[0"]?)?)?)?|[0"]')
+# Completed members of an open container; only the last one matters.
+_COMPLETED = re.compile(r'(?<=\[)(?:[0"],)*([0"],)|(?<=\{)(?:":[0"],)*(":[0"],)')
+
+
+def _expected(state: int, depth: int) -> str:
+    if state in (_VALUE, _FIRST_VALUE):
+        return "Expecting value"
+    if state in (_FIRST_KEY, _KEY):
+        return "Expecting property name enclosed in double quotes"
+    if state == _COLON:
+        return "Expecting ':' delimiter"
+    return "Expecting ',' delimiter" if depth else "Extra data"
+
+
+class _Source:
+    """Chunked reader that tracks positions for error messages."""
+
+    def __init__(self, file, name, chunk_size):
+        self.file = file
+        self.name = name
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.eof = False
+        # Position of buf[0] in the input, and line bookkeeping up to it.
+        self.offset = 0
+        self.line = 1
+        self.line_start = 0
+
+    def refill(self, pos: int) -> None:
+        """Drop ``buf[:pos]`` and read at least one more chunk."""
+        consumed = self.buf.count('\n', 0, pos)
+        if consumed:
+            self.line += consumed
+            self.line_start = self.offset + self.buf.rfind('\n', 0, pos) + 1
+        self.offset += pos
+        # Read at least as much as is kept, so that a token larger than a
+        # chunk is rescanned a logarithmic number of times.
+        data = self.file.read(max(self.chunk_size, len(self.buf) - pos))
+        self.buf = self.buf[pos:] + data
+        if not data:
+            self.eof = True
+
+    def error(self, msg: str, pos: int):
+        line = self.line + self.buf.count('\n', 0, pos)
+        newline = self.buf.rfind('\n', 0, pos)
+        line_start = self.offset + newline + 1 if newline != -1 else self.line_start
+        where = f" in the file '{self.name}'" if self.name else ""
+        raise ValueError(f"Invalid JSON{where}: {msg}: line {line} column {self.offset + pos - line_start + 1} "
+                         f"(char {self.offset + pos})")
+
+    def string_error(self, pos: int):
+        """Report why the string starting at ``pos`` is invalid, like the json module does."""
+        buf = self.buf
+        end = pos + 1
+        while True:
+            match = _STRING_STOP.search(buf, end)
+            if match is None:
+                self.error("Unterminated string starting at", pos)
+            end = match.start()
+            if buf[end] == '"':
+                return
+            if buf[end] != '\\':
+                self.error("Invalid control character at", end)
+            escape = buf[end + 1:end + 2]
+            if not escape:
+                self.error("Unterminated string starting at", pos)
+            if escape == 'u':
+                if not _HEX4.fullmatch(buf, end + 2, end + 6):
+                    self.error("Invalid \\uXXXX escape", end + 1)
+                end += 6
+            elif escape in '"\\/bfnrt':
+                end += 2
+            else:
+                self.error("Invalid \\escape", end)
+
+    def truncated(self, pos: int) -> bool:
+        """Whether an unmatched token at ``pos`` may continue in the next chunk."""
+        if self.eof:
+            return False
+        pattern = _PARTIAL_STRING if self.buf.startswith('"', pos) else _PARTIAL_LITERAL
+        match = pattern.match(self.buf, pos)
+        return match is not None and match.end() == len(self.buf)
+
+
+def _skeleton(structure: str) -> Optional[str]:
+    """The skeleton of the text outside strings, or None if a scalar is invalid."""
+    # The sign of an exponent must not pass for the start of a number.
+    text = structure.translate(_CLASSES).replace('e-', 'e+')
+    starts = text.translate(_NUMBER_STARTS)
+    if '|00' in starts or '|01' in starts or starts.startswith(('00', '01')):
+        return None
+    # A minus sign may only start a number.
+    signs = text.translate(_SIGN_STARTS).replace('|-', '|')
+    if '-' in (signs[1:] if signs.startswith('-') else signs):
+        return None
+    text = text.replace('true', 'L').replace('false', 'L').replace('null', 'L').translate(_DIGITS)
+    while 'dd' in text:
+        text = text.replace('dd', 'd')
+    text = text.replace('-d', 'd').replace('d.d', 'F')
+    for exponent in _EXPONENTS:
+        if exponent in text:
+            text = text.replace(exponent, 'N')
+    text = text.translate(_SCALARS)
+    return None if text.translate(_NOT_SKELETON) else text
+
+
+def _reduce(skeleton: str) -> Optional[str]:
+    """Fold complete containers; None unless what is left is a valid prefix."""
+    count = 1
+    while count:
+        skeleton, count = _CONTAINER.subn('0', skeleton)
+    if not _OPEN_PREFIX.fullmatch(skeleton):
+        return None
+    return _COMPLETED.sub(r'\1\2', skeleton)
+
+
+def _state_after(skeleton: str):
+    """The token loop's stack and state after a reduced skeleton."""
+    stack = [char for char in skeleton if char in '[{']
+    last = skeleton[-1:]
+    if not last or last == ':':
+        state = _VALUE
+    elif last == ',':
+        state = _KEY if stack[-1] == '{' else _VALUE
+    elif last == '"' and stack[-1:] == ['{'] and skeleton[-2] in '{,':
+        state = _COLON
+    else:
+        state = _NEXT
+    return stack, state
+
+
+class _Layout:
+    """
+    Indents the text outside strings like ``json.dumps`` does.
+
+    The text is cut at brackets: commas between two brackets are all at the
+    same depth, which changes by one at each bracket. The depths are summed
+    with ``accumulate`` and the pieces are looked up in per-depth tables, so
+    no Python code runs per line.
+    """
+
+    def __init__(self, indent: str):
+        self.indent = indent
+        self.depth = 0
+        self.commas = []
+        self.brackets = {'{': [], '[': [], '}': [], ']': []}
+
+    def _grow(self, depth: int) -> None:
+        while len(self.commas) <= depth:
+            newline = '\n' + self.indent * len(self.commas)
+            self.commas.append(',' + newline)
+            for bracket, tokens in self.brackets.items():
+                tokens.append(bracket + newline if bracket in '{[' else newline + bracket)
+
+    def __call__(self, compact: str) -> str:
+        # Empty containers stay on one line; control characters cannot occur here.
+        compact = compact.replace('{}', '\x02').replace('[]', '\x03').replace(':', ': ')
+        brackets = compact.translate(_ONLY_BRACKETS)
+        segments = compact.translate(_BRACKETS_TO_SEPARATOR).split('\x04')
+        depths = list(accumulate(map(_DEPTH_CHANGE.__getitem__, brackets), initial=self.depth))
+        self._grow(max(depths))
+        merged = [None] * (len(segments) + len(brackets))
+        merged[::2] = map(str.replace, segments, repeat(','), map(self.commas.__getitem__, depths))
+        merged[1::2] = map(getitem, map(self.brackets.__getitem__, brackets), islice(depths, 1, None))
+        self.depth = depths[-1]
+        return ''.join(merged).replace('\x02', '{}').replace('\x03', '[]')
+
+
+def _transform(source: _Source, write, indent: Optional[str]) -> None:
+    layout = _Layout(indent) if indent is not None else None
+    skeleton = ''
+    source.refill(0)
+    while True:
+        buf = source.buf
+        text = buf
+        escapes = '\\' in text
+        valid = len(text.translate(_CONTROL_CHARS)) == len(text)
+        if escapes and valid:
+            text = text.replace(_ESCAPED_BACKSLASH, _BACKSLASH_PLACEHOLDER).replace(_ESCAPED_QUOTE, _QUOTE_PLACEHOLDER)
+        pieces = text.split('"')
+        cut = len(text)
+        if len(pieces) % 2 == 0:
+            # An unterminated string, possibly cut by the chunk boundary.
+            valid = valid and not source.eof
+            cut -= len(pieces.pop()) + 1
+        if not source.eof:
+            tail = pieces[-1]
+            pieces[-1] = tail.rstrip(_TRAILING)
+            cut -= len(tail) - len(pieces[-1])
+        structure = '"'.join(pieces[0::2])
+        if valid:
+            # Whitespace and escapes are only allowed outside and inside strings respectively.
+            valid = (all(buf.count(char, 0, cut) == structure.count(char) for char in '\t\n\r')
+                     and not (escapes and _BAD_ESCAPE.search(text, 0, cut)))
+        if valid:
+            reduced = _skeleton(structure)
+            if reduced is not None:
+                reduced = _reduce(skeleton + reduced)
+            valid = reduced is not None and (not source.eof or reduced in ('0', '"'))
+        if not valid:
+            stack, state = _state_after(skeleton)
+            return _transform_tokens(source, write, indent, stack, state)
+        skeleton = reduced
+        compact = structure.translate(_NO_WHITESPACE)
+        if layout is not None:
+            compact = layout(compact)
+        pieces[0::2] = compact.split('"')
+        text = '"'.join(pieces)
+        if escapes:
+            text = text.replace(_QUOTE_PLACEHOLDER, _ESCAPED_QUOTE).replace(_BACKSLASH_PLACEHOLDER, _ESCAPED_BACKSLASH)
+        if text:
+            write(text)
+        if source.eof:
+            return
+        source.refill(cut)
+
+
+def _transform_tokens(source: _Source, write, indent: Optional[str], stack: list, state: int) -> None:
+    """Check and reformat token by token, from ``source.buf[0]`` in the given parser state."""
+    if indent is None:
+        comma, colon = ',', ':'
+        newlines = None
+    else:
+        comma, colon = ',', ': '
+        newlines = ['\n' + indent * depth for depth in range(len(stack) + 1)]
+    out = []
+    append = out.append
+    while True:
+        buf = source.buf
+        scan = _TOKEN.scanner(buf).match
+        last = None
+        match = scan()
+        while match is not None:
+            kind = match.lastindex
+            token = match[kind]
+            if kind == 3:
+                if token == ',':
+                    if state != _NEXT or not stack:
+                        source.error(_expected(state, len(stack)), match.end() - 1)
+                    state = _KEY if stack[-1] == '{' else _VALUE
+                    append(comma if newlines is None else comma + newlines[len(stack)])
+                elif token == ':':
+                    if state != _COLON:
+                        source.error(_expected(state, len(stack)), match.end() - 1)
+                    state = _VALUE
+                    append(colon)
+                elif token == '{' or token == '[':
+                    if state > _FIRST_VALUE:
+                        source.error(_expected(state, len(stack)), match.end() - 1)
+                    if newlines is not None and state == _FIRST_VALUE:
+                        append(newlines[len(stack)])
+                    append(token)
+                    stack.append(token)
+                    if newlines is not None and len(newlines) <= len(stack):
+                        newlines.append(newlines[-1] + indent)
+                    state = _FIRST_KEY if token == '{' else _FIRST_VALUE
+                else:
+                    opening = _CLOSING[token]
+                    empty = state == (_FIRST_KEY if opening == '{' else _FIRST_VALUE)
+                    if not stack or stack[-1] != opening or not (empty or state == _NEXT):
+                        source.error(_expected(state, len(stack)), match.end() - 1)
+                    stack.pop()
+                    if newlines is not None and not empty:
+                        append(newlines[len(stack)])
+                    append(token)
+                    state = _NEXT
+            else:
+                if kind == 2:
+                    # A number or literal may continue in the next chunk; at most
+                    # two characters ('e+', '.') can follow a valid prefix of one.
+                    end = match.end()
+                    if len(buf) - end <= 2 and source.truncated(end - len(token)):
+                        break
+                if state == _VALUE:
+                    state = _NEXT
+                elif state == _FIRST_VALUE:
+                    state = _NEXT
+                    if newlines is not None:
+                        append(newlines[len(stack)])
+                elif kind == 1 and (state == _KEY or state == _FIRST_KEY):
+                    if newlines is not None and state == _FIRST_KEY:
+                        append(newlines[len(stack)])
+                    state = _COLON
+                else:
+                    source.error(_expected(state, len(stack)), match.end() - len(token))
+                append(token)
+            last = match
+            match = scan()
+        if out:
+            write(''.join(out))
+            out.clear()
+        pos = _WHITESPACE.match(buf, last.end() if last is not None else 0).end()
+        if pos < len(buf) and not source.truncated(pos):
+            if buf.startswith('"', pos) and state != _COLON and state != _NEXT:
+                source.string_error(pos)
+            source.error(_expected(state, len(stack)), pos)
+        if source.eof:
+            if stack or state != _NEXT:
+                source.error(_expected(state, len(stack)), pos)
+            return
+        source.refill(pos)
+
+
+def _indent_string(indent: Union[int, str, None]) -> Optional[str]:
+    if indent is None:
+        return None
+    if isinstance(indent, str):
+        # Anything else would make the output invalid JSON.
+        if indent.strip(' \t'):
+            raise ValueError("An indent string may only contain spaces and tabs.")
+        return indent
+    if isinstance(indent, bool) or not isinstance(indent, int) or indent < 0:
+        raise ValueError("Indent must be None, a non-negative integer or a string.")
+    return ' ' * indent
+
+
+def reformat_json(source, destination, indent: Union[int, str, None] = None, chunk_size: int = 1 << 20) -> None:
+    """
+    Re-indent or minify JSON from one stream or file to another.
+
+    The input is validated as it is copied: on a syntax error, ValueError is
+    raised and the output holds only the text written before the error.
+    With an indent, the layout matches ``json.dumps(..., indent=indent)``;
+    without one, all insignificant whitespace is removed.
+
+    Args:
+        source (str or file): A file path or a text stream to read from.
+        destination (str or file): A file path or a text stream to write to.
+        indent (int or str, optional): Spaces (or a string of spaces and tabs) per nesting
+            level, or None to minify. Defaults to None.
+        chunk_size (int, optional): Number of characters read at a time. Defaults to 1 MiB.
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+        ValueError: If the input is not valid JSON, or the indent or chunk size is invalid.
+    """
+    indent = _indent_string(indent)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.isfile(source):
+            raise FileNotFoundError(f"The file '{source}' does not exist.")
+        with open(source, 'r', encoding='utf-8') as file:
+            return reformat_json(file, destination, indent, chunk_size)
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, 'w', encoding='utf-8') as file:
+            return reformat_json(source, file, indent, chunk_size)
+    name = getattr(source, 'name', None)
+    _transform(_Source(source, name if isinstance(name, str) else None, chunk_size), destination.write, indent)
+
+
+def minify_json(source, destination, chunk_size: int = 1 << 20) -> None:
+    """
+    Remove all insignificant whitespace; see :func:`reformat_json`.
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+        ValueError: If the input is not valid JSON.
+    """
+    reformat_json(source, destination, None, chunk_size)
+
+
+def pretty_print_json(source, destination, indent: Union[int, str] = 2, chunk_size: int = 1 << 20) -> None:
+    """
+    Re-indent JSON with ``indent`` per nesting level; see :func:`reformat_json`.
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+        ValueError: If the input is not valid JSON or the indent is invalid.
+    """
+    reformat_json(source, destination, indent, chunk_size)
+
+
+def reformat_json_string(json_string: str, indent: Union[int, str, None] = None) -> str:
+    """
+    Re-indent or minify a JSON string; see :func:`reformat_json`.
+
+    Raises:
+        TypeError: If the input is not a string.
+        ValueError: If the input is not valid JSON or the indent is invalid.
+    """
+    if not isinstance(json_string, str):
+        raise TypeError("Input must be a string.")
+    output = io.StringIO()
+    reformat_json(io.StringIO(json_string), output, indent, max(len(json_string), 1))
+    return output.getvalue()
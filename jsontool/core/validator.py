@@ -0,0 +1,677 @@
+"""
+JSON Schema validation.
+
+A schema is compiled once into a tree of check closures, one per keyword, so
+validating an instance never re-interprets the schema dictionary. Compiled
+schemas are cached by identity and by content, which makes repeated calls
+with the same schema cheap.
+
+Supported keywords (a subset of draft 2020-12): ``type``, ``enum``,
+``const``, ``properties``, ``required``, ``additionalProperties``, ``items``,
+``minItems``, ``maxItems``, ``minLength``, ``maxLength``, ``pattern``,
+``minimum``, ``maximum``, ``exclusiveMinimum``, ``exclusiveMaximum`` and
+local ``$ref`` (``#`` and JSON pointers such as ``#/$defs/item``). Other
+keywords are ignored.
+"""
+
+from collections import OrderedDict, deque
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .instrumentation import instrumented, length
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a JSON instance does not match a schema.
+
+    Attributes:
+        message (str): Description of the failed check.
+        path (list): Keys and indices leading from the root to the failing value.
+    """
+
+    def __init__(self, message: str, path=None):
+        super().__init__(message)
+        self.message = message
+        self.path = list(path or [])
+
+    def __str__(self):
+        return f"{self.message} at {format_path(self.path)}"
+
+    def __reduce__(self):
+        return (type(self), (self.message, self.path))
+
+
+def format_path(path) -> str:
+    """
+    Format a list of keys and indices as a JSONPath, e.g. ``$.items[0].name``.
+
+    Args:
+        path (list): The keys and indices.
+
+    Returns:
+        str: The JSONPath.
+    """
+    parts = ['$']
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f'[{key}]')
+        elif re.fullmatch(r'[A-Za-z_][\w-]*', key):
+            parts.append(f'.{key}')
+        else:
+            parts.append(f"[{json.dumps(key, ensure_ascii=False)}]")
+    return ''.join(parts)
+
+
+class _FailFast:
+    """Error sink that raises the first error instead of collecting it."""
+
+    def append(self, error):
+        raise error
+
+
+_FAIL_FAST = _FailFast()
+
+
+def _freeze(value):
+    """Return a hashable form of a JSON value in which true != 1."""
+    if isinstance(value, bool):
+        return ('bool', value)
+    if isinstance(value, (int, float)):
+        return ('number', value)
+    if isinstance(value, list):
+        return ('array', tuple(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return ('object', frozenset((key, _freeze(item)) for key, item in value.items()))
+    return (type(value).__name__, value)
+
+
+def _is_integer(value) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPE_CHECKS = {
+    'object': lambda value: isinstance(value, dict),
+    'array': lambda value: isinstance(value, list),
+    'string': lambda value: isinstance(value, str),
+    'integer': _is_integer,
+    'number': _is_number,
+    'boolean': lambda value: isinstance(value, bool),
+    'null': lambda value: value is None,
+}
+
+
+def _check_child(check, value, key, errors):
+    """Run a check on a child value and prefix the key to any error path."""
+    if errors is _FAIL_FAST:
+        try:
+            check(value, errors)
+        except ValidationError as e:
+            e.path.insert(0, key)
+            raise
+        return
+    mark = len(errors)
+    check(value, errors)
+    for index in range(mark, len(errors)):
+        errors[index].path.insert(0, key)
+
+
+class _Compiler:
+    """Turns a schema into a check function ``check(instance, errors)``."""
+
+    def __init__(self, root):
+        self.root = root
+        # JSON pointer -> one-element list holding the compiled check, filled
+        # in once compiled so that recursive references work.
+        self.refs: Dict[str, list] = {}
+
+    def error(self, message: str):
+        raise ValueError(f"Invalid schema: {message}")
+
+    def compile(self, schema) -> Callable[[Any, Any], None]:
+        if schema is True or schema == {}:
+            return _accept
+        if schema is False:
+            return _reject
+        if not isinstance(schema, dict):
+            raise TypeError(f"Schema must be a dictionary or a boolean, not {type(schema).__name__}.")
+
+        checks = []
+        for keyword, factory in _KEYWORDS:
+            if keyword in schema:
+                check = factory(self, schema[keyword], schema)
+                if check is not None:
+                    checks.append(check)
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(instance, errors):
+            for check in checks:
+                check(instance, errors)
+        return check_all
+
+    def resolve(self, ref: str) -> Callable[[Any, Any], None]:
+        if not isinstance(ref, str) or not ref.startswith('#'):
+            self.error(f"only local references are supported, got {ref!r}")
+        if ref != '#' and not ref.startswith('#/'):
+            # Plain-name fragments would need $anchor, which is not supported.
+            self.error(f"unresolvable reference {ref!r}, expected a JSON pointer such as '#/$defs/name'")
+        cell = self.refs.get(ref)
+        if cell is None:
+            cell = self.refs[ref] = [None]
+            target = self.root
+            for token in ref[1:].split('/')[1:]:
+                token = token.replace('~1', '/').replace('~0', '~')
+                try:
+                    target = target[int(token)] if isinstance(target, list) else target[token]
+                except (KeyError, IndexError, ValueError, TypeError):
+                    self.error(f"unresolvable reference {ref!r}")
+            cell[0] = self.compile(target)
+        return lambda instance, errors: cell[0](instance, errors)
+
+
+def _accept(instance, errors):
+    pass
+
+
+def _reject(instance, errors):
+    errors.append(ValidationError("Value is not allowed by the schema"))
+
+
+# --- keyword factories --------------------------------------------------------
+#
+# Each factory receives the compiler, the keyword value and the enclosing
+# schema, and returns a check or None when the keyword has no effect.
+
+def _compile_ref(compiler, ref, schema):
+    return compiler.resolve(ref)
+
+
+def _compile_type(compiler, expected, schema):
+    names = [expected] if isinstance(expected, str) else list(expected)
+    for name in names:
+        if name not in _TYPE_CHECKS:
+            compiler.error(f"unknown type {name!r}")
+    tests = [_TYPE_CHECKS[name] for name in names]
+    label = ' or '.join(names)
+    if len(tests) == 1:
+        test = tests[0]
+    else:
+        def test(value):
+            return any(test(value) for test in tests)
+
+    def check(instance, errors):
+        if not test(instance):
+            errors.append(ValidationError(f"Expected {label}, got {_type_name(instance)}"))
+    return check
+
+
+def _compile_enum(compiler, values, schema):
+    if not isinstance(values, list):
+        compiler.error("'enum' must be an array")
+    allowed = {_freeze(value) for value in values}
+
+    def check(instance, errors):
+        if _freeze(instance) not in allowed:
+            errors.append(ValidationError(f"Value {instance!r} is not one of {values!r}"))
+    return check
+
+
+def _compile_const(compiler, value, schema):
+    expected = _freeze(value)
+
+    def check(instance, errors):
+        if _freeze(instance) != expected:
+            errors.append(ValidationError(f"Value {instance!r} is not {value!r}"))
+    return check
+
+
+def _compile_properties(compiler, properties, schema):
+    if not isinstance(properties, dict):
+        compiler.error("'properties' must be an object")
+    compiled = [(key, compiler.compile(subschema)) for key, subschema in properties.items()]
+    compiled = [(key, sub) for key, sub in compiled if sub is not _accept]
+    if not compiled:
+        return None
+
+    def check(instance, errors):
+        if isinstance(instance, dict):
+            for key, sub in compiled:
+                if key in instance:
+                    _check_child(sub, instance[key], key, errors)
+    return check
+
+
+def _compile_required(compiler, required, schema):
+    if not isinstance(required, list):
+        compiler.error("'required' must be an array")
+    if not required:
+        return None
+
+    def check(instance, errors):
+        if isinstance(instance, dict):
+            for key in required:
+                if key not in instance:
+                    errors.append(ValidationError(f"Missing required property '{key}'"))
+    return check
+
+
+def _compile_additional_properties(compiler, additional, schema):
+    known = set(schema.get('properties', ()))
+    if additional is False:
+        def check(instance, errors):
+            if isinstance(instance, dict):
+                for key in instance:
+                    if key not in known:
+                        errors.append(ValidationError(f"Additional property '{key}' is not allowed", [key]))
+        return check
+    sub = compiler.compile(additional)
+    if sub is _accept:
+        return None
+
+    def check(instance, errors):
+        if isinstance(instance, dict):
+            for key, value in instance.items():
+                if key not in known:
+                    _check_child(sub, value, key, errors)
+    return check
+
+
+def _compile_items(compiler, items, schema):
+    sub = compiler.compile(items)
+    if sub is _accept:
+        return None
+
+    def check(instance, errors):
+        if isinstance(instance, list):
+            for index, item in enumerate(instance):
+                _check_child(sub, item, index, errors)
+    return check
+
+
+def _bound(kind, test, describe):
+    """Build a factory for a numeric limit applied to values of ``kind``."""
+    def factory(compiler, limit, schema):
+        if not _is_number(limit):
+            compiler.error(f"limit must be a number, got {limit!r}")
+
+        def check(instance, errors):
+            if kind(instance) and not test(instance, limit):
+                errors.append(ValidationError(describe(instance, limit)))
+        return check
+    return factory
+
+
+def _compile_pattern(compiler, pattern, schema):
+    try:
+        regex = re.compile(pattern)
+    except (re.error, TypeError) as e:
+        compiler.error(f"invalid pattern {pattern!r} ({e})")
+
+    def check(instance, errors):
+        if isinstance(instance, str) and regex.search(instance) is None:
+            errors.append(ValidationError(f"String {instance!r} does not match pattern {pattern!r}"))
+    return check
+
+
+def _is_string(value):
+    return isinstance(value, str)
+
+
+def _is_array(value):
+    return isinstance(value, list)
+
+
+def _type_name(value) -> str:
+    for name in ('null', 'boolean', 'integer', 'number', 'string', 'array', 'object'):
+        if _TYPE_CHECKS[name](value):
+            return name
+    return type(value).__name__
+
+
+_KEYWORDS = [
+    # Keyword order only affects the order of collected errors; cheap,
+    # commonly failing checks go first.
+    ('$ref', _compile_ref),
+    ('type', _compile_type),
+    ('enum', _compile_enum),
+    ('const', _compile_const),
+    ('required', _compile_required),
+    ('minimum', _bound(_is_number, lambda v, n: v >= n, lambda v, n: f"{v!r} is less than the minimum of {n!r}")),
+    ('maximum', _bound(_is_number, lambda v, n: v <= n, lambda v, n: f"{v!r} is greater than the maximum of {n!r}")),
+    ('exclusiveMinimum', _bound(_is_number, lambda v, n: v > n,
+                                lambda v, n: f"{v!r} is less than or equal to the exclusive minimum of {n!r}")),
+    ('exclusiveMaximum', _bound(_is_number, lambda v, n: v < n,
+                                lambda v, n: f"{v!r} is greater than or equal to the exclusive maximum of {n!r}")),
+    ('minLength', _bound(_is_string, lambda v, n: len(v) >= n,
+                         lambda v, n: f"String is shorter than {n!r} characters")),
+    ('maxLength', _bound(_is_string, lambda v, n: len(v) <= n,
+                         lambda v, n: f"String is longer than {n!r} characters")),
+    ('pattern', _compile_pattern),
+    ('minItems', _bound(_is_array, lambda v, n: len(v) >= n, lambda v, n: f"Array has fewer than {n!r} items")),
+    ('maxItems', _bound(_is_array, lambda v, n: len(v) <= n, lambda v, n: f"Array has more than {n!r} items")),
+    ('properties', _compile_properties),
+    ('additionalProperties', _compile_additional_properties),
+    ('items', _compile_items),
+]
+
+
+class CompiledSchema:
+    """
+    A JSON Schema compiled into check closures.
+
+    Args:
+        schema (dict or bool): The JSON Schema.
+
+    Raises:
+        TypeError: If the schema is not a dictionary or a boolean.
+        ValueError: If the schema is invalid.
+    """
+
+    def __init__(self, schema: Union[Dict[str, Any], bool]):
+        self.schema = schema
+        self._check = _Compiler(schema).compile(schema)
+
+    def validate(self, json_data: Any) -> None:
+        """
+        Validate an instance, stopping at the first error.
+
+        Args:
+            json_data (Any): The parsed JSON data.
+
+        Raises:
+            ValidationError: If the instance does not match the schema.
+        """
+        self._check(json_data, _FAIL_FAST)
+
+    def errors(self, json_data: Any) -> List[ValidationError]:
+        """
+        Validate an instance and collect every error.
+
+        Args:
+            json_data (Any): The parsed JSON data.
+
+        Returns:
+            list: The validation errors, empty if the instance is valid.
+        """
+        errors = []
+        self._check(json_data, errors)
+        return errors
+
+    def is_valid(self, json_data: Any) -> bool:
+        """
+        Check whether an instance matches the schema.
+
+        Args:
+            json_data (Any): The parsed JSON data.
+
+        Returns:
+            bool: True if the instance is valid.
+        """
+        try:
+            self._check(json_data, _FAIL_FAST)
+        except ValidationError:
+            return False
+        return True
+
+
+_CACHE_SIZE = 256
+_by_identity = OrderedDict()
+_by_content = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _remember(cache, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def compile_schema(schema: Union[Dict[str, Any], bool]) -> CompiledSchema:
+    """
+    Compile a JSON Schema, reusing a cached result when possible.
+
+    Schemas are looked up first by identity, then by content, so both a
+    module-level schema constant and an equal schema rebuilt on every call
+    hit the cache. A schema must not be mutated after it has been compiled.
+
+    Args:
+        schema (dict or bool): The JSON Schema.
+
+    Returns:
+        CompiledSchema: The compiled schema.
+
+    Raises:
+        TypeError: If the schema is not a dictionary or a boolean.
+        ValueError: If the schema is invalid.
+    """
+    with _cache_lock:
+        entry = _by_identity.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            _by_identity.move_to_end(id(schema))
+            return entry[1]
+    try:
+        content = json.dumps(schema, sort_keys=True)
+    except (TypeError, ValueError):
+        content = None
+    with _cache_lock:
+        compiled = _by_content.get(content) if content is not None else None
+    if compiled is None:
+        compiled = CompiledSchema(schema)
+    with _cache_lock:
+        # The schema itself is kept in the entry so that its id() cannot be
+        # reused by another object while it is cached.
+        _remember(_by_identity, id(schema), (schema, compiled))
+        if content is not None:
+            _remember(_by_content, content, compiled)
+    return compiled
+
+
+@instrumented('validate', lambda result, json_data, schema: (None, None, length(json_data)))
+def validate_json(json_data: Any, schema: Union[Dict[str, Any], bool]) -> None:
+    """
+    Validate JSON data against a schema, stopping at the first error.
+
+    Args:
+        json_data (Any): The parsed JSON data.
+        schema (dict or bool): The JSON Schema.
+
+    Raises:
+        ValidationError: If the data does not match the schema.
+        ValueError: If the schema is invalid.
+    """
+    compile_schema(schema).validate(json_data)
+
+
+@instrumented('validate', lambda result, json_data, schema: (None, None, length(json_data)))
+def collect_validation_errors(json_data: Any, schema: Union[Dict[str, Any], bool]) -> List[ValidationError]:
+    """
+    Validate JSON data against a schema and return every error.
+
+    Args:
+        json_data (Any): The parsed JSON data.
+        schema (dict or bool): The JSON Schema.
+
+    Returns:
+        list: The validation errors, empty if the data is valid.
+
+    Raises:
+        ValueError: If the schema is invalid.
+    """
+    return compile_schema(schema).errors(json_data)
+
+
+# Compiled schema of a validate_many worker process, set by the initializer
+# so that the schema is sent to each worker only once.
+_worker_schema: Optional[CompiledSchema] = None
+
+
+def _init_worker(schema):
+    global _worker_schema
+    _worker_schema = compile_schema(schema)
+
+
+def _validate_chunk(compiled: CompiledSchema, start: int, records: List[Any], collect_all: bool):
+    """Validate a chunk of records and return the errors tagged with their index."""
+    failures = []
+    for index, record in enumerate(records, start):
+        if collect_all:
+            failures.extend((index, error) for error in compiled.errors(record))
+        else:
+            try:
+                compiled.validate(record)
+            except ValidationError as error:
+                failures.append((index, error))
+    return len(records), failures
+
+
+def _validate_chunk_in_worker(start, records, collect_all):
+    return _validate_chunk(_worker_schema, start, records, collect_all)
+
+
+class BatchValidation:
+    """
+    Iterator over the errors of a batch validation started by :func:`validate_many`.
+
+    Iterating yields ``(index, error)`` pairs in record order, where
+    ``index`` is the position of the record in the input. The counters are
+    updated as chunks complete and are final once iteration is exhausted.
+
+    Attributes:
+        total (int): Number of records validated so far.
+        invalid (int): Number of records with at least one error.
+        elapsed (float): Seconds spent so far.
+    """
+
+    def __init__(self, records: Iterable[Any], schema, workers: int, chunk_size: int, collect_all: bool):
+        self.total = 0
+        self.invalid = 0
+        self.elapsed = 0.0
+        self._results = self._run(records, schema, workers, chunk_size, collect_all)
+
+    @property
+    def valid(self) -> int:
+        """Number of records without errors."""
+        return self.total - self.invalid
+
+    def __iter__(self) -> Iterator[Tuple[int, ValidationError]]:
+        return self
+
+    def __next__(self) -> Tuple[int, ValidationError]:
+        return next(self._results)
+
+    def _run(self, records, schema, workers, chunk_size, collect_all):
+        start_time = time.perf_counter()
+        chunks = _chunked(records, chunk_size)
+        if workers <= 1:
+            compiled = compile_schema(schema)
+            results = (_validate_chunk(compiled, start, chunk, collect_all) for start, chunk in chunks)
+            yield from self._consume(results, start_time)
+            return
+        # Imported here: concurrent.futures.process pulls in multiprocessing,
+        # which would dominate the import time of this module.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema,)) as executor:
+            yield from self._consume(self._submit(executor, chunks, workers, collect_all), start_time)
+
+    @staticmethod
+    def _submit(executor, chunks, workers, collect_all):
+        # Only a bounded number of chunks is in flight, so a generator input
+        # is consumed no faster than results are handed back to the caller.
+        pending = deque()
+        for start, chunk in chunks:
+            pending.append(executor.submit(_validate_chunk_in_worker, start, chunk, collect_all))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def _consume(self, results, start_time):
+        for count, failures in results:
+            self.total += count
+            self.invalid += len({index for index, _ in failures})
+            self.elapsed = time.perf_counter() - start_time
+            yield from failures
+        self.elapsed = time.perf_counter() - start_time
+
+    def run(self) -> 'BatchValidation':
+        """
+        Validate all remaining records, discarding the errors.
+
+        Returns:
+            BatchValidation: This object, with final counters.
+        """
+        for _ in self:
+            pass
+        return self
+
+    def summary(self) -> str:
+        """
+        Describe the pass/fail counts in one line, e.g. for a CLI.
+
+        Returns:
+            str: The summary.
+        """
+        rate = self.total / self.elapsed if self.elapsed else 0.0
+        return (f"{self.total} records validated: {self.valid} valid, {self.invalid} invalid "
+                f"({self.elapsed:.2f} s, {rate:.0f} records/s)")
+
+
+def _chunked(records: Iterable[Any], chunk_size: int):
+    iterator = iter(records)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def validate_many(records: Iterable[Any], schema: Union[Dict[str, Any], bool], workers: Optional[int] = 1,
+                  chunk_size: int = 1000, collect_all: bool = False) -> BatchValidation:
+    """
+    Validate a stream of records against one schema, optionally in parallel.
+
+    Records are read from the iterable in chunks. With more than one worker
+    the schema is sent once to each worker process, which compiles it and
+    validates whole chunks; at most two chunks per worker are in flight, so
+    memory stays bounded even for an endless generator.
+
+    Args:
+        records (iterable): The parsed JSON records.
+        schema (dict or bool): The JSON Schema.
+        workers (int, optional): Number of worker processes; None uses one per CPU and
+            1 validates in the calling process. Defaults to 1.
+        chunk_size (int, optional): Number of records per chunk. Defaults to 1000.
+        collect_all (bool, optional): Whether to report every error of a record instead
+            of only the first. Defaults to False.
+
+    Returns:
+        BatchValidation: An iterator of ``(index, error)`` pairs with pass/fail counters.
+
+    Raises:
+        ValueError: If the schema is invalid or chunk_size is not positive.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    # Compile up front so that an invalid schema fails here, not in a worker.
+    compile_schema(schema)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return BatchValidation(records, schema, workers, chunk_size, collect_all)
@@ -0,0 +1,49 @@
+"""
+jsontool.exporters: Conversion of JSON data to other formats.
+
+This module provides streaming exporters that write JSON records to other
+file formats without loading the whole input into memory.
+
+The public names are imported lazily on first access, so that importing
+the package only loads the exporters that are actually used.
+"""
+
+import importlib
+
+# Avoids importing typing at startup; type checkers treat it like typing.TYPE_CHECKING.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from .json_to_csv import export_json_to_csv, infer_csv_columns
+    from .json_to_arrow import export_json_to_arrow
+    from .json_to_xml import XmlWriter, escape_tag_name, export_json_to_xml
+    from .json_to_yaml import export_json_to_yaml, get_yaml_dumper, write_json_to_yaml_string
+
+# Public name -> submodule defining it.
+_EXPORTS = {
+    "export_json_to_csv": "json_to_csv",
+    "infer_csv_columns": "json_to_csv",
+    "export_json_to_arrow": "json_to_arrow",
+    "XmlWriter": "json_to_xml",
+    "escape_tag_name": "json_to_xml",
+    "export_json_to_xml": "json_to_xml",
+    "export_json_to_yaml": "json_to_yaml",
+    "get_yaml_dumper": "json_to_yaml",
+    "write_json_to_yaml_string": "json_to_yaml",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    # Cache the value so that later lookups bypass __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
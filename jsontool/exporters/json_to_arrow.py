@@ -0,0 +1,263 @@
+"""
+Streaming conversion of JSON records to columnar Parquet or Feather files.
+
+Records are flattened like :mod:`jsontool.exporters.json_to_csv` does, except
+that arrays are kept as Arrow list columns by default. They are gathered
+into column lists of ``batch_size`` rows, each list is converted with a
+single ``pyarrow.array`` call, and the resulting record batch is written
+before the next one is built, so memory use is bounded by the batch size.
+
+The column types come from a sample of the records, a full first pass, or
+an explicit schema. When records disagree, types are promoted: integers
+and floats become floats, null columns take the type of their values, and
+anything else that cannot be unified becomes a string column holding the
+values as text. A file's schema cannot change once its first batch is
+written, so when a later batch does not fit the types of the sample, the
+types are widened with a pass over every record and the export starts
+over, provided the source can be read again.
+
+pyarrow is an optional dependency; it is only imported when an export runs.
+"""
+
+import contextlib
+import itertools
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from .json_to_csv import _Flattener, _iter_records
+from ..core.instrumentation import file_size, instrumented
+
+ARRAY_POLICIES = ('list', 'join', 'json', 'index', 'explode')
+FORMATS = ('parquet', 'feather')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow export requires pyarrow; install it with 'pip install pyarrow'.") from None
+    return pyarrow
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+class _SchemaMismatch(ValueError):
+    """A batch has values that do not fit the type of their column."""
+
+
+def _column_type(pa, values: List[Any]):
+    """Infer the Arrow type of a column, falling back to strings."""
+    try:
+        return pa.array(values).type
+    except (pa.ArrowException, OverflowError, TypeError, ValueError):
+        return pa.string()
+
+
+def _widen(pa, left, right):
+    """Return a type able to hold the values of both types."""
+    if left == right or pa.types.is_null(right):
+        return left
+    if pa.types.is_null(left):
+        return right
+    try:
+        unified = pa.unify_schemas([pa.schema([('c', left)]), pa.schema([('c', right)])],
+                                   promote_options='permissive')
+    except (pa.ArrowException, TypeError):
+        return pa.string()
+    return unified.field('c').type
+
+
+class _BatchBuilder:
+    """Gathers flattened rows into column lists and turns them into record batches."""
+
+    def __init__(self, pa, flattener: _Flattener, extra_columns: str):
+        self.pa = pa
+        self.flattener = flattener
+        self.extra_columns = extra_columns
+
+    def columns(self, records: Iterable[Any], names: Optional[Dict[str, None]] = None) -> Dict[str, List[Any]]:
+        """
+        Flatten records into ``{column: values}``. Columns first seen after
+        the first row are back-filled with nulls. With ``names``, only those
+        columns are kept (or an unknown one is an error).
+        """
+        columns = {} if names is None else {name: [] for name in names}
+        rows = 0
+        for number, record in enumerate(records):
+            for row in self.flattener.rows(record):
+                for name, value in row.items():
+                    column = columns.get(name)
+                    if column is None:
+                        if names is not None:
+                            if self.extra_columns == 'raise':
+                                raise ValueError(f"Record {number} of the batch has a column missing "
+                                                 f"from the schema: '{name}'.")
+                            continue
+                        column = columns[name] = [None] * rows
+                    column.append(value)
+                rows += 1
+                for column in columns.values():
+                    if len(column) < rows:
+                        column.append(None)
+        return columns
+
+    def infer_schema(self, columns: Dict[str, List[Any]], schema=None):
+        """Infer a schema from columns, widening the types of ``schema``."""
+        pa = self.pa
+        types = {field.name: field.type for field in schema} if schema is not None else {}
+        for name, values in columns.items():
+            inferred = _column_type(pa, values)
+            types[name] = _widen(pa, types[name], inferred) if name in types else inferred
+        return pa.schema(list(types.items()))
+
+    def batch(self, columns: Dict[str, List[Any]], schema, number: int):
+        pa = self.pa
+        length = len(next(iter(columns.values()), []))
+        arrays = []
+        for field in schema:
+            values = columns.get(field.name)
+            if values is None:
+                arrays.append(pa.nulls(length, field.type))
+                continue
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+                values = [_text(value) for value in values]
+            try:
+                arrays.append(pa.array(values, type=field.type))
+            except (pa.ArrowException, OverflowError, TypeError, ValueError) as e:
+                raise _SchemaMismatch(f"Batch {number}: column '{field.name}' does not match the schema "
+                                      f"type {field.type} ({e}). Use a re-iterable source, a larger "
+                                      f"sample_size or an explicit schema.") from None
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def scan(self, records: Iterable[Any], batch_size: int, schema=None):
+        """Infer a schema from every record, widening the types of ``schema``."""
+        while True:
+            chunk = list(itertools.islice(records, batch_size))
+            if not chunk:
+                return schema
+            schema = self.infer_schema(self.columns(chunk), schema)
+
+    def write(self, records: Iterable[Any], writer, schema, batch_size: int) -> int:
+        """Write records in batches of ``batch_size`` and return the number of rows."""
+        names = dict.fromkeys(schema.names)
+        count = 0
+        for number in itertools.count():
+            chunk = list(itertools.islice(records, batch_size))
+            if not chunk:
+                return count
+            batch = self.batch(self.columns(chunk, names), schema, number)
+            writer.write_batch(batch)
+            count += batch.num_rows
+
+
+def _open_writer(pa, file_path, schema, file_format: str, compression: Optional[str]):
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(file_path, schema, compression=compression or 'snappy')
+    if compression == 'uncompressed':
+        compression = None
+    elif compression is None:
+        compression = 'lz4'
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    return pa.ipc.new_file(file_path, schema, options=options)
+
+
+@instrumented('export', lambda result, source, file_path, *args, **kwargs: (file_size(source), file_size(file_path), result))
+def export_json_to_arrow(source, file_path, file_format: Optional[str] = None, schema=None,
+                         prefix: str = 'item', lines: bool = False, batch_size: int = 65536,
+                         sample_size: Optional[int] = None, two_pass: bool = False,
+                         extra_columns: str = 'ignore', separator: str = '.', arrays: str = 'list',
+                         array_policies: Optional[Dict[str, str]] = None, join_separator: str = ';',
+                         compression: Optional[str] = None) -> int:
+    """
+    Stream records into a Parquet or Feather (Arrow IPC) file.
+
+    Nested objects are flattened into dotted column names. Arrays follow a
+    policy: ``list`` keeps them as Arrow list columns, while ``join``,
+    ``json``, ``index`` and ``explode`` behave as in
+    :func:`jsontool.exporters.json_to_csv.export_json_to_csv`.
+
+    Args:
+        source (str or iterable): A JSON file holding the records at ``prefix``, a
+            JSON Lines file (with ``lines=True``) or an iterable of records.
+        file_path (str): The path to the output file.
+        file_format (str, optional): 'parquet' or 'feather'. Defaults to None (taken from
+            the file extension, '.feather' or '.arrow' for Feather and Parquet otherwise).
+        schema (pyarrow.Schema, optional): The output schema. Defaults to None (inferred).
+        prefix (str, optional): The path of the records inside a JSON file, see
+            :func:`jsontool.core.reader_writer.iter_json_file`. Defaults to 'item'.
+        lines (bool, optional): Whether the source file is in JSON Lines format. Defaults to False.
+        batch_size (int, optional): Number of records per record batch. Defaults to 65536.
+        sample_size (int, optional): Number of records used to infer the schema. Defaults to
+            None (the first batch).
+        two_pass (bool, optional): Infer the schema from every record by reading the source
+            twice. Defaults to False (infer it from a sample, and read the source again only
+            if a later batch does not fit).
+        extra_columns (str, optional): What to do with columns missing from the inferred or
+            given schema: 'ignore' or 'raise'. Defaults to 'ignore'.
+        separator (str, optional): Joins nested key names. Defaults to '.'.
+        arrays (str, optional): The default array policy. Defaults to 'list'.
+        array_policies (dict, optional): Array policies by flattened column name. Defaults to None.
+        join_separator (str, optional): Joins array elements with the 'join' policy. Defaults to ';'.
+        compression (str, optional): The codec, or 'uncompressed'. Defaults to None
+            ('snappy' for Parquet, 'lz4' for Feather).
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        FileNotFoundError: If the source file does not exist.
+        TypeError: If the source is neither a file path nor an iterable.
+        ValueError: If the source contains invalid JSON, an option is invalid, a later
+            batch does not fit the given schema or, for a source that cannot be read
+            again, the sample schema, or a record has an unknown column while
+            ``extra_columns`` is 'raise'.
+    """
+    pa = _require_pyarrow()
+    if file_format is None:
+        extension = os.path.splitext(os.fspath(file_path))[1].lower()
+        file_format = 'feather' if extension in ('.feather', '.arrow') else 'parquet'
+    if file_format not in FORMATS:
+        raise ValueError(f"Invalid file format '{file_format}'. Expected one of {FORMATS}.")
+    if extra_columns not in ('ignore', 'raise'):
+        raise ValueError(f"Invalid extra_columns policy '{extra_columns}'. Expected 'ignore' or 'raise'.")
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+    policies = {name: 'json' if policy == 'list' else policy for name, policy in (array_policies or {}).items()}
+    for policy in itertools.chain((arrays,), (array_policies or {}).values()):
+        if policy not in ARRAY_POLICIES:
+            raise ValueError(f"Invalid array policy '{policy}'. Expected one of {ARRAY_POLICIES}.")
+    flattener = _Flattener(separator, 'json' if arrays == 'list' else arrays, policies, join_separator)
+    builder = _BatchBuilder(pa, flattener, extra_columns)
+    records = _iter_records(source, prefix, lines)
+    rereadable = isinstance(source, (str, os.PathLike)) or iter(source) is not source
+    sampled = schema is None and not two_pass
+    pending = []
+    if schema is None:
+        if two_pass:
+            if not rereadable:
+                raise ValueError("Two-pass inference requires a file path or a re-iterable source.")
+            schema = builder.scan(records, batch_size)
+            records = _iter_records(source, prefix, lines)
+        else:
+            pending = list(itertools.islice(records, sample_size or batch_size))
+            schema = builder.infer_schema(builder.columns(pending))
+    records = itertools.chain(pending, records)
+    del pending
+    try:
+        with contextlib.closing(_open_writer(pa, file_path, schema, file_format, compression)) as writer:
+            return builder.write(records, writer, schema, batch_size)
+    except _SchemaMismatch:
+        if not (sampled and rereadable):
+            raise
+    # A later batch does not fit the types of the sample: widen them with
+    # every record and write the file again.
+    schema = builder.scan(_iter_records(source, prefix, lines), batch_size, schema)
+    with contextlib.closing(_open_writer(pa, file_path, schema, file_format, compression)) as writer:
+        return builder.write(_iter_records(source, prefix, lines), writer, schema, batch_size)
@@ -0,0 +1,216 @@
+"""
+Streaming conversion of JSON records to CSV.
+
+Records are read one at a time (from a JSON array with
+:func:`jsontool.core.reader_writer.iter_json_file`, from a JSON Lines file or
+from any iterable), flattened into dotted column names and written through a
+buffered ``csv.writer``. Only the inference sample is held in memory, so
+memory use does not grow with the size of the input.
+"""
+
+import csv
+import itertools
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ..core.instrumentation import file_size, instrumented
+from ..core.reader_writer import iter_json_file, read_jsonl
+
+ARRAY_POLICIES = ('join', 'json', 'index', 'explode')
+
+
+def _iter_records(source, prefix: str = 'item', lines: bool = False) -> Iterator[Any]:
+    """
+    Iterate over the records of a JSON file, a JSON Lines file or an iterable.
+
+    Args:
+        source (str or iterable): A file path or an iterable of records.
+        prefix (str, optional): The path of the records inside a JSON file, see
+            :func:`iter_json_file`. Defaults to 'item' (a top-level array).
+        lines (bool, optional): Whether a file is in JSON Lines format. Defaults to False.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if lines:
+            return read_jsonl(source)
+        return iter_json_file(source, prefix=prefix)
+    if isinstance(source, dict):
+        raise TypeError("Source must be a file path or an iterable of records.")
+    return iter(source)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ''
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class _Flattener:
+    """Turns a record into one or more flat ``{column: value}`` rows."""
+
+    def __init__(self, separator: str, arrays: str, array_policies: Optional[Dict[str, str]], join_separator: str):
+        for policy in itertools.chain((arrays,), (array_policies or {}).values()):
+            if policy not in ARRAY_POLICIES:
+                raise ValueError(f"Invalid array policy '{policy}'. Expected one of {ARRAY_POLICIES}.")
+        self.separator = separator
+        self.arrays = arrays
+        self.array_policies = array_policies or {}
+        self.join_separator = join_separator
+
+    def rows(self, record: Any) -> List[Dict[str, Any]]:
+        """
+        Flatten a record. An exploded array yields one row per element; several
+        exploded arrays in the same record yield their cartesian product.
+        """
+        rows = [{}]
+        if isinstance(record, dict):
+            self._flatten(record, '', rows)
+        else:
+            rows[0]['value'] = record
+        return rows
+
+    def _flatten(self, value: Any, name: str, rows: List[Dict[str, Any]]) -> None:
+        if isinstance(value, dict):
+            if not value and name:
+                for row in rows:
+                    row[name] = None
+            for key, child in value.items():
+                self._flatten(child, f"{name}{self.separator}{key}" if name else str(key), rows)
+        elif isinstance(value, list):
+            policy = self.array_policies.get(name, self.arrays)
+            if policy == 'json':
+                for row in rows:
+                    row[name] = value
+            elif policy == 'join':
+                joined = self.join_separator.join(_cell(item) for item in value)
+                for row in rows:
+                    row[name] = joined
+            elif policy == 'index':
+                for index, item in enumerate(value):
+                    self._flatten(item, f"{name}{self.separator}{index}", rows)
+            elif not value:
+                for row in rows:
+                    row[name] = None
+            else:
+                exploded = []
+                for row in rows:
+                    for item in value:
+                        copies = [dict(row)]
+                        self._flatten(item, name, copies)
+                        exploded.extend(copies)
+                rows[:] = exploded
+        else:
+            for row in rows:
+                row[name] = value
+
+
+def infer_csv_columns(records: Iterable[Any], separator: str = '.', arrays: str = 'join',
+                      array_policies: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Collect the flattened column names of records, in first-seen order.
+
+    Args:
+        records (iterable): The records to scan.
+        separator (str, optional): Joins nested key names. Defaults to '.'.
+        arrays (str, optional): The default array policy, see :func:`export_json_to_csv`.
+            Defaults to 'join'.
+        array_policies (dict, optional): Array policies by flattened column name.
+
+    Returns:
+        list: The column names.
+    """
+    flattener = _Flattener(separator, arrays, array_policies, ';')
+    columns = {}
+    for record in records:
+        for row in flattener.rows(record):
+            columns.update(dict.fromkeys(row))
+    return list(columns)
+
+
+@instrumented('export', lambda result, source, csv_path, *args, **kwargs: (file_size(source), file_size(csv_path), result))
+def export_json_to_csv(source, csv_path, columns: Optional[List[str]] = None, prefix: str = 'item',
+                       lines: bool = False, sample_size: int = 1000, two_pass: bool = False,
+                       extra_columns: str = 'ignore', separator: str = '.', arrays: str = 'join',
+                       array_policies: Optional[Dict[str, str]] = None, join_separator: str = ';',
+                       delimiter: str = ',', buffer_size: int = 1 << 20) -> int:
+    """
+    Stream records into a CSV file, flattening nested objects into dotted column names.
+
+    The columns are taken from ``columns`` if given, otherwise inferred from
+    the first ``sample_size`` records or, with ``two_pass``, from a full scan
+    of the source before the rows are written. Nested arrays are handled
+    according to a policy:
+
+    - ``join``: scalars joined with ``join_separator`` into one cell.
+    - ``json``: the array encoded as JSON in one cell.
+    - ``index``: one column per position (``tags.0``, ``tags.1``...).
+    - ``explode``: one row per element, repeating the other columns.
+
+    Args:
+        source (str or iterable): A JSON file holding the records at ``prefix``, a
+            JSON Lines file (with ``lines=True``) or an iterable of records.
+        csv_path (str): The path to the output CSV file.
+        columns (list, optional): The columns to write, in order. Defaults to None (inferred).
+        prefix (str, optional): The path of the records inside a JSON file, see
+            :func:`jsontool.core.reader_writer.iter_json_file`. Defaults to 'item'.
+        lines (bool, optional): Whether the source file is in JSON Lines format. Defaults to False.
+        sample_size (int, optional): Number of records used to infer the columns. Defaults to 1000.
+        two_pass (bool, optional): Infer the columns from every record by reading the
+            source twice. Defaults to False.
+        extra_columns (str, optional): What to do with columns missing from the inferred or
+            given set: 'ignore' or 'raise'. Defaults to 'ignore'.
+        separator (str, optional): Joins nested key names. Defaults to '.'.
+        arrays (str, optional): The default array policy. Defaults to 'join'.
+        array_policies (dict, optional): Array policies by flattened column name, overriding
+            ``arrays``. Defaults to None.
+        join_separator (str, optional): Joins array elements with the 'join' policy. Defaults to ';'.
+        delimiter (str, optional): The CSV field delimiter. Defaults to ','.
+        buffer_size (int, optional): Size of the output buffer in bytes. Defaults to 1 MiB.
+
+    Returns:
+        int: The number of rows written, excluding the header.
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+        TypeError: If the source is neither a file path nor an iterable.
+        ValueError: If the source contains invalid JSON, a policy is invalid, ``two_pass``
+            is used with a one-shot iterator, or a record has an unknown column while
+            ``extra_columns`` is 'raise'.
+    """
+    if extra_columns not in ('ignore', 'raise'):
+        raise ValueError(f"Invalid extra_columns policy '{extra_columns}'. Expected 'ignore' or 'raise'.")
+    if sample_size < 1:
+        raise ValueError("Sample size must be at least 1.")
+    flattener = _Flattener(separator, arrays, array_policies, join_separator)
+    records = _iter_records(source, prefix, lines)
+    sample = []
+    if columns is None:
+        if two_pass:
+            if not isinstance(source, (str, os.PathLike)) and iter(source) is source:
+                raise ValueError("Two-pass inference requires a file path or a re-iterable source.")
+            columns = infer_csv_columns(records, separator, arrays, array_policies)
+            records = _iter_records(source, prefix, lines)
+        else:
+            sample = list(itertools.islice(records, sample_size))
+            columns = infer_csv_columns(sample, separator, arrays, array_policies)
+    known = frozenset(columns)
+    count = 0
+    with open(csv_path, 'w', encoding='utf-8', newline='', buffering=buffer_size) as file:
+        writer = csv.writer(file, delimiter=delimiter)
+        writer.writerow(columns)
+        for number, record in enumerate(itertools.chain(sample, records)):
+            for row in flattener.rows(record):
+                if extra_columns == 'raise' and not known.issuperset(row):
+                    unknown = [name for name in row if name not in known]
+                    raise ValueError(f"Record {number} has columns missing from the CSV header: {unknown}.")
+                writer.writerow([_cell(row.get(name)) for name in columns])
+                count += 1
+    return count
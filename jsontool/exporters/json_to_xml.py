@@ -0,0 +1,344 @@
+"""
+Streaming conversion of JSON records to XML.
+
+:class:`XmlWriter` is an event-driven writer: elements are opened, filled and
+closed one event at a time, and the escaped markup is buffered and written
+in chunks to a file, a binary or text stream, or a socket. No element tree
+is built, so exporting an array of any length with
+:func:`export_json_to_xml` only keeps the current record and one output
+chunk in memory.
+"""
+
+import io
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from .json_to_csv import _iter_records
+from ..core.instrumentation import file_size, instrumented
+
+_NAME = re.compile(r'[^\W\d][\w.\-]*')
+_NAME_CHAR = re.compile(r'[^\w.\-]')
+# Characters that XML 1.0 cannot represent, even as character references.
+_INVALID_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+_DECLARATION = '<?xml version="1.0" encoding="{encoding}"?>\n'
+
+
+def _escape_text(text: str) -> str:
+    if _INVALID_CHARS.search(text):
+        text = _INVALID_CHARS.sub('\ufffd', text)
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _escape_attribute(text: str) -> str:
+    return (_escape_text(text).replace('"', '&quot;')
+            .replace('\n', '&#10;').replace('\r', '&#13;').replace('\t', '&#9;'))
+
+
+@lru_cache(maxsize=4096)
+def escape_tag_name(name: str, replacement: str = '_') -> str:
+    """
+    Turn any string into a valid XML element name.
+
+    Characters that are not allowed in a name are replaced, and a name that
+    does not start with a letter or an underscore is prefixed with the
+    replacement.
+
+    Args:
+        name (str): The name to escape.
+        replacement (str, optional): Replaces invalid characters. Defaults to '_'.
+
+    Returns:
+        str: The valid name, unchanged if it already was valid.
+    """
+    if _NAME.fullmatch(name):
+        return name
+    escaped = _NAME_CHAR.sub(replacement, name)
+    if not _NAME.fullmatch(escaped):
+        escaped = replacement + escaped
+    return escaped
+
+
+class XmlWriter:
+    """
+    Write XML incrementally from start/text/end events.
+
+    Args:
+        output (str, file or socket): A file path, a binary or text stream, or any
+            object with a ``sendall`` method such as a socket.
+        encoding (str, optional): The output encoding. Defaults to 'utf-8'.
+        chunk_size (int, optional): Number of characters buffered before they are
+            written. Defaults to 65536.
+        declaration (bool, optional): Whether to start with an XML declaration.
+            Defaults to True.
+
+    Raises:
+        TypeError: If the output is not a path, a stream or a socket.
+    """
+
+    def __init__(self, output, encoding: str = 'utf-8', chunk_size: int = 65536, declaration: bool = True):
+        self._owned = None
+        self._text_output = False
+        if isinstance(output, (str, os.PathLike)):
+            self._owned = open(output, 'wb')
+            self._sink = self._owned.write
+        elif hasattr(output, 'sendall'):
+            self._sink = output.sendall
+        elif hasattr(output, 'write'):
+            self._sink = output.write
+            self._text_output = isinstance(output, io.TextIOBase)
+        else:
+            raise TypeError("Output must be a file path, a stream or a socket.")
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+        self._stack = []
+        self._closed = False
+        if declaration:
+            self._write(_DECLARATION.format(encoding=encoding))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._release()
+
+    def _write(self, markup: str) -> None:
+        self._parts.append(markup)
+        self._size += len(markup)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def _tag(self, tag: str, attributes: Optional[Dict[str, Any]]) -> str:
+        if not attributes:
+            return tag
+        return tag + ''.join(f' {name}="{_escape_attribute(_scalar_text(value))}"'
+                             for name, value in attributes.items())
+
+    def start(self, tag: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Open an element.
+
+        Args:
+            tag (str): The element name, which must already be a valid XML name.
+            attributes (dict, optional): Attribute names and scalar values. Defaults to None.
+        """
+        self._write(f'<{self._tag(tag, attributes)}>')
+        self._stack.append(tag)
+
+    def text(self, text: str) -> None:
+        """Write escaped character data into the current element."""
+        if text:
+            self._write(_escape_text(text))
+
+    def end(self) -> None:
+        """
+        Close the most recently opened element.
+
+        Raises:
+            ValueError: If no element is open.
+        """
+        if not self._stack:
+            raise ValueError("No open element to close.")
+        self._write(f'</{self._stack.pop()}>')
+
+    def element(self, tag: str, text: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Write a complete element holding only text, as a single event."""
+        tag_and_attributes = self._tag(tag, attributes)
+        if text:
+            self._write(f'<{tag_and_attributes}>{_escape_text(text)}</{tag}>')
+        else:
+            self._write(f'<{tag_and_attributes}/>')
+
+    def raw(self, markup: str) -> None:
+        """Write markup as it is, e.g. whitespace between elements."""
+        self._write(markup)
+
+    @property
+    def depth(self) -> int:
+        """The number of open elements."""
+        return len(self._stack)
+
+    def flush(self) -> None:
+        """Write the buffered markup to the output."""
+        if not self._parts:
+            return
+        markup = ''.join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        self._sink(markup if self._text_output else markup.encode(self.encoding, 'xmlcharrefreplace'))
+
+    def close(self) -> None:
+        """
+        Close every open element, flush the buffer and close a file opened by the writer.
+        """
+        if self._closed:
+            return
+        while self._stack:
+            self.end()
+        self.flush()
+        self._release()
+
+    def _release(self) -> None:
+        self._closed = True
+        if self._owned is not None:
+            self._owned.close()
+
+
+def _scalar_text(value: Any) -> str:
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return ''
+    return str(value)
+
+
+class _XmlMapper:
+    """Emits the events for JSON values according to the mapping options."""
+
+    def __init__(self, writer: XmlWriter, item: str, arrays: str, attribute_prefix: Optional[str],
+                 text_key: Optional[str], invalid_names: str, replacement: str):
+        self.writer = writer
+        self.item = item
+        self.arrays = arrays
+        self.attribute_prefix = attribute_prefix
+        self.text_key = text_key
+        self.invalid_names = invalid_names
+        self.replacement = replacement
+
+    def name(self, key: str) -> str:
+        key = str(key)
+        if self.invalid_names == 'raise' and not _NAME.fullmatch(key):
+            raise ValueError(f"Key '{key}' is not a valid XML element name.")
+        return escape_tag_name(key, self.replacement)
+
+    def value(self, tag: str, value: Any) -> None:
+        writer = self.writer
+        if isinstance(value, dict):
+            attributes, text, children = self.split(value)
+            if not children and text is None:
+                writer.element(tag, None, attributes)
+                return
+            writer.start(tag, attributes)
+            if text is not None:
+                writer.text(_scalar_text(text))
+            for key, child in children:
+                self.member(self.name(key), child)
+            writer.end()
+        elif isinstance(value, list):
+            writer.start(tag)
+            for element in value:
+                self.value(self.item, element)
+            writer.end()
+        else:
+            writer.element(tag, _scalar_text(value))
+
+    def member(self, tag: str, value: Any) -> None:
+        if isinstance(value, list) and self.arrays == 'repeat':
+            for element in value:
+                if isinstance(element, list):
+                    # Nested arrays cannot be repeated unambiguously.
+                    self.value(tag, {self.item: element})
+                else:
+                    self.value(tag, element)
+        else:
+            self.value(tag, value)
+
+    def split(self, value: Dict[str, Any]):
+        """Separate the attributes, the text and the child members of an object."""
+        prefix, text_key = self.attribute_prefix, self.text_key
+        if not prefix and text_key is None:
+            return None, None, value.items()
+        attributes, text, children = None, None, []
+        for key, child in value.items():
+            if key == text_key:
+                if isinstance(child, (dict, list)):
+                    raise ValueError(f"The value of '{key}' is element text and must not be an object or an array.")
+                text = child
+            elif prefix and isinstance(key, str) and key.startswith(prefix) and not isinstance(child, (dict, list)):
+                if attributes is None:
+                    attributes, keys = {}, {}
+                name = self.name(key[len(prefix):])
+                if name in attributes:
+                    raise ValueError(f"Keys '{keys[name]}' and '{key}' are both written as the attribute '{name}'.")
+                attributes[name] = child
+                keys[name] = key
+            else:
+                children.append((key, child))
+        return attributes, text, children
+
+
+@instrumented('export', lambda result, source, output, *args, **kwargs: (file_size(source), file_size(output), result))
+def export_json_to_xml(source, output, root: str = 'root', item: str = 'item', prefix: str = 'item',
+                       lines: bool = False, arrays: str = 'repeat', attribute_prefix: Optional[str] = '@',
+                       text_key: Optional[str] = '#text', invalid_names: str = 'escape',
+                       replacement: str = '_', encoding: str = 'utf-8', chunk_size: int = 65536,
+                       declaration: bool = True) -> int:
+    """
+    Stream records into an XML document, one ``item`` element per record under ``root``.
+
+    Objects become elements whose children are named after the keys. Keys
+    starting with ``attribute_prefix`` and holding a scalar become attributes
+    and the value under ``text_key`` becomes the element text. Arrays inside
+    objects are written according to ``arrays``:
+
+    - ``repeat``: one element named after the key per array element.
+    - ``wrap``: one element named after the key, holding an ``item`` element per array element.
+
+    Keys that are not valid XML names are escaped with :func:`escape_tag_name`
+    or, with ``invalid_names='raise'``, rejected.
+
+    Args:
+        source (str or iterable): A JSON file holding the records at ``prefix``, a
+            JSON Lines file (with ``lines=True``) or an iterable of records.
+        output (str, file or socket): A file path, a binary or text stream, or a socket.
+        root (str, optional): The root element name. Defaults to 'root'.
+        item (str, optional): The element name of records and array elements. Defaults to 'item'.
+        prefix (str, optional): The path of the records inside a JSON file, see
+            :func:`jsontool.core.reader_writer.iter_json_file`. Defaults to 'item'.
+        lines (bool, optional): Whether the source file is in JSON Lines format. Defaults to False.
+        arrays (str, optional): 'repeat' or 'wrap'. Defaults to 'repeat'.
+        attribute_prefix (str, optional): Marks keys written as attributes, or None to write
+            every key as an element. Defaults to '@'.
+        text_key (str, optional): The key holding the element text, or None. Defaults to '#text'.
+        invalid_names (str, optional): 'escape' or 'raise'. Defaults to 'escape'.
+        replacement (str, optional): Replaces invalid characters in names. Defaults to '_'.
+        encoding (str, optional): The output encoding. Defaults to 'utf-8'.
+        chunk_size (int, optional): Number of characters buffered before a write. Defaults to 65536.
+        declaration (bool, optional): Whether to write an XML declaration. Defaults to True.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+        TypeError: If the source or the output has an unsupported type.
+        ValueError: If the source contains invalid JSON, an option is invalid, a key is
+            not a valid XML name while ``invalid_names`` is 'raise', a ``text_key`` value is
+            an object or an array, or two keys of an object escape to the same attribute name.
+    """
+    if arrays not in ('repeat', 'wrap'):
+        raise ValueError(f"Invalid array mode '{arrays}'. Expected 'repeat' or 'wrap'.")
+    if invalid_names not in ('escape', 'raise'):
+        raise ValueError(f"Invalid invalid_names policy '{invalid_names}'. Expected 'escape' or 'raise'.")
+    for name in (root, item):
+        if not _NAME.fullmatch(name):
+            raise ValueError(f"'{name}' is not a valid XML element name.")
+    records = _iter_records(source, prefix, lines)
+    count = 0
+    with XmlWriter(output, encoding=encoding, chunk_size=chunk_size, declaration=declaration) as writer:
+        mapper = _XmlMapper(writer, item, arrays, attribute_prefix, text_key, invalid_names, replacement)
+        writer.start(root)
+        writer.raw('\n')
+        for record in records:
+            mapper.value(item, record)
+            writer.raw('\n')
+            count += 1
+    return count
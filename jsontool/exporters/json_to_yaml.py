@@ -0,0 +1,184 @@
+"""
+Conversion of JSON data to YAML.
+
+The libyaml C emitter (``yaml.CSafeDumper``) is used when PyYAML was built
+with it, and the pure-Python ``yaml.SafeDumper`` otherwise. Records from a
+large JSON array or JSON Lines file can be streamed either as one YAML
+document per record or as a single YAML sequence, without loading the input
+into memory.
+
+PyYAML is an optional dependency; it is only imported when an export runs.
+"""
+
+import os
+from typing import Any, Optional
+
+from .json_to_csv import _iter_records
+from ..core.instrumentation import file_size, instrumented, length, text_size
+
+EMITTERS = ('auto', 'c', 'python')
+# The largest width libyaml accepts; used to disable folding.
+_NO_FOLDING = 2 ** 31 - 1
+_DUMPERS = {}
+
+
+def _require_yaml():
+    try:
+        import yaml
+    except ImportError:
+        raise ImportError("YAML export requires PyYAML; install it with 'pip install pyyaml'.") from None
+    return yaml
+
+
+def get_yaml_dumper(emitter: str = 'auto'):
+    """
+    Return the PyYAML dumper class for an emitter.
+
+    The dumpers are safe dumpers that also accept subclasses of ``dict`` and
+    ``list``, such as the frozen containers of
+    :mod:`jsontool.core.persistent`.
+
+    Args:
+        emitter (str, optional): 'c' for the libyaml emitter, 'python' for the pure-Python
+            one, or 'auto' for the C emitter when available. Defaults to 'auto'.
+
+    Returns:
+        type: The dumper class.
+
+    Raises:
+        ImportError: If PyYAML is not installed.
+        ValueError: If the emitter is invalid, or is 'c' and libyaml is not available.
+    """
+    if emitter not in EMITTERS:
+        raise ValueError(f"Invalid YAML emitter '{emitter}'. Expected one of {EMITTERS}.")
+    dumper = _DUMPERS.get(emitter)
+    if dumper is not None:
+        return dumper
+    yaml = _require_yaml()
+    base = getattr(yaml, 'CSafeDumper', None)
+    if emitter == 'python' or (base is None and emitter == 'auto'):
+        base = yaml.SafeDumper
+    elif base is None:
+        raise ValueError("The libyaml C emitter is not available; reinstall PyYAML with libyaml.")
+    dumper = type(f'Json{base.__name__}', (base,), {})
+    # Exact types are looked up first, so plain dicts and lists do not pay for this.
+    dumper.add_multi_representer(dict, base.represent_dict)
+    dumper.add_multi_representer(list, base.represent_list)
+    _DUMPERS[emitter] = dumper
+    return dumper
+
+
+def _dump_options(indent: int, sort_keys: bool, width: Optional[int]):
+    return {
+        'default_flow_style': False,
+        'allow_unicode': True,
+        'sort_keys': sort_keys,
+        'indent': indent,
+        'width': width if width is not None else _NO_FOLDING,
+    }
+
+
+@instrumented('export', lambda result, data, *args, **kwargs: (None, text_size(result), length(data)))
+def write_json_to_yaml_string(data: Any, indent: int = 2, sort_keys: bool = False,
+                              width: Optional[int] = None, emitter: str = 'auto') -> str:
+    """
+    Serialize JSON data to a YAML document.
+
+    Args:
+        data (Any): The JSON data.
+        indent (int, optional): Number of spaces per nesting level. Defaults to 2.
+        sort_keys (bool, optional): Whether to sort object keys. Defaults to False.
+        width (int, optional): Line width at which long scalars are folded. Defaults to
+            None (no folding).
+        emitter (str, optional): 'auto', 'c' or 'python', see :func:`get_yaml_dumper`.
+            Defaults to 'auto'.
+
+    Returns:
+        str: The YAML document.
+
+    Raises:
+        ImportError: If PyYAML is not installed.
+        TypeError: If the data contains values that are not JSON types.
+    """
+    yaml = _require_yaml()
+    try:
+        return yaml.dump(data, Dumper=get_yaml_dumper(emitter), **_dump_options(indent, sort_keys, width))
+    except yaml.representer.RepresenterError as e:
+        raise TypeError(f"Data is not serializable to YAML: {e.args[-1]!r}.") from None
+
+
+@instrumented('export', lambda result, source, output, *args, **kwargs: (file_size(source), file_size(output), result))
+def export_json_to_yaml(source, output, prefix: str = 'item', lines: bool = False,
+                        multi_document: bool = True, indent: int = 2, sort_keys: bool = False,
+                        width: Optional[int] = None, emitter: str = 'auto',
+                        buffer_size: int = 1 << 20) -> int:
+    """
+    Stream records into YAML.
+
+    With ``multi_document``, every record is written as its own YAML document
+    (``--- ...``), which consumers can also read one at a time. Otherwise the
+    records are written as the items of a single top-level sequence. Either
+    way, records are read and emitted one at a time.
+
+    Args:
+        source (str or iterable): A JSON file holding the records at ``prefix``, a
+            JSON Lines file (with ``lines=True``) or an iterable of records.
+        output (str or file): A file path or a text stream.
+        prefix (str, optional): The path of the records inside a JSON file, see
+            :func:`jsontool.core.reader_writer.iter_json_file`. Defaults to 'item'.
+        lines (bool, optional): Whether the source file is in JSON Lines format. Defaults to False.
+        multi_document (bool, optional): One document per record instead of a single
+            sequence. Defaults to True.
+        indent (int, optional): Number of spaces per nesting level. Defaults to 2.
+        sort_keys (bool, optional): Whether to sort object keys. Defaults to False.
+        width (int, optional): Line width at which long scalars are folded. Defaults to
+            None (no folding).
+        emitter (str, optional): 'auto', 'c' or 'python', see :func:`get_yaml_dumper`.
+            Defaults to 'auto'.
+        buffer_size (int, optional): Size of the output file buffer in bytes. Defaults to 1 MiB.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        ImportError: If PyYAML is not installed.
+        FileNotFoundError: If the source file does not exist.
+        TypeError: If the source or the output has an unsupported type, or a record
+            contains values that are not JSON types.
+        ValueError: If the source contains invalid JSON or the emitter is invalid.
+    """
+    yaml = _require_yaml()
+    dumper = get_yaml_dumper(emitter)
+    options = _dump_options(indent, sort_keys, width)
+    records = _iter_records(source, prefix, lines)
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'w', encoding='utf-8', buffering=buffer_size) as stream:
+            return _emit(yaml, records, stream, dumper, options, multi_document)
+    if not hasattr(output, 'write'):
+        raise TypeError("Output must be a file path or a text stream.")
+    return _emit(yaml, records, output, dumper, options, multi_document)
+
+
+def _emit(yaml, records, stream, dumper, options, multi_document: bool) -> int:
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in records:
+            yield record
+            count += 1
+
+    try:
+        if multi_document:
+            # dump_all pulls the documents lazily and emits each one as it goes.
+            yaml.dump_all(counted(), stream, Dumper=dumper, explicit_start=True, **options)
+        else:
+            # The dump of a one-item list is a valid sequence entry, and
+            # consecutive entries form a single top-level sequence.
+            for record in counted():
+                yaml.dump([record], stream, Dumper=dumper, **options)
+            if count == 0:
+                stream.write('[]\n')
+    except yaml.representer.RepresenterError as e:
+        raise TypeError(f"Record {count} is not serializable to YAML: {e.args[-1]!r}.") from None
+    return count
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from jsontool.core import async_io, backends
+from jsontool.core.async_io import aread_json_from_file, aread_jsonl, awrite_json_to_file, awrite_jsonl, configure_async_io
+from jsontool.core.backends import JsonBackend, register_backend
+from jsontool.core.reader_writer import read_json_from_file, read_jsonl, write_json_to_file
+
+DOCUMENT = {"name": "é\n", "items": [1, 2.5, None, True, {"a": []}], "empty": {}, "nested": {"b": [[{}]]}}
+
+
+class TestAsyncIo(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.options = dict(async_io._options)
+
+    def tearDown(self):
+        configure_async_io(**self.options)
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def write(self, name, text):
+        with open(self.path(name), 'w', encoding='utf-8') as file:
+            file.write(text)
+        return self.path(name)
+
+    async def test_read_inline_and_offloaded(self):
+        path = self.write('data.json', json.dumps(DOCUMENT))
+        self.assertEqual(await aread_json_from_file(path), DOCUMENT)
+        configure_async_io(offload_threshold=0)
+        self.assertEqual(await aread_json_from_file(path, backend='stdlib'), read_json_from_file(path))
+        calls = []
+        register_backend(JsonBackend('recording', lambda document: calls.append(document) or json.loads(document)))
+        self.addCleanup(backends._BACKENDS.pop, 'recording')
+        for threshold in (1 << 20, 0):
+            configure_async_io(offload_threshold=threshold)
+            self.assertEqual(await aread_json_from_file(path, backend='recording'), DOCUMENT)
+        self.assertEqual(len(calls), 2)
+
+    async def test_read_and_write_in_chunks(self):
+        path = self.write('data.json', json.dumps(DOCUMENT, ensure_ascii=False))
+        with mock.patch.object(async_io, '_CHUNK_SIZE', 4):
+            for threshold in (1 << 20, 0):
+                configure_async_io(offload_threshold=threshold)
+                self.assertEqual(await aread_json_from_file(path), DOCUMENT)
+            for indent in (None, 2):
+                write_json_to_file(DOCUMENT, self.path('sync.json'), indent=indent)
+                await awrite_json_to_file(DOCUMENT, self.path('async.json'), indent=indent)
+                with open(self.path('sync.json'), encoding='utf-8') as expected, \
+                        open(self.path('async.json'), encoding='utf-8') as written:
+                    self.assertEqual(written.read(), expected.read())
+
+    async def test_read_errors(self):
+        bad = self.write('bad.json', '{"a": [1, }')
+        for threshold in (1 << 20, 0):
+            configure_async_io(offload_threshold=threshold)
+            with self.assertRaises(ValueError) as expected:
+                read_json_from_file(bad)
+            with self.assertRaises(ValueError) as raised:
+                await aread_json_from_file(bad)
+            self.assertEqual(str(raised.exception), str(expected.exception))
+            with self.assertRaises(FileNotFoundError):
+                await aread_json_from_file(self.path('missing.json'))
+        with self.assertRaises(ValueError):
+            await aread_json_from_file(bad, backend='missing')
+
+    async def test_process_pool_executor(self):
+        path = self.write('data.json', json.dumps(DOCUMENT))
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            configure_async_io(executor=executor, offload_threshold=0)
+            self.assertEqual(await aread_json_from_file(path), DOCUMENT)
+
+    async def test_event_loop_runs_during_offloaded_parse(self):
+        path = self.write('large.json', json.dumps([{"id": i, "values": [i, str(i)]} for i in range(200000)]))
+        configure_async_io(offload_threshold=0)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        data = await aread_json_from_file(path, backend='stdlib')
+        ticker.cancel()
+        self.assertEqual(len(data), 200000)
+        self.assertGreater(ticks, 2)
+
+    async def test_write_matches_write_json_to_file(self):
+        for data in (DOCUMENT, [DOCUMENT, [], {}], {1: "non-string key"}, []):
+            for indent in (None, 0, 2):
+                with self.subTest(data=data, indent=indent):
+                    write_json_to_file(data, self.path('sync.json'), indent=indent)
+                    await awrite_json_to_file(data, self.path('async.json'), indent=indent)
+                    with open(self.path('sync.json'), encoding='utf-8') as expected, \
+                            open(self.path('async.json'), encoding='utf-8') as written:
+                        self.assertEqual(written.read(), expected.read())
+
+    async def test_write_errors(self):
+        with self.assertRaises(TypeError):
+            await awrite_json_to_file("text", self.path('out.json'))
+        with self.assertRaises(ValueError):
+            await awrite_json_to_file([1, {2, 3}], self.path('out.json'))
+        self.assertFalse(os.path.exists(self.path('out.json')))
+        with self.assertRaises(OSError):
+            await awrite_json_to_file([], self.path('missing/out.json'))
+
+    async def test_jsonl_round_trip(self):
+        async def records():
+            for i in range(2500):
+                yield {"id": i}
+
+        path = self.path('data.jsonl')
+        self.assertEqual(await awrite_jsonl(records(), path, batch_size=100), 2500)
+        self.assertEqual([record async for record in aread_jsonl(path, batch_bytes=256)], list(read_jsonl(path)))
+        self.assertEqual(await awrite_jsonl([[1], [2]], path), 2)
+        self.assertEqual([record async for record in aread_jsonl(path)], [[1], [2]])
+        with self.assertRaisesRegex(ValueError, "record 2"):
+            await awrite_jsonl([1, object()], path)
+
+    async def test_jsonl_errors(self):
+        path = self.write('bad.jsonl', '{"a": 1}\n\nnot json\n[2]\n')
+        errors = []
+        self.assertEqual([r async for r in aread_jsonl(path, on_error='collect', errors=errors, batch_bytes=4)],
+                         [{"a": 1}, [2]])
+        expected = []
+        list(read_jsonl(path, on_error='collect', errors=expected))
+        self.assertEqual(errors, expected)
+        records = []
+        with self.assertRaisesRegex(ValueError, "line 3 of the file"):
+            async for record in aread_jsonl(path):
+                records.append(record)
+        self.assertEqual(records, [{"a": 1}])
+        with open(path, 'wb') as file:
+            file.write(b'[1]\r\n"\xff"\n[3]\n')
+        errors = []
+        self.assertEqual([r async for r in aread_jsonl(path, on_error='collect', errors=errors)], [[1], [3]])
+        self.assertEqual([line for line, _ in errors], [2])
+        with self.assertRaises(FileNotFoundError):
+            [r async for r in aread_jsonl(self.path('missing.jsonl'))]
+        with self.assertRaises(TypeError):
+            [r async for r in aread_jsonl(path, on_error='collect')]
+
+    async def test_concurrency_cap(self):
+        path = self.write('data.json', '[1]')
+        configure_async_io(max_concurrency=2)
+        active = peak = 0
+        lock = threading.Lock()
+        file_size = async_io._file_size
+
+        def slow_file_size(file_path):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return file_size(file_path)
+
+        with mock.patch.object(async_io, '_file_size', slow_file_size):
+            results = await asyncio.gather(*(aread_json_from_file(path) for _ in range(8)))
+        self.assertEqual(results, [[1]] * 8)
+        self.assertEqual(peak, 2)
+
+    def test_configure_validation(self):
+        with self.assertRaises(ValueError):
+            configure_async_io(max_concurrency=0)
+        with self.assertRaises(ValueError):
+            configure_async_io(offload_threshold=-1)
+        with self.assertRaises(TypeError):
+            configure_async_io(executor=object())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import json
+import os
+from jsontool.core import backends
+from jsontool.core.backends import JsonBackend, available_backends, get_backend, register_backend, set_default_backend
+from jsontool.core.reader_writer import read_json_from_string
+from jsontool.core.reader_writer import read_json_from_file
+from jsontool.core.reader_writer import write_json_to_string
+from jsontool.core.reader_writer import write_json_to_file
+
+
+DOCUMENTS = [
+    '{"name": "Alice", "age": 25, "tags": ["a", "b"], "ok": true, "none": null}',
+    '[1, -2, 3.5, 0.1, 1e16, 1.5e-07, 123456789012345678901234567890]',
+    '{"message": "Привет, мир! \\u00e9 \\ud83d\\ude00 \\"quoted\\" \\\\ /"}',
+    '{"nested": {"deep": [[[{"x": []}]]], "empty": {}}}',
+    '{"nan": NaN, "inf": Infinity}',
+    '{"dup": 1, "dup": 2}',
+]
+
+INVALID_DOCUMENTS = [
+    '{"name": "Alice", "age": 25',
+    '{"name": "Alice" age: 25}',
+    '[1, 2,]',
+    '{"a": tru}',
+]
+
+SERIALIZABLE = [
+    {"name": "Alice", "age": 30, "city": "New York"},
+    [1, 2.5, "three", None, True, False, [], {}],
+    {"message": "Привет, мир!", "emoji": "😀", "nested": {"list": [{"a": [1, 2]}]}},
+    {"floats": [1e16, 1.5e-07, 0.1, -0.0], "big": 2 ** 70},
+    {1: "int key", "tuple": (1, 2)},
+    {"a, b": "c: d", "e": ",\n  ", "f": '\\",\\"', "g\t": [[], {}, [{}], {"h": []}]},
+    [{'1-"': 'a"\\', ": k": None, "": -2.5}],
+    {"nan": float("nan"), "inf": [float("inf"), (None, float("-inf"))], "null": None},
+]
+
+
+class TestBackendConformance(unittest.TestCase):
+    """Every registered backend must behave exactly like the stdlib."""
+
+    def test_read_matches_stdlib(self):
+        for name in available_backends():
+            for document in DOCUMENTS:
+                with self.subTest(backend=name, document=document):
+                    expected = read_json_from_string(document, backend='stdlib')
+                    result = read_json_from_string(document, backend=name)
+                    self.assertEqual(json.dumps(result), json.dumps(expected))
+
+    def test_read_errors_match_stdlib(self):
+        for name in available_backends():
+            for document in INVALID_DOCUMENTS:
+                with self.subTest(backend=name, document=document):
+                    with self.assertRaises(ValueError) as expected:
+                        read_json_from_string(document, backend='stdlib')
+                    with self.assertRaises(ValueError) as context:
+                        read_json_from_string(document, backend=name)
+                    self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_write_matches_stdlib(self):
+        for name in available_backends():
+            for data in SERIALIZABLE:
+                for indent in (None, 2, 4):
+                    with self.subTest(backend=name, data=data, indent=indent):
+                        expected = write_json_to_string(data, indent=indent, backend='stdlib')
+                        self.assertEqual(write_json_to_string(data, indent=indent, backend=name), expected)
+
+    def test_write_deep_nesting_matches_stdlib(self):
+        data = []
+        for depth in range(160):
+            data = [depth, {"key": data}] if depth % 2 else [data]
+        expected = write_json_to_string(data, backend='stdlib')
+        if 'orjson' in available_backends():
+            # Deep enough for the largest indentation width, yet within orjson's limit.
+            self.assertEqual(backends._orjson_dumps(data, None), expected)
+        for name in available_backends():
+            with self.subTest(backend=name):
+                self.assertEqual(write_json_to_string(data, backend=name), expected)
+
+    def test_write_errors_match_stdlib(self):
+        data = {"name": "Alice", "func": lambda x: x}
+        for name in available_backends():
+            for indent in (None, 2):
+                with self.subTest(backend=name, indent=indent):
+                    with self.assertRaises(ValueError):
+                        write_json_to_string(data, indent=indent, backend=name)
+
+    def test_file_round_trip(self):
+        path = 'test_backend.json'
+        try:
+            for name in available_backends():
+                with self.subTest(backend=name):
+                    write_json_to_file(SERIALIZABLE[2], path, indent=2, backend=name)
+                    self.assertEqual(read_json_from_file(path, backend=name), SERIALIZABLE[2])
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class TestBackendRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        set_default_backend('auto')
+
+    def test_stdlib_always_available(self):
+        self.assertIn('stdlib', available_backends())
+
+    def test_auto_picks_fastest(self):
+        self.assertEqual(get_backend('auto').name, available_backends()[0])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_backend('nope')
+        with self.assertRaises(ValueError):
+            set_default_backend('nope')
+
+    def test_set_default_backend(self):
+        calls = []
+
+        def loads(document):
+            calls.append(document)
+            return json.loads(document)
+
+        register_backend(JsonBackend('recording', loads))
+        self.addCleanup(backends._BACKENDS.pop, 'recording')
+        set_default_backend('recording')
+        self.assertEqual(read_json_from_string('[1]'), [1])
+        self.assertEqual(calls, ['[1]'])
+
+    def test_register_requires_backend(self):
+        with self.assertRaises(TypeError):
+            register_backend(json)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from jsontool.core import cache as cache_module
+from jsontool.core.cache import JsonCache, estimate_size
+from jsontool.core.persistent import FrozenDict
+from jsontool.core.reader_writer import read_json_from_file
+
+
+class TestJsonCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = self.write('config.json', '{"a": [1, 2], "b": {"c": "d"}}')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def test_hits_share_one_frozen_value(self):
+        cache = JsonCache()
+        first = read_json_from_file(self.path, cache=cache)
+        second = cache.get(self.path)
+        self.assertIs(first, second)
+        self.assertIsInstance(first, FrozenDict)
+        self.assertEqual(first, {"a": [1, 2], "b": {"c": "d"}})
+        with self.assertRaises(TypeError):
+            first["a"].append(3)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1,
+                                         'size': estimate_size(first)})
+
+    def test_copies_are_independent(self):
+        cache = JsonCache(copy=True)
+        first = cache.get(self.path)
+        first["a"].append(3)
+        second = cache.get(self.path)
+        self.assertEqual(second, {"a": [1, 2], "b": {"c": "d"}})
+        self.assertIs(type(second), dict)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_changed_file_is_parsed_again(self):
+        cache = JsonCache()
+        cache.get(self.path)
+        self.write('config.json', '{"a": [3, 4], "b": {"c": "e"}}')
+        self.assertEqual(cache.get(self.path), {"a": [3, 4], "b": {"c": "e"}})
+        replacement = self.write('other.json', '[1]')
+        os.replace(replacement, self.path)
+        self.assertEqual(cache.get(self.path), [1])
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 3, 1))
+
+    def test_recent_files_are_verified_by_content(self):
+        cache = JsonCache()
+        # Simulate timestamps too coarse to tell two writes apart.
+        with mock.patch.object(cache_module, '_signature', lambda stat: (stat.st_size,)):
+            self.assertEqual(cache.get(self.path)["b"], {"c": "d"})
+            self.assertEqual(cache.get(self.path)["b"], {"c": "d"})
+            self.write('config.json', '{"a": [1, 2], "b": {"c": "x"}}')
+            self.assertEqual(cache.get(self.path)["b"], {"c": "x"})
+            with mock.patch.object(cache_module, '_RACY_WINDOW_NS', 0):
+                cache.get(self.path)
+                self.assertIsNone(cache._entries[os.path.abspath(self.path)].digest)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_eviction_by_estimated_size(self):
+        paths = [self.write(f'{i}.json', f'{{"values": {list(range(100))}}}') for i in range(3)]
+        entry_size = estimate_size(JsonCache().get(paths[0]))
+        cache = JsonCache(max_bytes=2 * entry_size)
+        for path in paths[:2]:
+            cache.get(path)
+        cache.get(paths[0])
+        cache.get(paths[2])
+        self.assertEqual((len(cache), cache.evictions, cache.size), (2, 1, 2 * entry_size))
+        cache.get(paths[0])
+        self.assertEqual(cache.hits, 2)
+        small = JsonCache(max_bytes=entry_size - 1)
+        small.get(paths[0])
+        self.assertEqual((len(small), small.evictions), (0, 0))
+
+    def test_errors(self):
+        cache = JsonCache()
+        cache.get(self.path)
+        os.remove(self.path)
+        with self.assertRaises(FileNotFoundError):
+            cache.get(self.path)
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(FileNotFoundError):
+            cache.get(self.directory)
+        with self.assertRaisesRegex(ValueError, "Invalid JSON in the file '.*bad.json'"):
+            cache.get(self.write('bad.json', '{"a": '))
+        with self.assertRaises(ValueError):
+            JsonCache(max_bytes=-1)
+
+    def test_invalidate(self):
+        cache = JsonCache()
+        other = self.write('other.json', '[]')
+        cache.get(self.path)
+        cache.get(other)
+        cache.invalidate(self.path)
+        self.assertEqual(len(cache), 1)
+        cache.invalidate()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_concurrent_reads(self):
+        cache = JsonCache()
+        paths = [self.write(f'{i}.json', f'[{i}]') for i in range(4)]
+        errors = []
+
+        def read():
+            try:
+                for i in range(200):
+                    self.assertEqual(cache.get(paths[i % 4]), [i % 4])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.hits + cache.misses, 1600)
+        self.assertEqual(len(cache), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
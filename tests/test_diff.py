@@ -0,0 +1,131 @@
+import copy
+import json
+import random
+import unittest
+from unittest import mock
+from jsontool.core import diff
+from jsontool.core.diff import diff_json
+from jsontool.core.modifier import apply_operations
+
+
+def random_value(rng, depth=0):
+    choice = rng.random()
+    if depth < 3 and choice < 0.3:
+        return {rng.choice('ab/~c'): random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+    if depth < 3 and choice < 0.6:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 6))]
+    return rng.choice([0, 1, 1.0, 2.5, False, True, None, "x", "y", {"id": rng.randint(0, 3)}])
+
+
+def mutate(rng, value):
+    value = copy.deepcopy(value)
+    if isinstance(value, list):
+        for _ in range(rng.randint(0, 3)):
+            choice = rng.random()
+            if choice < 0.3 and value:
+                del value[rng.randrange(len(value))]
+            elif choice < 0.6:
+                value.insert(rng.randint(0, len(value)), random_value(rng, 2))
+            elif value:
+                index = rng.randrange(len(value))
+                value[index] = mutate(rng, value[index])
+    elif isinstance(value, dict):
+        for key in list(value):
+            choice = rng.random()
+            if choice < 0.2:
+                del value[key]
+            elif choice < 0.5:
+                value[key] = mutate(rng, value[key])
+        if rng.random() < 0.3:
+            value[rng.choice('abdz')] = random_value(rng, 2)
+    elif rng.random() < 0.5:
+        value = random_value(rng, 2)
+    return value
+
+
+class TestDiffJson(unittest.TestCase):
+
+    def assertPatches(self, old, new, array_key=None):
+        patch = diff_json(old, new, array_key=array_key)
+        result = apply_operations(copy.deepcopy(old), copy.deepcopy(patch))
+        # Unlike ==, the JSON text tells true, 1 and 1.0 apart.
+        self.assertEqual(json.dumps(result, sort_keys=True), json.dumps(new, sort_keys=True))
+        return patch
+
+    def test_objects(self):
+        old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "e/f": 1, "g~": 2}
+        new = {"a": 1, "b": {"c": [1, 2], "d": "y"}, "g~": 3, "h": None}
+        self.assertEqual(self.assertPatches(old, new), [
+            {"op": "replace", "path": "/b/d", "value": "y"},
+            {"op": "remove", "path": "/e~1f"},
+            {"op": "replace", "path": "/g~0", "value": 3},
+            {"op": "add", "path": "/h", "value": None},
+        ])
+        self.assertEqual(diff_json(old, copy.deepcopy(old)), [])
+
+    def test_scalar_types_differ(self):
+        self.assertEqual(self.assertPatches({"a": 1, "b": 1}, {"a": True, "b": 2}),
+                         [{"op": "replace", "path": "/a", "value": True}, {"op": "replace", "path": "/b", "value": 2}])
+        # Equal under == as a whole.
+        self.assertEqual(self.assertPatches({"a": 1}, {"a": True}), [{"op": "replace", "path": "/a", "value": True}])
+        self.assertEqual(self.assertPatches([1, 2], [True, 2]), [{"op": "replace", "path": "/0", "value": True}])
+        self.assertEqual(self.assertPatches({"a": [{"b": [0, 1.0]}], "c": 1}, {"c": 1, "a": [{"b": [False, 1]}]}),
+                         [{"op": "replace", "path": "/a/0/b/0", "value": False},
+                          {"op": "replace", "path": "/a/0/b/1", "value": 1}])
+        self.assertEqual(self.assertPatches([1.0, 2], [1, 3]),
+                         [{"op": "replace", "path": "/0", "value": 1}, {"op": "replace", "path": "/1", "value": 3}])
+        self.assertEqual(self.assertPatches({"a": 1, "b": [1.0, "x"]}, {"b": [1, "x"], "a": 1}),
+                         [{"op": "replace", "path": "/b/0", "value": 1}])
+        self.assertEqual(self.assertPatches([{"id": 1, "v": [1]}, 0], [{"id": 1, "v": [1.0]}, 0], array_key="id"),
+                         [{"op": "replace", "path": "/0/v/0", "value": 1.0}])
+        self.assertEqual(diff_json({"a": 1}, [1]), [{"op": "replace", "path": "", "value": [1]}])
+
+    def test_arrays_are_aligned(self):
+        old = list(range(1000))
+        new = [-1] + old[:500] + old[501:] + [1000]
+        self.assertEqual(self.assertPatches(old, new), [
+            {"op": "add", "path": "/0", "value": -1},
+            {"op": "remove", "path": "/501"},
+            {"op": "add", "path": "/1000", "value": 1000},
+        ])
+        self.assertEqual(self.assertPatches([1, {"a": [1]}, 3], [1, {"a": [1, 2]}, 3]),
+                         [{"op": "add", "path": "/1/a/1", "value": 2}])
+
+    def test_array_key(self):
+        old = [{"id": i, "name": f"user-{i}"} for i in range(5)]
+        new = copy.deepcopy(old[1:3]) + [{"id": 9, "name": "new"}] + copy.deepcopy(old[3:])
+        new[0]["name"] = "renamed"
+        new[1], new[2] = new[2], new[1]
+        patch = self.assertPatches(old, new, array_key="id")
+        self.assertEqual(patch[:2], [{"op": "remove", "path": "/0"},
+                                     {"op": "replace", "path": "/0/name", "value": "renamed"}])
+        by_content = self.assertPatches(old, new)
+        self.assertGreater(len(by_content), len(patch))
+        self.assertPatches([{"id": 1}, 2, {"id": True}], [{"id": True}, 2, {"x": 1}], array_key="id")
+
+    def test_alignment_limit(self):
+        old = list(range(20))
+        new = list(range(20, 0, -1))
+        with mock.patch.object(diff, '_MAX_EDIT_DISTANCE', 2):
+            patch = self.assertPatches(old, new)
+        # Every element but the middle one is replaced in place.
+        self.assertEqual(len(patch), 19)
+        self.assertTrue(all(op["op"] == "replace" for op in patch))
+        self.assertPatches(old, new)
+
+    def test_random_documents(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            old = {"root": random_value(rng)}
+            new = mutate(rng, old) if rng.random() < 0.8 else {"root": random_value(rng)}
+            for array_key in (None, "id"):
+                with self.subTest(old=old, new=new, array_key=array_key):
+                    self.assertPatches(old, new, array_key)
+
+    def test_root_replacement_cannot_be_applied(self):
+        with self.assertRaises(ValueError):
+            apply_operations({"a": 1}, diff_json({"a": 1}, [1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
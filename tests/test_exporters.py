@@ -0,0 +1,295 @@
+import csv
+import io
+import json
+import os
+import socket
+import unittest
+import xml.etree.ElementTree as ElementTree
+from jsontool.exporters.json_to_arrow import export_json_to_arrow
+from jsontool.exporters.json_to_csv import export_json_to_csv, infer_csv_columns
+from jsontool.exporters.json_to_xml import XmlWriter, escape_tag_name, export_json_to_xml
+from jsontool.exporters.json_to_yaml import export_json_to_yaml, get_yaml_dumper, write_json_to_yaml_string
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+class TestExportJsonToCsv(unittest.TestCase):
+
+    def setUp(self):
+        self.json_path = 'test_export.json'
+        self.csv_path = 'test_export.csv'
+        self.records = [
+            {"id": 1, "user": {"name": "Alice", "address": {"city": "Paris"}}, "tags": ["a", "b"], "active": True},
+            {"id": 2, "user": {"name": "Bob, Jr."}, "tags": [], "active": False, "score": None},
+        ]
+        with open(self.json_path, 'w', encoding='utf-8') as file:
+            json.dump({"data": {"records": self.records}}, file)
+
+    def tearDown(self):
+        for path in (self.json_path, self.csv_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read_csv(self):
+        with open(self.csv_path, encoding='utf-8', newline='') as file:
+            return list(csv.reader(file))
+
+    def test_flattens_nested_records_from_file(self):
+        count = export_json_to_csv(self.json_path, self.csv_path, prefix='data.records.item')
+        self.assertEqual(count, 2)
+        self.assertEqual(self.read_csv(), [
+            ["id", "user.name", "user.address.city", "tags", "active", "score"],
+            ["1", "Alice", "Paris", "a;b", "true", ""],
+            ["2", "Bob, Jr.", "", "", "false", ""],
+        ])
+
+    def test_jsonl_source(self):
+        with open(self.json_path, 'w', encoding='utf-8') as file:
+            file.writelines(json.dumps(record) + '\n' for record in self.records)
+        self.assertEqual(export_json_to_csv(self.json_path, self.csv_path, lines=True, columns=["id"]), 2)
+        self.assertEqual(self.read_csv(), [["id"], ["1"], ["2"]])
+
+    def test_array_policies(self):
+        records = [{"id": 1, "items": [{"sku": "x", "qty": 1}, {"sku": "y", "qty": 2}], "tags": ["a", "b"]}]
+        export_json_to_csv(records, self.csv_path, arrays='explode', array_policies={"tags": "json"})
+        self.assertEqual(self.read_csv(), [
+            ["id", "items.sku", "items.qty", "tags"],
+            ["1", "x", "1", '["a", "b"]'],
+            ["1", "y", "2", '["a", "b"]'],
+        ])
+        export_json_to_csv(records, self.csv_path, arrays='index', join_separator='|', array_policies={"tags": "join"})
+        self.assertEqual(self.read_csv(), [
+            ["id", "items.0.sku", "items.0.qty", "items.1.sku", "items.1.qty", "tags"],
+            ["1", "x", "1", "y", "2", "a|b"],
+        ])
+
+    def test_explode_multiple_arrays(self):
+        count = export_json_to_csv([{"a": [1, 2], "b": ["x", "y"]}], self.csv_path, arrays='explode')
+        self.assertEqual(count, 4)
+        self.assertEqual(self.read_csv()[1:], [["1", "x"], ["1", "y"], ["2", "x"], ["2", "y"]])
+
+    def test_sample_inference_and_extra_columns(self):
+        records = [{"a": 1}, {"a": 2, "b": 3}]
+        export_json_to_csv(records, self.csv_path, sample_size=1)
+        self.assertEqual(self.read_csv(), [["a"], ["1"], ["2"]])
+        export_json_to_csv(records, self.csv_path, two_pass=True)
+        self.assertEqual(self.read_csv(), [["a", "b"], ["1", ""], ["2", "3"]])
+        with self.assertRaises(ValueError):
+            export_json_to_csv(records, self.csv_path, sample_size=1, extra_columns='raise')
+
+    def test_two_pass_rejects_iterators(self):
+        with self.assertRaises(ValueError):
+            export_json_to_csv(iter([{"a": 1}]), self.csv_path, two_pass=True)
+
+    def test_scalar_records_and_invalid_arguments(self):
+        export_json_to_csv([1, "x"], self.csv_path)
+        self.assertEqual(self.read_csv(), [["value"], ["1"], ["x"]])
+        with self.assertRaises(ValueError):
+            export_json_to_csv([], self.csv_path, arrays='flatten')
+        with self.assertRaises(TypeError):
+            export_json_to_csv({"a": 1}, self.csv_path)
+        with self.assertRaises(FileNotFoundError):
+            export_json_to_csv('missing.json', self.csv_path)
+
+    def test_infer_csv_columns(self):
+        self.assertEqual(infer_csv_columns(self.records, separator='/'),
+                         ["id", "user/name", "user/address/city", "tags", "active", "score"])
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestExportJsonToArrow(unittest.TestCase):
+
+    def setUp(self):
+        self.path = 'test_export.parquet'
+        self.records = [
+            {"id": 1, "user": {"name": "Alice"}, "score": 1, "tags": [1, 2]},
+            {"id": 2, "user": {"name": "Bob"}, "score": 2.5, "tags": [], "note": None},
+            {"id": 3, "user": {}, "score": "n/a", "tags": [0.5], "big": 2 ** 70},
+        ]
+
+    def tearDown(self):
+        for path in (self.path, 'test_export.feather'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read(self, path=None):
+        path = path or self.path
+        if path.endswith('.feather'):
+            return pyarrow.ipc.open_file(path).read_all()
+        return pyarrow.parquet.read_table(path)
+
+    def test_parquet_batches_and_type_promotion(self):
+        self.assertEqual(export_json_to_arrow(self.records[:2], self.path, batch_size=1, sample_size=2), 2)
+        table = self.read()
+        self.assertEqual(table.schema.names, ["id", "user.name", "score", "tags", "note"])
+        self.assertEqual(table.schema.field("score").type, pyarrow.float64())
+        self.assertEqual(table.schema.field("tags").type.value_type, pyarrow.int64())
+        self.assertEqual(table.column("score").to_pylist(), [1.0, 2.5])
+
+    def test_two_pass_widens_to_string(self):
+        with open('test_export.json', 'w', encoding='utf-8') as file:
+            json.dump(self.records, file)
+        try:
+            export_json_to_arrow('test_export.json', 'test_export.feather', batch_size=1, two_pass=True)
+        finally:
+            os.remove('test_export.json')
+        table = self.read('test_export.feather')
+        self.assertEqual(table.column("score").to_pylist(), ["1", "2.5", "n/a"])
+        self.assertEqual(table.column("tags").to_pylist(), [[1.0, 2.0], [], [0.5]])
+        self.assertEqual(table.column("big").to_pylist(), [None, None, str(2 ** 70)])
+
+    def test_later_batch_outside_the_sample_schema(self):
+        export_json_to_arrow(self.records, 'test_export.feather', two_pass=True)
+        self.assertEqual(export_json_to_arrow(self.records, self.path, batch_size=2), 3)
+        self.assertEqual(self.read(), self.read('test_export.feather'))
+        self.assertEqual(self.read().column("score").to_pylist(), ["1", "2.5", "n/a"])
+        ints_then_floats = [{"n": None}, {"n": 1}, {"n": 2.5}]
+        export_json_to_arrow(ints_then_floats, self.path, batch_size=1)
+        self.assertEqual(self.read().column("n").to_pylist(), [None, 1.0, 2.5])
+        with self.assertRaisesRegex(ValueError, "re-iterable source"):
+            export_json_to_arrow(iter(self.records), self.path, batch_size=2)
+        schema = pyarrow.schema([("id", pyarrow.int64()), ("score", pyarrow.string())])
+        self.assertEqual(export_json_to_arrow(self.records, self.path, schema=schema, batch_size=2), 3)
+        self.assertEqual(self.read().to_pylist()[2], {"id": 3, "score": "n/a"})
+        with self.assertRaises(ValueError):
+            export_json_to_arrow(self.records, self.path, schema=schema, extra_columns='raise')
+
+    def test_array_policies(self):
+        export_json_to_arrow([{"id": 1, "tags": ["a", "b"]}], self.path, arrays='explode')
+        self.assertEqual(self.read().to_pylist(), [{"id": 1, "tags": "a"}, {"id": 1, "tags": "b"}])
+        with self.assertRaises(ValueError):
+            export_json_to_arrow([], self.path, arrays='flatten')
+        with self.assertRaises(ValueError):
+            export_json_to_arrow([], self.path, file_format='orc')
+
+
+class TestExportJsonToXml(unittest.TestCase):
+
+    def export(self, records, **kwargs):
+        output = io.BytesIO()
+        count = export_json_to_xml(records, output, declaration=False, **kwargs)
+        return count, output.getvalue().decode('utf-8')
+
+    def test_records_attributes_and_text(self):
+        count, xml = self.export([{"@id": 1, "name": "A & <B>", "note": {"@lang": "en", "#text": "hi"}, "ok": True}])
+        self.assertEqual(count, 1)
+        self.assertEqual(xml, '<root>\n<item id="1"><name>A &amp; &lt;B&gt;</name>'
+                              '<note lang="en">hi</note><ok>true</ok></item>\n</root>')
+
+    def test_array_modes(self):
+        record = {"tags": ["a", "b"], "empty": None}
+        self.assertIn('<tags>a</tags><tags>b</tags><empty/>', self.export([record])[1])
+        wrapped = self.export([record], arrays='wrap', item='row')[1]
+        self.assertIn('<row><tags><row>a</row><row>b</row></tags>', wrapped)
+
+    def test_invalid_names_and_characters(self):
+        xml = self.export([{"1st key": 1, "a:b": "x\x00y"}], attribute_prefix=None)[1]
+        root = ElementTree.fromstring(xml)
+        self.assertEqual(root[0][0].tag, "_1st_key")
+        self.assertEqual(root[0][1].text, "x\ufffdy")
+        with self.assertRaises(ValueError):
+            self.export([{"1st": 1}], invalid_names='raise')
+        self.assertEqual(escape_tag_name("order-id"), "order-id")
+        self.assertEqual(escape_tag_name("", "x"), "x")
+
+    def test_ambiguous_attributes_and_text(self):
+        with self.assertRaisesRegex(ValueError, "'@a b' and '@a_b'"):
+            self.export([{"@a b": 1, "@a_b": 2}])
+        for text in ({"a": 1}, [1]):
+            with self.assertRaisesRegex(ValueError, "#text"):
+                self.export([{"note": {"#text": text}}])
+        self.assertIn('<item a_b="1"><a_b>2</a_b></item>', self.export([{"@a b": 1, "a_b": 2}])[1])
+
+    def test_output_targets(self):
+        json_path, xml_path = 'test_export.json', 'test_export.xml'
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump({"rows": [{"id": i, "name": "é"} for i in range(100)]}, file)
+        try:
+            self.assertEqual(export_json_to_xml(json_path, xml_path, prefix='rows.item', chunk_size=64), 100)
+            root = ElementTree.parse(xml_path).getroot()
+            self.assertEqual([row.find('id').text for row in root][-1], "99")
+        finally:
+            for path in (json_path, xml_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        text = io.StringIO()
+        export_json_to_xml([1], text, declaration=False)
+        self.assertEqual(text.getvalue(), '<root>\n<item>1</item>\n</root>')
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            export_json_to_xml([{"a": 1}], sender, declaration=False)
+            sender.shutdown(socket.SHUT_WR)
+            self.assertEqual(receiver.makefile('rb').read(), b'<root>\n<item><a>1</a></item>\n</root>')
+        with self.assertRaises(TypeError):
+            export_json_to_xml([], 42)
+
+    def test_writer_events(self):
+        output = io.BytesIO()
+        with XmlWriter(output, encoding='ascii', declaration=False) as writer:
+            writer.start('doc', {'title': 'a "b"'})
+            writer.element('p', 'café')
+            writer.start('open')
+            self.assertEqual(writer.depth, 2)
+        self.assertEqual(output.getvalue(), b'<doc title="a &quot;b&quot;"><p>caf&#233;</p><open></open></doc>')
+        with self.assertRaises(ValueError):
+            XmlWriter(io.BytesIO()).end()
+
+
+@unittest.skipIf(yaml is None, "PyYAML is not installed")
+class TestExportJsonToYaml(unittest.TestCase):
+
+    records = [{"id": 1, "name": "Zoë", "tags": ["a", "b"], "meta": {"ok": True, "note": None}}, [], "text: with colon"]
+
+    def emitters(self):
+        return ('python', 'c') if hasattr(yaml, 'CSafeDumper') else ('python',)
+
+    def test_write_json_to_yaml_string(self):
+        for emitter in self.emitters():
+            with self.subTest(emitter=emitter):
+                text = write_json_to_yaml_string(self.records[0], emitter=emitter)
+                self.assertEqual(text, "id: 1\nname: Zoë\ntags:\n- a\n- b\nmeta:\n  ok: true\n  note: null\n")
+        with self.assertRaises(TypeError):
+            write_json_to_yaml_string({"a": object()})
+        with self.assertRaises(ValueError):
+            get_yaml_dumper('rust')
+
+    def test_multi_document_stream(self):
+        for emitter in self.emitters():
+            with self.subTest(emitter=emitter):
+                output = io.StringIO()
+                self.assertEqual(export_json_to_yaml(iter(self.records), output, emitter=emitter), 3)
+                self.assertTrue(output.getvalue().startswith("---\nid: 1\n"))
+                self.assertEqual(list(yaml.safe_load_all(output.getvalue())), self.records)
+
+    def test_single_sequence_from_jsonl(self):
+        path, out = 'test_export.jsonl', 'test_export.yaml'
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(json.dumps(record) + '\n' for record in self.records)
+        try:
+            self.assertEqual(export_json_to_yaml(path, out, lines=True, multi_document=False), 3)
+            with open(out, encoding='utf-8') as file:
+                self.assertEqual(yaml.safe_load(file), self.records)
+            export_json_to_yaml([], out, multi_document=False)
+            with open(out, encoding='utf-8') as file:
+                self.assertEqual(yaml.safe_load(file), [])
+        finally:
+            for name in (path, out):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    def test_frozen_containers(self):
+        from jsontool.core.persistent import freeze
+        self.assertEqual(write_json_to_yaml_string(freeze({"a": [1]})), "a:\n- 1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
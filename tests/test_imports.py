@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import unittest
+import jsontool
+import jsontool.core
+import jsontool.exporters
+
+
+def loaded_modules(code):
+    """Return the jsontool modules loaded after running code in a fresh interpreter."""
+    script = f"import sys\n{code}\nprint(' '.join(sorted(m for m in sys.modules if m.startswith('jsontool'))))"
+    return subprocess.check_output([sys.executable, "-c", script], text=True).split()
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_loads_no_submodules(self):
+        self.assertEqual(loaded_modules("import jsontool"), ["jsontool"])
+        self.assertEqual(loaded_modules("import jsontool.core"), ["jsontool", "jsontool.core"])
+
+    def test_first_use_loads_only_the_defining_module(self):
+        modules = loaded_modules("import jsontool; jsontool.read_json_from_string('[]')")
+        self.assertIn("jsontool.core.reader_writer", modules)
+        for module in ("jsontool.core.validator", "jsontool.core.navigator", "jsontool.exporters.json_to_csv"):
+            self.assertNotIn(module, modules)
+
+    def test_process_pools_are_imported_on_use(self):
+        script = ("import sys, jsontool.core.reader_writer, jsontool.core.validator\n"
+                  "print('multiprocessing' in sys.modules)")
+        self.assertEqual(subprocess.check_output([sys.executable, "-c", script], text=True).strip(), "False")
+
+    def test_public_names_resolve(self):
+        for package in (jsontool.core, jsontool.exporters):
+            for name in package.__all__:
+                with self.subTest(name=name):
+                    self.assertIs(getattr(jsontool, name), getattr(package, name))
+                    self.assertIn(name, dir(jsontool))
+        self.assertIs(jsontool.core.JsonPath, jsontool.core.navigator.JsonPath)
+
+    def test_unknown_names(self):
+        with self.assertRaises(AttributeError):
+            jsontool.core.missing_function
+        with self.assertRaises(AttributeError):
+            jsontool.missing_function
+        with self.assertRaises(ImportError):
+            exec("from jsontool.exporters import missing_function", {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import shutil
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from jsontool.core import instrumentation
+from jsontool.core.instrumentation import MetricsAggregator, add_hook, instrument, remove_hook
+from jsontool.core.modifier import apply_operations
+from jsontool.core.reader_writer import (iter_json_file, read_json_from_file, read_json_from_string, read_jsonl,
+                                         write_json_to_file, write_json_to_string, write_jsonl)
+from jsontool.core.validator import validate_json
+from jsontool.exporters.json_to_csv import export_json_to_csv
+from jsontool.exporters.json_to_xml import export_json_to_xml
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.events = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_disabled_by_default(self):
+        self.assertEqual(instrumentation._hooks, ())
+        self.assertEqual(read_json_from_string('[1]'), [1])
+        self.assertEqual(read_json_from_string.__name__, 'read_json_from_string')
+        self.assertIn('Parse a JSON string', read_json_from_string.__doc__)
+
+    def test_events_of_reader_writer(self):
+        with instrument(self.events.append):
+            read_json_from_string('{"é": [1, 2]}')
+            text = write_json_to_string([1, 2, 3])
+            write_json_to_file({"a": 1, "b": 2}, self.path('data.json'))
+            read_json_from_file(self.path('data.json'))
+        read_json_from_string('[]')
+        self.assertEqual([(e.operation, e.function, e.bytes_in, e.bytes_out, e.items, e.error) for e in self.events], [
+            ('parse', 'read_json_from_string', 14, None, 1, None),
+            ('serialize', 'write_json_to_string', None, len(text), 3, None),
+            ('serialize', 'write_json_to_file', None, os.path.getsize(self.path('data.json')), 2, None),
+            ('parse', 'read_json_from_file', os.path.getsize(self.path('data.json')), None, 2, None),
+        ])
+        self.assertTrue(all(e.seconds >= 0 and e.memory_peak is None for e in self.events))
+
+    def test_errors_are_reported(self):
+        with instrument(self.events.append):
+            with self.assertRaises(ValueError):
+                read_json_from_string('{')
+            with self.assertRaises(KeyError):
+                apply_operations({}, [{"op": "remove", "path": "/missing"}])
+        self.assertEqual([(e.function, e.error, e.items) for e in self.events],
+                         [('read_json_from_string', 'ValueError', None), ('apply_operations', 'KeyError', None)])
+
+    def test_iterators_count_items(self):
+        write_jsonl(({"id": i} for i in range(5)), self.path('data.jsonl'))
+        write_json_to_file([1, 2, 3], self.path('data.json'))
+        with instrument(self.events.append):
+            self.assertEqual(len(list(read_jsonl(self.path('data.jsonl')))), 5)
+            records = iter_json_file(self.path('data.json'))
+            next(records)
+            records.close()
+            with self.assertRaises(FileNotFoundError):
+                list(read_jsonl(self.path('missing.jsonl')))
+        self.assertEqual([(e.function, e.items, e.bytes_in, e.error) for e in self.events], [
+            ('read_jsonl', 5, os.path.getsize(self.path('data.jsonl')), None),
+            ('iter_json_file', 1, os.path.getsize(self.path('data.json')), None),
+            ('read_jsonl', 0, None, 'FileNotFoundError'),
+        ])
+
+    def test_modifier_validator_and_exporters(self):
+        write_jsonl([{"a": 1}, {"a": 2}], self.path('data.jsonl'))
+        with instrument(self.events.append):
+            apply_operations({}, [{"op": "add", "path": "/a", "value": 1}, {"op": "add", "path": "/b", "value": 2}])
+            validate_json({"a": 1}, {"type": "object"})
+            export_json_to_csv(self.path('data.jsonl'), self.path('data.csv'), lines=True)
+            export_json_to_xml([{"a": 1}], self.path('data.xml'))
+        self.assertEqual([(e.operation, e.function, e.items) for e in self.events], [
+            ('modify', 'apply_operations', 2),
+            ('validate', 'validate_json', 1),
+            ('parse', 'read_jsonl', 2),
+            ('export', 'export_json_to_csv', 2),
+            ('export', 'export_json_to_xml', 1),
+        ])
+        csv_event, xml_event = self.events[3:]
+        self.assertEqual((csv_event.bytes_in, csv_event.bytes_out),
+                         (os.path.getsize(self.path('data.jsonl')), os.path.getsize(self.path('data.csv'))))
+        self.assertEqual((xml_event.bytes_in, xml_event.bytes_out), (None, os.path.getsize(self.path('data.xml'))))
+
+    def test_memory_peaks_of_nested_operations(self):
+        write_jsonl([{"values": list(range(1000))}] * 20, self.path('data.jsonl'))
+        self.assertFalse(tracemalloc.is_tracing())
+        with instrument(self.events.append, trace_memory=True):
+            self.assertTrue(tracemalloc.is_tracing())
+            read_json_from_string('[' + ','.join(['"x"'] * 100000) + ']')
+            export_json_to_csv(self.path('data.jsonl'), self.path('data.csv'), lines=True)
+        self.assertFalse(tracemalloc.is_tracing())
+        parse, jsonl, export = self.events
+        self.assertGreater(parse.memory_peak, 800000)
+        self.assertGreater(jsonl.memory_peak, 0)
+        self.assertGreaterEqual(export.memory_peak, jsonl.memory_peak)
+
+    def test_aggregator(self):
+        with instrument() as metrics:
+            for text in ('[1, 2]', '[3]', '{'):
+                try:
+                    read_json_from_string(text)
+                except ValueError:
+                    pass
+            write_json_to_string({"a": 'b"c'})
+        totals = metrics.snapshot()
+        self.assertEqual(list(totals), [('parse', 'read_json_from_string'), ('serialize', 'write_json_to_string')])
+        parse = totals[('parse', 'read_json_from_string')]
+        self.assertEqual((parse['count'], parse['errors'], parse['bytes_in'], parse['items'], parse['memory_peak']),
+                         (3, 1, 9, 3, None))
+        self.assertGreaterEqual(parse['seconds'], parse['max_seconds'])
+        summary = metrics.summary().splitlines()
+        self.assertEqual(len(summary), 3)
+        self.assertEqual(summary[1].split()[:4], ['parse', 'read_json_from_string', '3', '1'])
+        text = metrics.prometheus()
+        self.assertIn('# TYPE jsontool_operation_seconds summary\n', text)
+        self.assertIn('jsontool_operation_seconds_count{operation="parse",function="read_json_from_string"} 3\n', text)
+        self.assertIn('jsontool_operation_errors_total{operation="parse",function="read_json_from_string"} 1\n', text)
+        self.assertIn('jsontool_operation_output_bytes_total{operation="serialize",function="write_json_to_string"} 13\n',
+                      text)
+        self.assertNotIn('memory_peak', text)
+        self.assertTrue(text.endswith('\n'))
+        metrics.reset()
+        self.assertEqual((metrics.snapshot(), metrics.prometheus()), ({}, ''))
+
+    def test_hooks_from_several_threads(self):
+        metrics = MetricsAggregator()
+        add_hook(metrics)
+        add_hook(self.events.append)
+        remove_hook(self.events.append)
+        remove_hook(self.events.append)
+        try:
+            threads = [threading.Thread(target=lambda: [read_json_from_string('[1]') for _ in range(500)])
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            remove_hook(metrics)
+        self.assertEqual(metrics.snapshot()[('parse', 'read_json_from_string')]['count'], 2000)
+        self.assertEqual(self.events, [])
+        self.assertEqual(instrumentation._hooks, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+from jsontool.cli import utils
+from jsontool.cli.json_tool import main
+
+
+class TestJsonToolCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data = os.path.join(self.directory, 'data')
+        os.makedirs(os.path.join(self.data, 'nested'))
+        self.write('data/a.json', '{"b": [1, 2], "a": "é"}')
+        self.write('data/nested/c.json', '[{"id": 1, "name": "x"}, {"id": 2, "name": "y"}]')
+        self.write('data/ignored.txt', 'not json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, relative):
+        return os.path.join(self.directory, relative)
+
+    def write(self, relative, text):
+        with open(self.path(relative), 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def read(self, relative):
+        with open(self.path(relative), encoding='utf-8') as file:
+            return file.read()
+
+    def run_cli(self, *argv):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            status = main(list(argv))
+        return status, stderr.getvalue()
+
+    def test_format_in_place(self):
+        status, stderr = self.run_cli('format', self.data)
+        self.assertEqual(status, 0)
+        self.assertEqual(self.read('data/a.json'), '{\n  "b": [\n    1,\n    2\n  ],\n  "a": "é"\n}\n')
+        self.assertIn('2 files, 0 failed', stderr)
+        self.assertEqual(self.read('data/ignored.txt'), 'not json')
+
+    def test_minify_into_output_dir_with_glob(self):
+        out = self.path('out')
+        status, _ = self.run_cli('minify', os.path.join(self.data, '**', '*.json'), '-o', out, '--quiet')
+        self.assertEqual(status, 0)
+        self.assertEqual(self.read('out/a.json'), '{"b":[1,2],"a":"é"}\n')
+        self.assertEqual(self.read('out/nested/c.json'), '[{"id":1,"name":"x"},{"id":2,"name":"y"}]\n')
+        self.assertEqual(self.read('data/a.json'), '{"b": [1, 2], "a": "é"}')
+
+    def test_colliding_outputs_are_refused(self):
+        self.write('data/nested/a.json', '[]')
+        self.write('data/nested/c.jsonl', '{"id": 3}\n')
+        status, _ = self.run_cli('minify', os.path.join(self.data, '*', '*.json'), os.path.join(self.data, '*.json'),
+                                 '-o', self.path('out'))
+        self.assertEqual(status, 0)
+        self.assertEqual(sorted(os.listdir(self.path('out'))), ['a.json', 'nested'])
+        for argv in (('minify', self.path('data/a.json'), self.path('data/nested/a.json'), '-o', self.path('out2')),
+                     ('convert', os.path.join(self.data, 'nested'), '--to', 'csv')):
+            with self.subTest(argv=argv):
+                status, stderr = self.run_cli(*argv)
+                self.assertEqual(status, 2)
+                self.assertIn('would both be written to', stderr)
+        self.assertFalse(os.path.exists(self.path('out2')))
+        self.assertFalse(os.path.exists(self.path('data/nested/c.csv')))
+
+    def test_validate(self):
+        self.write('schema.json', json.dumps({"type": "array", "items": {"required": ["id"]}}))
+        self.write('data/bad.json', '{"a": ')
+        status, stderr = self.run_cli('validate', self.data, '--schema', self.path('schema.json'))
+        self.assertEqual(status, 1)
+        self.assertIn('bad.json: Invalid JSON', stderr)
+        self.assertIn("a.json: ", stderr)
+        self.assertIn('3 files, 2 failed', stderr)
+        self.assertEqual(self.run_cli('validate', self.data, '--schema', self.path('missing.json'))[0], 2)
+
+    def test_convert_with_jobs(self):
+        status, _ = self.run_cli('convert', os.path.join(self.data, 'nested'), '--to', 'csv', '--jobs', '2',
+                                 '-o', self.path('out'))
+        self.assertEqual(status, 0)
+        self.assertEqual(self.read('out/c.csv').splitlines(), ['id,name', '1,x', '2,y'])
+
+    def test_failed_output_leaves_original_file(self):
+        self.write('data/a.json', '{"a": 1')
+        status, _ = self.run_cli('format', self.path('data/a.json'))
+        self.assertEqual(status, 1)
+        self.assertEqual(self.read('data/a.json'), '{"a": 1')
+        self.assertEqual(sorted(os.listdir(self.data)), ['a.json', 'ignored.txt', 'nested'])
+
+    def test_usage_errors(self):
+        self.assertEqual(self.run_cli('format', self.path('nothing/*.json'))[0], 2)
+        self.assertEqual(self.run_cli('format', self.data, '--jobs', '-1')[0], 2)
+
+
+class TestAtomicOutput(unittest.TestCase):
+
+    def test_replace_keeps_permissions_and_cleans_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, 'out.json')
+            with open(target, 'w') as file:
+                file.write('old')
+            os.chmod(target, 0o640)
+            with self.assertRaises(RuntimeError):
+                with utils.atomic_output(target) as temporary:
+                    with open(temporary, 'w') as file:
+                        file.write('partial')
+                    raise RuntimeError("crash")
+            self.assertEqual(os.listdir(directory), ['out.json'])
+            with utils.atomic_output(target) as temporary:
+                with open(temporary, 'w') as file:
+                    file.write('new')
+            with open(target) as file:
+                self.assertEqual(file.read(), 'new')
+            self.assertEqual(os.stat(target).st_mode & 0o777, 0o640)
+
+    def test_crash_during_replace_keeps_old_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, 'out.json')
+            with open(target, 'w') as file:
+                file.write('old')
+            with mock.patch('os.replace', side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    with utils.atomic_output(target) as temporary:
+                        with open(temporary, 'w') as file:
+                            file.write('new')
+            with open(target) as file:
+                self.assertEqual(file.read(), 'old')
+            self.assertEqual(os.listdir(directory), ['out.json'])
+
+
+if __name__ == "__main__":
+    unittest.main()
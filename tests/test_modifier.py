@@ -1,5 +1,7 @@
+import copy
 import unittest
 from jsontool.core.modifier import add_key_to_json, add_element_to_json_array, remove_key_from_json, remove_element_from_json_array
+from jsontool.core.modifier import apply_operations
 
 
 class TestJsonModifier(unittest.TestCase):
@@ -139,5 +141,155 @@ class TestAddElementToJsonArray(unittest.TestCase):
         self.assertEqual(updated_json["fruits"], ["apple", "banana"])
 
 
+class TestApplyOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = {"user": {"name": "Alice", "tags": ["a", "b"]}, "items": [{"id": 1}, {"id": 2}], "a/b": {"~": 0}}
+
+    def test_set_nested(self):
+        result = apply_operations(self.doc, [
+            {"op": "set", "path": "/user/name", "value": "Bob"},
+            {"op": "set", "path": "/user/age", "value": 30},
+            {"op": "set", "path": ["items", 0, "id"], "value": 10},
+        ])
+        self.assertIs(result, self.doc)
+        self.assertEqual(self.doc["user"], {"name": "Bob", "tags": ["a", "b"], "age": 30})
+        self.assertEqual(self.doc["items"][0], {"id": 10})
+
+    def test_add_inserts_into_arrays(self):
+        apply_operations(self.doc, [
+            {"op": "add", "path": "/user/tags/0", "value": "first"},
+            {"op": "add", "path": "/user/tags/-", "value": "last"},
+        ])
+        self.assertEqual(self.doc["user"]["tags"], ["first", "a", "b", "last"])
+
+    def test_append_and_remove(self):
+        apply_operations(self.doc, [
+            {"op": "append", "path": "/items", "value": {"id": 3}},
+            {"op": "remove", "path": "/items/0"},
+            {"op": "remove", "path": "/user/name"},
+        ])
+        self.assertEqual(self.doc["items"], [{"id": 2}, {"id": 3}])
+        self.assertEqual(self.doc["user"], {"tags": ["a", "b"]})
+
+    def test_replace_requires_existing(self):
+        with self.assertRaises(KeyError):
+            apply_operations(self.doc, [{"op": "replace", "path": "/user/missing", "value": 1}])
+
+    def test_move_copy_and_test(self):
+        apply_operations(self.doc, [
+            {"op": "test", "path": "/user/name", "value": "Alice"},
+            {"op": "copy", "from": "/user/tags", "path": "/tags"},
+            {"op": "move", "from": "/user/name", "path": "/name"},
+        ])
+        self.assertEqual(self.doc["name"], "Alice")
+        self.assertEqual(self.doc["tags"], ["a", "b"])
+        self.assertIsNot(self.doc["tags"], self.doc["user"]["tags"])
+        self.assertNotIn("name", self.doc["user"])
+
+    def test_escaped_pointer(self):
+        apply_operations(self.doc, [{"op": "set", "path": "/a~1b/~0", "value": 1}])
+        self.assertEqual(self.doc["a/b"], {"~": 1})
+
+    def test_failure_rolls_back(self):
+        original = copy.deepcopy(self.doc)
+        operations = [
+            {"op": "set", "path": "/user/name", "value": "Bob"},
+            {"op": "remove", "path": "/items/0"},
+            {"op": "add", "path": "/user/tags/1", "value": "x"},
+            {"op": "replace", "path": "/user", "value": {}},
+            {"op": "append", "path": "/user", "value": 1},
+        ]
+        with self.assertRaises(ValueError) as context:
+            apply_operations(self.doc, operations)
+        self.assertIn("Operation 4", str(context.exception))
+        self.assertEqual(self.doc, original)
+
+    def test_failed_test_rolls_back(self):
+        original = copy.deepcopy(self.doc)
+        with self.assertRaises(ValueError):
+            apply_operations(self.doc, [
+                {"op": "remove", "path": "/user/tags/0"},
+                {"op": "test", "path": "/user/tags/0", "value": "a"},
+            ])
+        self.assertEqual(self.doc, original)
+
+    def test_any_exception_rolls_back(self):
+        original = copy.deepcopy(self.doc)
+
+        def operations():
+            yield {"op": "remove", "path": "/user/name"}
+            raise RuntimeError("source failed")
+
+        class Unequal:
+            def __eq__(self, other):
+                raise RuntimeError("comparison failed")
+
+        for batch in (operations(), [{"op": "set", "path": "/x", "value": 1},
+                                     {"op": "test", "path": "/user/name", "value": Unequal()}]):
+            with self.subTest(batch=batch):
+                with self.assertRaises(RuntimeError):
+                    apply_operations(self.doc, batch)
+                self.assertEqual(self.doc, original)
+
+    def test_rollback_keeps_key_order(self):
+        doc = {"x": 1, "y": {"a": 1, "b": 2}, "z": 3}
+        with self.assertRaises(KeyError):
+            apply_operations(doc, [
+                {"op": "remove", "path": "/x"},
+                {"op": "remove", "path": "/y/a"},
+                {"op": "move", "from": "/z", "path": "/w"},
+                {"op": "remove", "path": "/missing"},
+            ])
+        self.assertEqual(list(doc), ["x", "y", "z"])
+        self.assertEqual(list(doc["y"]), ["a", "b"])
+
+    def test_rollback_after_add_and_remove_on_one_object(self):
+        doc = {"r": 1, "s": 2}
+        with self.assertRaisesRegex(ValueError, "Test failed"):
+            apply_operations(doc, [
+                {"op": "add", "path": "/a", "value": 0},
+                {"op": "remove", "path": "/r"},
+                {"op": "test", "path": "/s", "value": 99},
+            ])
+        self.assertEqual(list(doc.items()), [("r", 1), ("s", 2)])
+
+    def test_missing_path(self):
+        for op in ("set", "add"):
+            with self.subTest(op=op):
+                with self.assertRaisesRegex(ValueError, "missing 'path'"):
+                    apply_operations(self.doc, [{"op": op, "value": 1}])
+
+    def test_invalid_operations(self):
+        for operations, error in (
+            ([{"op": "frobnicate", "path": "/a"}], ValueError),
+            ([{"op": "set", "path": "/a"}], ValueError),
+            ([{"op": "set", "path": "a", "value": 1}], ValueError),
+            ([{"op": "remove", "path": "/items/5"}], KeyError),
+            ([{"op": "remove", "path": "/items/01"}], KeyError),
+            ([{"op": "set", "path": "/user/name/x", "value": 1}], KeyError),
+            ([{"op": "remove", "path": ""}], ValueError),
+            (["set"], TypeError),
+        ):
+            with self.subTest(operations=operations):
+                with self.assertRaises(error):
+                    apply_operations(self.doc, operations)
+
+    def test_changed_parent_is_resolved_again(self):
+        apply_operations(self.doc, [
+            {"op": "set", "path": "/user/name", "value": "Bob"},
+            {"op": "set", "path": "/user", "value": {"name": "Carol"}},
+            {"op": "set", "path": "/user/age", "value": 5},
+            {"op": "remove", "path": "/items/0"},
+            {"op": "set", "path": "/items/0/id", "value": 20},
+        ])
+        self.assertEqual(self.doc["user"], {"name": "Carol", "age": 5})
+        self.assertEqual(self.doc["items"], [{"id": 20}])
+
+    def test_invalid_document(self):
+        with self.assertRaises(TypeError):
+            apply_operations("text", [])
+
+
 if __name__ == "__main__":
     unittest.main()
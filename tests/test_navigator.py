@@ -0,0 +1,235 @@
+import copy
+import unittest
+from jsontool.core.modifier import add_key_to_json, add_element_to_json_array, remove_key_from_json, remove_element_from_json_array
+from jsontool.core.modifier import apply_operations
+from jsontool.core.navigator import JsonIndex, JsonPath, compile_jsonpath, find_by_jsonpath, find_first_by_jsonpath
+
+
+STORE = {
+    "store": {
+        "book": [
+            {"category": "reference", "author": "Nigel Rees", "title": "Sayings of the Century", "price": 8.95},
+            {"category": "fiction", "author": "Evelyn Waugh", "title": "Sword of Honour", "price": 12.99},
+            {"category": "fiction", "author": "Herman Melville", "title": "Moby Dick",
+             "isbn": "0-553-21311-3", "price": 8.99},
+            {"category": "fiction", "author": "J. R. R. Tolkien", "title": "The Lord of the Rings",
+             "isbn": "0-395-19395-8", "price": 22.99},
+        ],
+        "bicycle": {"color": "red", "price": 19.95},
+    },
+    "expensive": 10,
+}
+
+
+class TestJsonPath(unittest.TestCase):
+
+    def test_root(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$"), [STORE])
+
+    def test_child(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.bicycle.color"), ["red"])
+        self.assertEqual(find_by_jsonpath(STORE, "$['store']['bicycle']['color']"), ["red"])
+
+    def test_missing_child(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.car.color"), [])
+        self.assertEqual(find_by_jsonpath(STORE, "$.expensive.value"), [])
+
+    def test_index(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[0].author"), ["Nigel Rees"])
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[-1].author"), ["J. R. R. Tolkien"])
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[10].author"), [])
+
+    def test_wildcard(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[*].author"),
+                         ["Nigel Rees", "Evelyn Waugh", "Herman Melville", "J. R. R. Tolkien"])
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.bicycle.*"), ["red", 19.95])
+
+    def test_recursive_descent(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$..author"),
+                         ["Nigel Rees", "Evelyn Waugh", "Herman Melville", "J. R. R. Tolkien"])
+        self.assertEqual(find_by_jsonpath(STORE, "$.store..price"), [8.95, 12.99, 8.99, 22.99, 19.95])
+        self.assertEqual(len(find_by_jsonpath(STORE, "$..*")), 28)
+
+    def test_slice(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[1:3].price"), [12.99, 8.99])
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[::2].price"), [8.95, 8.99])
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[-2:].price"), [8.99, 22.99])
+
+    def test_union(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[0,2].price"), [8.95, 8.99])
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.bicycle['color','price']"), ["red", 19.95])
+
+    def test_filter_comparison(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$.store.book[?(@.price < 10)].title"),
+                         ["Sayings of the Century", "Moby Dick"])
+        self.assertEqual(find_by_jsonpath(STORE, "$..book[?(@.category == 'reference')].price"), [8.95])
+
+    def test_filter_existence(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$..book[?(@.isbn)].title"), ["Moby Dick", "The Lord of the Rings"])
+        self.assertEqual(find_by_jsonpath(STORE, "$..book[?(!@.isbn)].title"),
+                         ["Sayings of the Century", "Sword of Honour"])
+
+    def test_filter_logic(self):
+        path = "$.store.book[?(@.category == 'fiction' && (@.price < 10 || @.price > 20))].title"
+        self.assertEqual(find_by_jsonpath(STORE, path), ["Moby Dick", "The Lord of the Rings"])
+
+    def test_filter_regex(self):
+        self.assertEqual(find_by_jsonpath(STORE, "$..book[?(@.author =~ /^h/i)].title"), ["Moby Dick"])
+
+    def test_filter_type_mismatch(self):
+        data = [{"v": 1}, {"v": "1"}, {"v": True}, {"v": None}]
+        self.assertEqual(find_by_jsonpath(data, "$[?(@.v == 1)]"), [{"v": 1}])
+        self.assertEqual(find_by_jsonpath(data, "$[?(@.v > 0)]"), [{"v": 1}])
+        self.assertEqual(find_by_jsonpath(data, "$[?(@.v == null)]"), [{"v": None}])
+
+    def test_first_is_lazy(self):
+        def items():
+            yield {"id": 1}
+            raise AssertionError("walked past the first match")
+
+        class Lazy(list):
+            def __iter__(self):
+                return items()
+
+        self.assertEqual(JsonPath("$[*].id").first(Lazy()), 1)
+
+    def test_first_default(self):
+        self.assertEqual(find_first_by_jsonpath(STORE, "$..author"), "Nigel Rees")
+        self.assertEqual(find_first_by_jsonpath(STORE, "$..missing", default="none"), "none")
+
+    def test_compile_is_cached(self):
+        self.assertIs(compile_jsonpath("$.store.book[0]"), compile_jsonpath("$.store.book[0]"))
+
+    def test_invalid_paths(self):
+        for path in ("$.", "$[", "$[0", "$.store[?(@.price <)]", "$['unterminated]", "$[::0]", "$ store"):
+            with self.subTest(path=path):
+                with self.assertRaises(ValueError):
+                    JsonPath(path)
+
+    def test_invalid_type(self):
+        with self.assertRaises(TypeError):
+            JsonPath(42)
+
+
+class TestJsonIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.data = copy.deepcopy(STORE)
+        self.index = JsonIndex(self.data)
+
+    def tearDown(self):
+        self.index.close()
+
+    def assertMatchesRebuild(self):
+        fresh = JsonIndex(self.data)
+        try:
+            self.assertEqual(self.index._paths, fresh._paths)
+            self.assertEqual({k: set(v) for k, v in self.index._keys.items()},
+                             {k: set(v) for k, v in fresh._keys.items()})
+            self.assertEqual({k: set(v) for k, v in self.index._children.items()},
+                             {k: set(v) for k, v in fresh._children.items()})
+        finally:
+            fresh.close()
+
+    def test_find_key(self):
+        self.assertEqual(sorted(self.index.find_key("price")), [8.95, 8.99, 12.99, 19.95, 22.99])
+        self.assertEqual(self.index.find_key("missing"), [])
+
+    def test_paths_for_key(self):
+        self.assertEqual(sorted(self.index.paths_for_key("isbn")),
+                         [("store", "book", 2, "isbn"), ("store", "book", 3, "isbn")])
+
+    def test_get_by_path(self):
+        self.assertEqual(self.index.get(("store", "book", 1, "author")), "Evelyn Waugh")
+        self.assertEqual(self.index.get("$.store.book[1].author"), "Evelyn Waugh")
+        self.assertEqual(self.index.get(("store", "car"), "none"), "none")
+        self.assertIn(("store", "bicycle"), self.index)
+        with self.assertRaises(ValueError):
+            self.index.get("$..author")
+
+    def test_len_and_stats(self):
+        self.assertEqual(len(self.index), 29)
+        self.assertGreater(self.index.memory_usage(), 0)
+        self.assertGreaterEqual(self.index.build_time, 0)
+
+    def test_add_key_updates_index(self):
+        add_key_to_json(self.data["store"], "bicycle", {"color": "blue", "gears": 21})
+        self.assertEqual(self.index.get("$.store.bicycle.color"), "blue")
+        self.assertEqual(self.index.find_key("gears"), [21])
+        self.assertNotIn(19.95, self.index.find_key("price"))
+        self.assertMatchesRebuild()
+
+    def test_remove_key_updates_index(self):
+        remove_key_from_json(self.data, "store")
+        self.assertEqual(self.index.find_key("price"), [])
+        self.assertEqual(len(self.index), 2)
+        self.assertMatchesRebuild()
+
+    def test_append_updates_index(self):
+        add_element_to_json_array(self.data["store"], "book", {"title": "New", "price": 1.0})
+        self.assertEqual(self.index.get(("store", "book", 4, "title")), "New")
+        add_element_to_json_array(self.data["store"]["book"][4], "tags", "x", overwrite=True)
+        self.assertEqual(self.index.find_key("tags"), [["x"]])
+        self.assertMatchesRebuild()
+
+    def test_remove_element_shifts_paths(self):
+        book = self.data["store"]["book"][1]
+        remove_element_from_json_array(self.data["store"], "book", book)
+        self.assertEqual(self.index.get(("store", "book", 1, "title")), "Moby Dick")
+        self.assertNotIn(("store", "book", 3), self.index)
+        self.assertNotIn("Evelyn Waugh", self.index.find_key("author"))
+        self.assertMatchesRebuild()
+
+    def test_nested_changes_after_move(self):
+        remove_element_from_json_array(self.data["store"], "book", self.data["store"]["book"][0])
+        add_key_to_json(self.data["store"]["book"][0], "price", 1.5)
+        self.assertEqual(self.index.get(("store", "book", 0, "price")), 1.5)
+        self.assertMatchesRebuild()
+
+    def test_batch_updates_index(self):
+        apply_operations(self.data, [
+            {"op": "add", "path": "/store/book/0", "value": {"title": "First", "price": 1}},
+            {"op": "set", "path": "/store/book/2/price", "value": 2},
+            {"op": "remove", "path": "/store/book/4"},
+            {"op": "move", "from": "/store/bicycle", "path": "/bike"},
+            {"op": "set", "path": "/bike/color", "value": "green"},
+        ])
+        self.assertEqual(self.index.get("$.store.book[0].title"), "First")
+        self.assertEqual(self.index.get("$.bike.color"), "green")
+        self.assertNotIn(("store", "bicycle"), self.index)
+        self.assertMatchesRebuild()
+
+    def test_batch_changing_removed_subtrees(self):
+        self.index.close()
+        self.data = {"c": [1, [0], [1]], "d": {"e": {"f": 1}}}
+        self.index = JsonIndex(self.data)
+        apply_operations(self.data, [
+            {"op": "remove", "path": "/c/1"},
+            {"op": "remove", "path": "/c/1/0"},
+            {"op": "remove", "path": "/d/e/f"},
+            {"op": "remove", "path": "/d/e"},
+        ])
+        self.assertEqual(self.data, {"c": [1, []], "d": {}})
+        self.assertIsNone(self.index.get(("c", 2, 0)))
+        self.assertNotIn(("c", 2, 0), self.index)
+        self.assertEqual(len(self.index), 5)
+        self.assertMatchesRebuild()
+
+    def test_failed_batch_leaves_index_unchanged(self):
+        with self.assertRaises(KeyError):
+            apply_operations(self.data, [
+                {"op": "remove", "path": "/store/book/0"},
+                {"op": "remove", "path": "/store/missing"},
+            ])
+        self.assertMatchesRebuild()
+
+    def test_close_stops_tracking(self):
+        self.index.close()
+        add_key_to_json(self.data, "expensive", 20)
+        self.assertEqual(self.index.get(("expensive",)), 10)
+        self.index.rebuild()
+        self.assertEqual(self.index.get(("expensive",)), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
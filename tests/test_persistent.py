@@ -0,0 +1,137 @@
+import copy
+import os
+import pickle
+import unittest
+from jsontool.core.navigator import find_by_jsonpath
+from jsontool.core.persistent import FrozenDict, FrozenList, JsonDocument, freeze, thaw
+from jsontool.core.reader_writer import write_json_to_string
+
+
+class TestFreeze(unittest.TestCase):
+
+    def test_freeze_is_deep(self):
+        frozen = freeze({"a": [1, {"b": 2}]})
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertIsInstance(frozen["a"], FrozenList)
+        self.assertIsInstance(frozen["a"][1], FrozenDict)
+        self.assertEqual(frozen, {"a": [1, {"b": 2}]})
+
+    def test_frozen_containers_reject_mutation(self):
+        frozen = freeze({"a": [1, 2]})
+        mutations = [
+            lambda: frozen.__setitem__("b", 1), lambda: frozen.pop("a"), lambda: frozen.update(b=1),
+            lambda: frozen.clear(), lambda: frozen["a"].append(3), lambda: frozen["a"].__setitem__(0, 5),
+            lambda: frozen["a"].sort(), lambda: frozen["a"].__delitem__(0),
+        ]
+        for mutation in mutations:
+            with self.assertRaises(TypeError):
+                mutation()
+        self.assertEqual(frozen, {"a": [1, 2]})
+        for container in (frozen, frozen["a"], FrozenDict(), FrozenList()):
+            with self.assertRaises(TypeError):
+                container.__init__({"b": 3})
+        self.assertEqual(frozen, {"a": [1, 2]})
+        self.assertEqual((FrozenDict(a=1), FrozenList("ab")), ({"a": 1}, ["a", "b"]))
+
+    def test_thaw(self):
+        data = thaw(freeze({"a": [1, {"b": 2}]}))
+        self.assertIs(type(data), dict)
+        self.assertIs(type(data["a"]), list)
+        data["a"].append(3)
+
+    def test_copy_and_pickle(self):
+        frozen = freeze({"a": [1, {"b": 2}]})
+        self.assertIs(copy.deepcopy(frozen), frozen)
+        restored = pickle.loads(pickle.dumps(frozen))
+        self.assertEqual(restored, frozen)
+        self.assertIsInstance(restored["a"], FrozenList)
+
+
+class TestJsonDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = JsonDocument({"user": {"name": "Alice", "tags": ["a"]}, "items": [{"id": 1}, {"id": 2}]})
+
+    def test_add_key_returns_new_version(self):
+        new = self.doc.add_key("version", 2)
+        self.assertEqual(new.data["version"], 2)
+        self.assertNotIn("version", self.doc.data)
+        self.assertIs(new.data["user"], self.doc.data["user"])
+
+    def test_modifier_errors_are_preserved(self):
+        with self.assertRaises(ValueError):
+            self.doc.add_key("user", {}, overwrite=False)
+        with self.assertRaises(KeyError):
+            self.doc.remove_key("missing")
+        with self.assertRaises(ValueError):
+            self.doc.remove_element("items", {"id": 3})
+
+    def test_array_elements(self):
+        appended = self.doc.add_element("items", {"id": 3})
+        removed = appended.remove_element("items", {"id": 1})
+        self.assertEqual(removed.data["items"], [{"id": 2}, {"id": 3}])
+        self.assertEqual(self.doc.data["items"], [{"id": 1}, {"id": 2}])
+        self.assertIs(removed.data["items"][0], self.doc.data["items"][1])
+
+    def test_set_copies_only_the_path(self):
+        new = self.doc.set("/user/tags/0", "b")
+        self.assertEqual(new.get("/user/tags/0"), "b")
+        self.assertEqual(self.doc.get("/user/tags/0"), "a")
+        self.assertIsNot(new.data["user"], self.doc.data["user"])
+        self.assertIs(new.data["items"], self.doc.data["items"])
+        self.assertIsInstance(new.data["user"]["tags"], FrozenList)
+
+    def test_inserted_values_are_frozen(self):
+        value = {"nested": [1]}
+        new = self.doc.set(["user", "extra"], value)
+        value["nested"].append(2)
+        self.assertEqual(new.get("/user/extra/nested"), [1])
+        with self.assertRaises(TypeError):
+            new.get("/user/extra/nested").append(3)
+
+    def test_apply_operations(self):
+        new = self.doc.apply_operations([
+            {"op": "add", "path": "/items/0", "value": {"id": 0}},
+            {"op": "move", "from": "/user/name", "path": "/name"},
+            {"op": "append", "path": "/user/tags", "value": "b"},
+            {"op": "remove", "path": "/items/2"},
+        ])
+        self.assertEqual(new.thaw(), {"user": {"tags": ["a", "b"]}, "items": [{"id": 0}, {"id": 1}], "name": "Alice"})
+        self.assertEqual(self.doc.thaw(), {"user": {"name": "Alice", "tags": ["a"]}, "items": [{"id": 1}, {"id": 2}]})
+
+    def test_test_operations_copy_nothing(self):
+        new = self.doc.apply_operations([{"op": "test", "path": "/user/tags/0", "value": "a"},
+                                         {"op": "set", "path": "/items/0/id", "value": 0}])
+        self.assertIs(new.data["user"], self.doc.data["user"])
+        self.assertEqual(new.data["items"][0], {"id": 0})
+
+    def test_failed_operations_leave_version_unchanged(self):
+        before = self.doc.thaw()
+        with self.assertRaises(KeyError):
+            self.doc.apply_operations([{"op": "set", "path": "/user/name", "value": "Bob"},
+                                       {"op": "remove", "path": "/missing"}])
+        self.assertEqual(self.doc.thaw(), before)
+
+    def test_reader_writer_and_navigator(self):
+        doc = JsonDocument.from_string('{"a": [1, 2], "b": "Привет"}')
+        self.assertEqual(write_json_to_string(doc.data), '{"a": [1, 2], "b": "Привет"}')
+        self.assertEqual(doc.to_string(indent=2), write_json_to_string({"a": [1, 2], "b": "Привет"}, indent=2))
+        self.assertEqual(find_by_jsonpath(doc.data, "$.a[*]"), [1, 2])
+        path = 'test_persistent.json'
+        try:
+            doc.to_file(path)
+            self.assertEqual(JsonDocument.from_file(path), doc)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_get_default(self):
+        self.assertEqual(self.doc.get("/user/missing", "none"), "none")
+
+    def test_invalid_input(self):
+        with self.assertRaises(TypeError):
+            JsonDocument("text")
+
+
+if __name__ == "__main__":
+    unittest.main()
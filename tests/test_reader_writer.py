@@ -5,6 +5,9 @@ from jsontool.core.reader_writer import read_json_from_string
 from jsontool.core.reader_writer import read_json_from_file
 from jsontool.core.reader_writer import write_json_to_string
 from jsontool.core.reader_writer import write_json_to_file
+from jsontool.core.reader_writer import iter_json_file
+from jsontool.core.reader_writer import read_jsonl
+from jsontool.core.reader_writer import write_jsonl
 
 
 class TestReadJsonFromString(unittest.TestCase):
@@ -33,6 +36,30 @@ class TestReadJsonFromString(unittest.TestCase):
             read_json_from_string(json_string)
         self.assertTrue('Invalid JSON' in str(context.exception))
 
+    def test_bytes_like_input(self):
+        data = '{"name": "Алиса", "age": 25}'.encode('utf-8')
+        expected = {"name": "Алиса", "age": 25}
+        for value in (data, bytearray(data), memoryview(data)):
+            with self.subTest(type=type(value).__name__):
+                self.assertEqual(read_json_from_string(value), expected)
+
+    def test_empty_bytes(self):
+        with self.assertRaises(ValueError):
+            read_json_from_string(b'  \n')
+
+    def test_invalid_bytes(self):
+        with self.assertRaises(ValueError) as context:
+            read_json_from_string(memoryview(b'{"name": '))
+        self.assertTrue('Invalid JSON' in str(context.exception))
+
+    def test_invalid_utf8(self):
+        with self.assertRaises(ValueError):
+            read_json_from_string(b'{"name": "\xff"}')
+
+    def test_invalid_type(self):
+        with self.assertRaises(TypeError):
+            read_json_from_string(42)
+
 
 class TestReadJsonFromFile(unittest.TestCase):
 
@@ -74,6 +101,34 @@ class TestReadJsonFromFile(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             read_json_from_file(self.test_file_nonexistent)
 
+    def test_read_valid_json_mmap(self):
+        """Test reading a valid JSON file through a memory mapping"""
+        data = read_json_from_file(self.test_file_valid, use_mmap=True)
+        self.assertEqual(data, {"name": "John", "age": 30, "city": "New York"})
+
+    def test_read_invalid_json_mmap(self):
+        """Test reading an invalid JSON file through a memory mapping"""
+        with self.assertRaises(ValueError) as context:
+            read_json_from_file(self.test_file_invalid, use_mmap=True)
+        with self.assertRaises(ValueError) as expected:
+            read_json_from_file(self.test_file_invalid)
+        self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_read_empty_file_mmap(self):
+        """Test that an empty file raises ValueError instead of failing to map"""
+        with open(self.test_file_valid, 'w', encoding='utf-8'):
+            pass
+        with self.assertRaises(ValueError):
+            read_json_from_file(self.test_file_valid, use_mmap=True)
+
+    def test_mmap_sees_file_changes(self):
+        """Test that a changed file is re-mapped instead of served from the old mapping"""
+        self.assertEqual(read_json_from_file(self.test_file_valid, use_mmap=True)["age"], 30)
+        with open(self.test_file_valid, 'w', encoding='utf-8') as f:
+            f.write('{"name": "John", "age": 31, "city": "Paris", "extra": true}')
+        data = read_json_from_file(self.test_file_valid, use_mmap=True)
+        self.assertEqual(data, {"name": "John", "age": 31, "city": "Paris", "extra": True})
+
     def test_permission_error(self):
         """Test if permission issues are handled (skipped here but can be simulated with restricted file access)"""
         # You can test this with a file that has restricted permissions in real scenarios
@@ -157,6 +212,231 @@ class TestWriteJsonToFile(unittest.TestCase):
         with self.assertRaises(OSError):
             write_json_to_file(data, self.test_file_invalid_path)
 
+
+class TestIterJsonFile(unittest.TestCase):
+
+    def setUp(self):
+        """Prepare path for the test file"""
+        self.test_file = 'test_iter.json'
+
+    def tearDown(self):
+        """Clean up test file"""
+        if os.path.exists(self.test_file):
+            os.remove(self.test_file)
+
+    def write(self, content):
+        with open(self.test_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_top_level_array(self):
+        """Test iterating over a top-level array"""
+        self.write('[1, "two", {"three": 3}, [4], null]')
+        self.assertEqual(list(iter_json_file(self.test_file)), [1, "two", {"three": 3}, [4], None])
+
+    def test_nested_array(self):
+        """Test iterating over an array nested under object keys"""
+        data = {"meta": {"count": 2}, "data": {"items": [{"id": 1}, {"id": 2}]}, "tail": [1, 2]}
+        self.write(json.dumps(data, indent=2))
+        self.assertEqual(list(iter_json_file(self.test_file, prefix="data.items.item")), [{"id": 1}, {"id": 2}])
+
+    def test_small_chunks(self):
+        """Test that values split across chunk boundaries are decoded correctly"""
+        data = {"items": [{"n": 12345678901234567890, "s": "Привет \\\" мир \u00e9"}, 1.5e10, True] * 20}
+        self.write(json.dumps(data))
+        result = list(iter_json_file(self.test_file, prefix="items.item", chunk_size=3))
+        self.assertEqual(result, data["items"])
+
+    def test_missing_prefix(self):
+        """Test that a prefix not present in the document yields nothing"""
+        self.write('{"other": [1, 2]}')
+        self.assertEqual(list(iter_json_file(self.test_file, prefix="items.item")), [])
+
+    def test_empty_array(self):
+        """Test iterating over an empty array"""
+        self.write('{"items": []}')
+        self.assertEqual(list(iter_json_file(self.test_file, prefix="items.item")), [])
+
+    def test_invalid_json_reports_position(self):
+        """Test that malformed input raises ValueError with line and column"""
+        self.write('{"items": [\n  1,\n  2 3\n]}')
+        with self.assertRaises(ValueError) as context:
+            list(iter_json_file(self.test_file, prefix="items.item", chunk_size=4))
+        self.assertIn("Invalid JSON", str(context.exception))
+        self.assertIn("line 3 column 5", str(context.exception))
+
+    def test_invalid_element(self):
+        """Test that a malformed element matches the position reported by json"""
+        content = '[{"a": 1}, {"a": tru}]'
+        self.write(content)
+        with self.assertRaises(json.JSONDecodeError) as expected:
+            json.loads(content)
+        with self.assertRaises(ValueError) as context:
+            list(iter_json_file(self.test_file, chunk_size=5))
+        self.assertIn(f"line {expected.exception.lineno} column {expected.exception.colno}", str(context.exception))
+
+    def test_extra_data(self):
+        """Test that trailing content after the document raises ValueError"""
+        self.write('[1, 2] 3')
+        with self.assertRaises(ValueError):
+            list(iter_json_file(self.test_file))
+
+    def test_parallel_splits_lines_like_serial(self):
+        """Test that a bare carriage return inside a record does not end a line in parallel mode"""
+        with open(self.test_file, 'wb') as f:
+            f.write(b'{"a":\r1}\r\n{"b":2}\n\rbad\n[3]\n' * 5 + b'[4]')
+        expected_errors = []
+        expected = list(read_jsonl(self.test_file, on_error='collect', errors=expected_errors))
+        self.assertEqual(expected[:3], [{"a": 1}, {"b": 2}, [3]])
+        for chunk_bytes in (1, 16, 1 << 20):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                errors = []
+                records = list(read_jsonl(self.test_file, on_error='collect', errors=errors,
+                                          parallel=True, workers=2, chunk_bytes=chunk_bytes))
+                self.assertEqual(records, expected)
+                self.assertEqual(errors, expected_errors)
+
+    def test_file_not_found(self):
+        """Test if a non-existent file raises FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            list(iter_json_file('test_nonexistent.json'))
+
+
+class TestJsonLines(unittest.TestCase):
+
+    def setUp(self):
+        """Prepare path for the test file"""
+        self.test_file = 'test_lines.jsonl'
+        self.malformed = '{"a": 1}\n{"a": \n\n[1, 2]\nnot json\n"end"\n'
+
+    def tearDown(self):
+        """Clean up test file"""
+        if os.path.exists(self.test_file):
+            os.remove(self.test_file)
+
+    def write(self, content):
+        with open(self.test_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_round_trip(self):
+        """Test writing records and reading them back"""
+        records = [{"id": i, "name": "Привет"} for i in range(5)] + [[1, 2], "text", None]
+        self.assertEqual(write_jsonl(iter(records), self.test_file), len(records))
+        self.assertEqual(list(read_jsonl(self.test_file)), records)
+
+    def test_write_one_record_per_line(self):
+        """Test that each record is written on its own line"""
+        write_jsonl([{"a": 1}, {"b": "é"}], self.test_file)
+        with open(self.test_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{"a": 1}\n{"b": "é"}\n')
+
+    def test_write_non_serializable_record(self):
+        """Test writing non-serializable data raises ValueError"""
+        with self.assertRaises(ValueError):
+            write_jsonl([{"func": lambda x: x}], self.test_file)
+
+    def test_blank_lines_are_ignored(self):
+        """Test that blank lines are not treated as records"""
+        self.write('1\n\n  \n2\n')
+        self.assertEqual(list(read_jsonl(self.test_file)), [1, 2])
+
+    def test_raise_on_malformed_line(self):
+        """Test that the default policy raises with the line number"""
+        self.write(self.malformed)
+        with self.assertRaises(ValueError) as context:
+            list(read_jsonl(self.test_file))
+        self.assertIn("line 2", str(context.exception))
+
+    def test_skip_malformed_lines(self):
+        """Test skipping malformed lines"""
+        self.write(self.malformed)
+        self.assertEqual(list(read_jsonl(self.test_file, on_error='skip')), [{"a": 1}, [1, 2], "end"])
+
+    def test_collect_malformed_lines(self):
+        """Test collecting malformed lines with their line numbers"""
+        self.write(self.malformed)
+        errors = []
+        records = list(read_jsonl(self.test_file, on_error='collect', errors=errors))
+        self.assertEqual(records, [{"a": 1}, [1, 2], "end"])
+        self.assertEqual([line for line, _ in errors], [2, 5])
+
+    def test_collect_requires_list(self):
+        """Test that the collect policy requires an errors list"""
+        self.write(self.malformed)
+        with self.assertRaises(TypeError):
+            list(read_jsonl(self.test_file, on_error='collect'))
+
+    def test_unknown_policy(self):
+        """Test that an unknown error policy raises ValueError"""
+        with self.assertRaises(ValueError):
+            list(read_jsonl(self.test_file, on_error='ignore'))
+
+    def test_parallel_preserves_order(self):
+        """Test that parallel parsing yields records in their original order"""
+        records = [{"id": i, "payload": "x" * (i % 7)} for i in range(2000)]
+        write_jsonl(records, self.test_file)
+        result = list(read_jsonl(self.test_file, parallel=True, workers=2, chunk_bytes=1024))
+        self.assertEqual(result, records)
+
+    def test_parallel_line_numbers(self):
+        """Test that line numbers of malformed lines are absolute in parallel mode"""
+        self.write(self.malformed * 50)
+        errors = []
+        list(read_jsonl(self.test_file, on_error='collect', errors=errors, parallel=True, workers=2, chunk_bytes=16))
+        expected = []
+        list(read_jsonl(self.test_file, on_error='collect', errors=expected))
+        self.assertEqual(len(errors), 100)
+        self.assertEqual(errors, expected)
+
+    def test_parallel_splits_lines_like_serial(self):
+        """Test that a bare carriage return inside a record does not end a line in parallel mode"""
+        with open(self.test_file, 'wb') as f:
+            f.write(b'{"a":\r1}\r\n{"b":2}\n\rbad\n[3]\n' * 5 + b'[4]')
+        expected_errors = []
+        expected = list(read_jsonl(self.test_file, on_error='collect', errors=expected_errors))
+        self.assertEqual(expected[:3], [{"a": 1}, {"b": 2}, [3]])
+        for chunk_bytes in (1, 16, 1 << 20):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                errors = []
+                records = list(read_jsonl(self.test_file, on_error='collect', errors=errors,
+                                          parallel=True, workers=2, chunk_bytes=chunk_bytes))
+                self.assertEqual(records, expected)
+                self.assertEqual(errors, expected_errors)
+
+    def test_invalid_utf8_follows_error_policy(self):
+        """Test that lines that are not valid UTF-8 are malformed lines in both modes"""
+        with open(self.test_file, 'wb') as f:
+            f.write(b'{"a": 1}\r\n"\xff"\n{"b": "\xc3\xa9"}\n\n"\xc3"\n[2]\n')
+        for parallel in (False, True):
+            with self.subTest(parallel=parallel):
+                errors = []
+                records = list(read_jsonl(self.test_file, on_error='collect', errors=errors,
+                                          parallel=parallel, workers=2, chunk_bytes=16))
+                self.assertEqual(records, [{"a": 1}, {"b": "é"}, [2]])
+                self.assertEqual([line for line, _ in errors], [2, 5])
+                self.assertIn("can't decode byte 0xff", errors[0][1])
+                with self.assertRaisesRegex(ValueError, "line 2 of the file"):
+                    list(read_jsonl(self.test_file, parallel=parallel, workers=2, chunk_bytes=16))
+
+    def test_parallel_splits_lines_like_serial(self):
+        """Test that a bare carriage return inside a record does not end a line in parallel mode"""
+        with open(self.test_file, 'wb') as f:
+            f.write(b'{"a":\r1}\r\n{"b":2}\n\rbad\n[3]\n' * 5 + b'[4]')
+        expected_errors = []
+        expected = list(read_jsonl(self.test_file, on_error='collect', errors=expected_errors))
+        self.assertEqual(expected[:3], [{"a": 1}, {"b": 2}, [3]])
+        for chunk_bytes in (1, 16, 1 << 20):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                errors = []
+                records = list(read_jsonl(self.test_file, on_error='collect', errors=errors,
+                                          parallel=True, workers=2, chunk_bytes=chunk_bytes))
+                self.assertEqual(records, expected)
+                self.assertEqual(errors, expected_errors)
+
+    def test_file_not_found(self):
+        """Test if a non-existent file raises FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            list(read_jsonl('test_nonexistent.jsonl'))
+
 if __name__ == '__main__':
     unittest.main()
 
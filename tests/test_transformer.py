@@ -0,0 +1,128 @@
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+from jsontool.core import transformer
+from jsontool.core.transformer import minify_json, pretty_print_json, reformat_json, reformat_json_string
+
+DOCUMENT = {
+    "name": "tool \"x\" \\ é ",
+    "values": [0, -1, 2.5, -0.0, 1e-07, 12345678901234567890, True, False, None],
+    "nested": {"empty_object": {}, "empty_array": [], "deep": [[[{"a": [1, {"b": "c"}]}]]]},
+    "keys with {[:,]} inside": "and \"quotes\", too",
+    "": [{}, [], ""],
+}
+
+
+def random_value(rng, depth=0):
+    kind = rng.random()
+    if depth > 5 or kind < 0.4:
+        return rng.choice([0, -3, 1.5e300, -2e-9, 10 ** 25, "", "a\"b\\c\td", "{x: [y]}", "ü\n", True, False, None])
+    if kind < 0.7:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+    return {rng.choice(["k", ":", "\"", " "]) + str(i): random_value(rng, depth + 1) for i in range(rng.randint(0, 5))}
+
+
+class TestReformat(unittest.TestCase):
+
+    def reformat(self, text, indent=None, chunk_size=1 << 20):
+        output = io.StringIO()
+        reformat_json(io.StringIO(text), output, indent, chunk_size)
+        return output.getvalue()
+
+    def test_layout_matches_json_dumps(self):
+        text = json.dumps(DOCUMENT, ensure_ascii=False)
+        self.assertEqual(self.reformat(text), json.dumps(DOCUMENT, ensure_ascii=False, separators=(',', ':')))
+        for indent in (0, 2, 4, '\t'):
+            with self.subTest(indent=indent):
+                self.assertEqual(self.reformat(text, indent), json.dumps(DOCUMENT, ensure_ascii=False, indent=indent))
+
+    def test_random_documents_and_chunk_sizes(self):
+        rng = random.Random(17)
+        for _ in range(200):
+            value = random_value(rng)
+            text = json.dumps(value, ensure_ascii=False, indent=rng.choice([None, 1, '\t']))
+            expected = json.dumps(value, ensure_ascii=False, indent=2)
+            for chunk_size in (1, 3, 64):
+                self.assertEqual(self.reformat(text, 2, chunk_size), expected, (text, chunk_size))
+
+    def test_strings_and_numbers_are_copied_verbatim(self):
+        text = '[ "\\u00e9\\/\\"" , 1.50E+3 ,-0, {"a" : 1e400} ]'
+        self.assertEqual(self.reformat(text), '["\\u00e9\\/\\"",1.50E+3,-0,{"a":1e400}]')
+        self.assertEqual(self.reformat('{"a": 1, "a": 2}'), '{"a":1,"a":2}')
+
+    def test_syntax_errors_match_the_json_module(self):
+        documents = [
+            '', '   ', '[1, 2', '[1, 2,]', '{"a" 1}', '{"a": 1,}', '{1: 2}', '[01]', '[-]', '[1.]', '[1e]',
+            '[tru]', '[1] 2', '["a\\x"]', '["\\u12"]', '["a\nb"]', '["abc', '{"a": [1, {"b": 2]}', ']',
+            '[1 2]', '{"a": 1 "b": 2}', '[\n  1,\n  nul\n]', '[1, 2}', '{"a": {"b": [}}',
+        ]
+        for text in documents:
+            with self.assertRaises(json.JSONDecodeError) as expected:
+                json.loads(text)
+            for chunk_size in (1, 4, 1 << 20):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError) as raised:
+                        self.reformat(text, 2, chunk_size)
+                    self.assertEqual(str(raised.exception), f"Invalid JSON: {expected.exception}")
+        # Unlike the json module, the constants outside the JSON standard are rejected.
+        with self.assertRaisesRegex(ValueError, 'Expecting value: line 1 column 2'):
+            self.reformat('[NaN]')
+
+    def test_malformed_numbers_are_rejected(self):
+        documents = ['[1.-5]', '[6.-5]', '{"a": -0.-0}', '[1-2]', '[--1]', '[1e--5]', '[-1.5e-3-]', '[1,2-]']
+        for text in documents:
+            with self.assertRaises(json.JSONDecodeError) as expected:
+                json.loads(text)
+            for chunk_size in (1, 4, 1 << 20):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError) as raised:
+                        self.reformat(text, 2, chunk_size)
+                    self.assertEqual(str(raised.exception), f"Invalid JSON: {expected.exception}")
+                    with self.assertRaises(ValueError):
+                        reformat_json_string(text, 2)
+        self.assertEqual(self.reformat('[-1,-0.5e-3,{"a":-2E-1}]'), '[-1,-0.5e-3,{"a":-2E-1}]')
+
+    def test_exact_scan_is_only_used_for_errors(self):
+        text = json.dumps([DOCUMENT] * 50, indent=2)
+        with mock.patch.object(transformer, '_transform_tokens', wraps=transformer._transform_tokens) as tokens:
+            self.reformat(text, None, 256)
+            self.assertFalse(tokens.called)
+            with self.assertRaises(ValueError):
+                self.reformat(text[:-1], None, 256)
+            self.assertTrue(tokens.called)
+
+    def test_file_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, target = os.path.join(directory, 'in.json'), os.path.join(directory, 'out.json')
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write('{"a": [1, 2]}')
+            pretty_print_json(source, target, indent=1)
+            with open(target, encoding='utf-8') as file:
+                self.assertEqual(file.read(), '{\n "a": [\n  1,\n  2\n ]\n}')
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write('{"a": [1, 2}')
+            with self.assertRaisesRegex(ValueError, "Invalid JSON in the file '.*in.json': Expecting ','"):
+                minify_json(source, io.StringIO())
+            with self.assertRaises(FileNotFoundError):
+                minify_json(os.path.join(directory, 'missing.json'), io.StringIO())
+
+    def test_reformat_json_string(self):
+        self.assertEqual(reformat_json_string(' [1, {"a": null}] '), '[1,{"a":null}]')
+        self.assertEqual(reformat_json_string('{}', indent=2), '{}')
+        with self.assertRaises(TypeError):
+            reformat_json_string(b'[]')
+
+    def test_invalid_options(self):
+        for indent in (-1, 1.5, True, '--', '\n'):
+            with self.subTest(indent=indent), self.assertRaises(ValueError):
+                reformat_json_string('[]', indent)
+        with self.assertRaises(ValueError):
+            reformat_json(io.StringIO('[]'), io.StringIO(), chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
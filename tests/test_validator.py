@@ -0,0 +1,199 @@
+import unittest
+from jsontool.core.validator import (
+    CompiledSchema,
+    ValidationError,
+    collect_validation_errors,
+    compile_schema,
+    validate_json,
+    validate_many,
+)
+
+
+ORDER_SCHEMA = {
+    "type": "object",
+    "required": ["id", "customer", "items"],
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "status": {"enum": ["new", "paid", "shipped"]},
+        "customer": {"$ref": "#/$defs/customer"},
+        "items": {"type": "array", "minItems": 1, "items": {"$ref": "#/$defs/item"}},
+    },
+    "$defs": {
+        "customer": {
+            "type": "object",
+            "required": ["email"],
+            "properties": {
+                "email": {"type": "string", "pattern": "^[^@]+@[^@]+$"},
+                "name": {"type": "string", "minLength": 1, "maxLength": 10},
+            },
+        },
+        "item": {
+            "type": "object",
+            "required": ["sku", "qty"],
+            "additionalProperties": False,
+            "properties": {
+                "sku": {"type": "string"},
+                "qty": {"type": "integer", "exclusiveMinimum": 0, "maximum": 100},
+                "price": {"type": ["number", "null"]},
+            },
+        },
+    },
+}
+
+VALID_ORDER = {
+    "id": 7,
+    "status": "paid",
+    "customer": {"email": "a@example.com", "name": "Alice"},
+    "items": [{"sku": "A1", "qty": 2, "price": 9.5}, {"sku": "B2", "qty": 1, "price": None}],
+}
+
+
+class TestValidateJson(unittest.TestCase):
+
+    def test_valid_instance(self):
+        validate_json(VALID_ORDER, ORDER_SCHEMA)
+        self.assertEqual(collect_validation_errors(VALID_ORDER, ORDER_SCHEMA), [])
+
+    def test_fail_fast_reports_path(self):
+        order = dict(VALID_ORDER, items=[{"sku": "A1", "qty": 0}])
+        with self.assertRaises(ValidationError) as context:
+            validate_json(order, ORDER_SCHEMA)
+        self.assertEqual(context.exception.path, ["items", 0, "qty"])
+        self.assertIn("$.items[0].qty", str(context.exception))
+
+    def test_collect_all_errors(self):
+        order = {
+            "id": 0,
+            "status": "lost",
+            "customer": {"email": "nope", "name": ""},
+            "items": [{"sku": 1, "qty": 101, "color": "red"}],
+        }
+        errors = collect_validation_errors(order, ORDER_SCHEMA)
+        paths = sorted(str(error) for error in errors)
+        self.assertEqual(len(errors), 7, paths)
+        self.assertEqual(sorted(tuple(map(str, e.path)) for e in errors), sorted([
+            ("id",), ("status",), ("customer", "email"), ("customer", "name"),
+            ("items", "0", "color"), ("items", "0", "sku"), ("items", "0", "qty"),
+        ]))
+
+    def test_missing_required(self):
+        errors = collect_validation_errors({"id": 1}, ORDER_SCHEMA)
+        self.assertEqual([e.message for e in errors],
+                         ["Missing required property 'customer'", "Missing required property 'items'"])
+
+    def test_type_checks(self):
+        cases = [
+            ("integer", 1, True), ("integer", 1.0, True), ("integer", 1.5, False), ("integer", True, False),
+            ("number", 1.5, True), ("number", False, False), ("boolean", False, True), ("null", None, True),
+            ("string", "x", True), ("array", [], True), ("object", {}, True), ("object", [], False),
+        ]
+        for type_name, value, expected in cases:
+            with self.subTest(type=type_name, value=value):
+                self.assertEqual(compile_schema({"type": type_name}).is_valid(value), expected)
+
+    def test_enum_and_const_distinguish_booleans(self):
+        self.assertFalse(compile_schema({"enum": [1, 2]}).is_valid(True))
+        self.assertTrue(compile_schema({"enum": [[1, {"a": None}], "x"]}).is_valid([1, {"a": None}]))
+        self.assertFalse(compile_schema({"const": 0}).is_valid(False))
+
+    def test_recursive_ref(self):
+        schema = {
+            "type": "object",
+            "properties": {"value": {"type": "integer"}, "children": {"type": "array", "items": {"$ref": "#"}}},
+        }
+        tree = {"value": 1, "children": [{"value": 2, "children": [{"value": "three"}]}]}
+        errors = collect_validation_errors(tree, schema)
+        self.assertEqual([e.path for e in errors], [["children", 0, "children", 0, "value"]])
+
+    def test_boolean_schemas(self):
+        self.assertTrue(compile_schema(True).is_valid({"anything": 1}))
+        self.assertFalse(compile_schema(False).is_valid(None))
+        self.assertFalse(compile_schema({"properties": {"x": False}}).is_valid({"x": 1}))
+
+    def test_invalid_schemas(self):
+        for schema in ({"type": "text"}, {"pattern": "("}, {"$ref": "#/$defs/missing"},
+                       {"$ref": "http://example.com/schema"}, {"minimum": "1"}):
+            with self.subTest(schema=schema):
+                with self.assertRaises(ValueError):
+                    CompiledSchema(schema)
+        with self.assertRaises(TypeError):
+            CompiledSchema([])
+
+    def test_plain_name_refs_are_rejected(self):
+        for ref in ("#foo", "#$defs/item", "#item/0"):
+            schema = {"$defs": {"item": {"$anchor": "foo", "type": "integer"}}, "items": {"$ref": ref}}
+            with self.subTest(ref=ref):
+                with self.assertRaisesRegex(ValueError, "unresolvable reference"):
+                    CompiledSchema(schema)
+
+    def test_cache_by_identity_and_content(self):
+        compiled = compile_schema(ORDER_SCHEMA)
+        self.assertIs(compile_schema(ORDER_SCHEMA), compiled)
+        rebuilt = {"type": "object", "required": ["x"]}
+        self.assertIs(compile_schema(dict(rebuilt)), compile_schema(dict(rebuilt)))
+
+    def test_validation_error_is_value_error(self):
+        with self.assertRaises(ValueError):
+            validate_json("x", {"type": "integer"})
+
+
+class TestValidateMany(unittest.TestCase):
+
+    SCHEMA = {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer", "minimum": 0}}}
+
+    def records(self, count):
+        # Every seventh record has a negative id, every eleventh misses it.
+        for i in range(count):
+            if i % 11 == 0:
+                yield {}
+            else:
+                yield {"id": -i if i % 7 == 0 else i}
+
+    def expected_failures(self, count):
+        return [i for i in range(count) if i % 11 == 0 or i % 7 == 0]
+
+    def test_in_process(self):
+        results = validate_many(self.records(200), self.SCHEMA, chunk_size=16)
+        failures = list(results)
+        self.assertEqual([index for index, _ in failures], self.expected_failures(200))
+        self.assertTrue(all(isinstance(error, ValidationError) for _, error in failures))
+        self.assertEqual((results.total, results.valid, results.invalid), (200, 200 - len(failures), len(failures)))
+
+    def test_parallel_matches_in_process(self):
+        expected = [(index, str(error)) for index, error in validate_many(self.records(500), self.SCHEMA)]
+        results = validate_many(self.records(500), self.SCHEMA, workers=2, chunk_size=32)
+        self.assertEqual([(index, str(error)) for index, error in results], expected)
+        self.assertEqual(results.total, 500)
+
+    def test_collect_all(self):
+        schema = {"properties": {"a": {"type": "string"}, "b": {"type": "string"}}}
+        results = validate_many([{"a": 1, "b": 2}, {"a": "x"}], schema, collect_all=True).run()
+        self.assertEqual(results.invalid, 1)
+        self.assertEqual([index for index, _ in validate_many([{"a": 1, "b": 2}], schema, collect_all=True)], [0, 0])
+
+    def test_generator_is_consumed_lazily(self):
+        consumed = []
+
+        def records():
+            for i in range(10_000):
+                consumed.append(i)
+                yield {"id": -1}
+
+        results = validate_many(records(), self.SCHEMA, chunk_size=10)
+        self.assertEqual(next(results)[0], 0)
+        self.assertLessEqual(len(consumed), 10)
+
+    def test_summary(self):
+        summary = validate_many(self.records(22), self.SCHEMA).run().summary()
+        self.assertIn("22 records validated", summary)
+        self.assertIn("5 invalid", summary)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            validate_many([], {"type": "nope"})
+        with self.assertRaises(ValueError):
+            validate_many([], self.SCHEMA, chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()